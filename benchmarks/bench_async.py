@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+#
+#  bench_async.py
+"""
+Measure how long a large response blocks the event loop when it is sent
+to a local asyncio server with ``writer.write(sdjson.dumps(obj).encode())``
+compared with :func:`sdjson.dump_async`.
+
+While the response is being sent a second task wakes up every millisecond and records
+how late it was; the worst and 99th percentile delays show how responsive the server
+would be to other clients. Smaller values of ``chunk_size`` reduce the stall further,
+at the cost of throughput.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_async.py [size_mb ...]
+"""
+
+# stdlib
+import asyncio
+import statistics
+import sys
+import time
+from typing import List
+
+# this package
+import sdjson
+
+TICK = 0.001
+
+
+def make_payload(size_mb: float) -> list:
+	"""
+	Construct a list of records which serializes to approximately ``size_mb`` megabytes.
+
+	:param size_mb:
+	"""
+
+	record = {"id": 0, "name": "record", "tags": ["a", "b", "c"], "value": 1.5, "active": True}
+	record_size = len(sdjson.dumps(record)) + 2
+	n_records = int(size_mb * 1024 * 1024 / record_size)
+	return [dict(record, id=i) for i in range(n_records)]
+
+
+async def send_dumps(payload: list, writer: asyncio.StreamWriter) -> None:
+	writer.write(sdjson.dumps(payload).encode("UTF-8"))
+	await writer.drain()
+
+
+async def send_dump_async(payload: list, writer: asyncio.StreamWriter) -> None:
+	await sdjson.dump_async(payload, writer)
+
+
+async def send_dump_async_small(payload: list, writer: asyncio.StreamWriter) -> None:
+	await sdjson.dump_async(payload, writer, chunk_size=8 * 1024)
+
+
+async def measure(label: str, payload: list, send) -> None:  # noqa: MAN001
+	received = asyncio.Event()
+
+	async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		await reader.read()
+		received.set()
+		writer.close()
+
+	server = await asyncio.start_server(handle, "127.0.0.1", 0)
+	port = server.sockets[0].getsockname()[1]
+	delays: List[float] = []
+	done = False
+
+	async def ticker() -> None:
+		while not done:
+			expected = time.perf_counter() + TICK
+			await asyncio.sleep(TICK)
+			delays.append(max(time.perf_counter() - expected, 0))
+
+	ticker_task = asyncio.ensure_future(ticker())
+	await asyncio.sleep(0.05)
+	delays.clear()
+
+	_, writer = await asyncio.open_connection("127.0.0.1", port)
+	start = time.perf_counter()
+	await send(payload, writer)
+	writer.write_eof()
+	await received.wait()
+	elapsed = time.perf_counter() - start
+
+	done = True
+	await ticker_task
+	writer.close()
+	server.close()
+	await server.wait_closed()
+
+	p99 = sorted(delays)[int(len(delays) * 0.99)] if delays else 0.0
+	print(
+			f"{label:<14}  {elapsed:>9.3f}  {max(delays, default=0) * 1000:>14.1f}  "
+			f"{p99 * 1000:>14.1f}  {statistics.mean(delays or [0]) * 1000:>15.2f}"
+			)
+
+
+def main(argv: List[str]) -> int:
+	sizes = [float(arg) for arg in argv] or [1, 20]
+	loop = asyncio.new_event_loop()
+
+	try:
+		for size_mb in sizes:
+			payload = make_payload(size_mb)
+			print(f"\n{size_mb}MB payload")
+			print(
+					f"{'method':<14}  {'time (s)':>9}  {'max stall (ms)':>14}  "
+					f"{'p99 stall (ms)':>14}  {'mean stall (ms)':>15}"
+					)
+			loop.run_until_complete(measure("dumps()", payload, send_dumps))
+			loop.run_until_complete(measure("dump_async()", payload, send_dump_async))
+			loop.run_until_complete(measure("dump_async(8k)", payload, send_dump_async_small))
+	finally:
+		loop.close()
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+#  bench_bytes.py
+"""
+Compare producing UTF-8 encoded output with :func:`sdjson.dumps_bytes` and :func:`sdjson.dump`
+against ``sdjson.dumps(obj).encode()``, reporting the time taken and peak memory allocated.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_bytes.py [size_mb ...]
+"""
+
+# stdlib
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+# this package
+import sdjson
+
+
+def make_payload(size_mb: float) -> list:
+	"""
+	Construct a list of records, containing non-ASCII text, which serializes to approximately ``size_mb`` megabytes.
+
+	:param size_mb:
+	"""
+
+	record = {"id": 0, "city": "Zürich", "greeting": "こんにちは", "value": 1.5, "tags": ["a", "b"]}
+	record_size = len(sdjson.dumps(record, ensure_ascii=False).encode("UTF-8")) + 2
+	n_records = int(size_mb * 1024 * 1024 / record_size)
+	return [dict(record, id=i) for i in range(n_records)]
+
+
+def measure(label: str, func: Callable[[], object]) -> None:
+	tracemalloc.start()
+	start = time.perf_counter()
+	func()
+	elapsed = time.perf_counter() - start
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	print(f"{label:<40}  {elapsed:>9.3f}  {peak / 1024 / 1024:>12.1f}")
+
+
+def main(argv: List[str]) -> int:
+	sizes = [float(arg) for arg in argv] or [5, 50]
+
+	for size_mb in sizes:
+		payload = make_payload(size_mb)
+		print(f"\n{size_mb}MB payload")
+		print(f"{'method':<40}  {'time (s)':>9}  {'peak (MB)':>12}")
+
+		for ensure_ascii in (True, False):
+			suffix = f"ensure_ascii={ensure_ascii}"
+			measure(
+					f"dumps().encode()  {suffix}",
+					lambda: sdjson.dumps(payload, ensure_ascii=ensure_ascii).encode("UTF-8"),
+					)
+			measure(
+					f"dumps_bytes()     {suffix}",
+					lambda: sdjson.dumps_bytes(payload, ensure_ascii=ensure_ascii),
+					)
+			with open(os.devnull, "wb") as devnull:
+				measure(
+						f"dump(binary file) {suffix}",
+						lambda: sdjson.dump(payload, devnull, ensure_ascii=ensure_ascii),
+						)
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#
+#  bench_dataclasses.py
+"""
+Compare ways of encoding a nested graph of dataclass instances:
+
+* a handler returning :func:`dataclasses.asdict`, which deep-copies the whole graph;
+* :func:`sdjson.encode_fields`, registered with :func:`sdjson.register_field_encoders`;
+* handlers generated by :func:`sdjson.compile_encoder`;
+* handlers generated by :func:`sdjson.register_schema`, which call the handlers for nested classes directly.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_dataclasses.py [n_objects]
+"""
+
+# stdlib
+import dataclasses
+import sys
+import timeit
+from typing import List, Optional
+
+# this package
+import sdjson
+
+
+@dataclasses.dataclass
+class Address:
+	street: str
+	city: str
+	postcode: str
+
+
+@dataclasses.dataclass
+class Customer:
+	name: str
+	email: str
+	address: Address
+
+
+@dataclasses.dataclass
+class LineItem:
+	sku: str
+	quantity: int
+	price: float
+
+
+@dataclasses.dataclass
+class Order:
+	id: int  # noqa: A003
+	customer: Customer
+	items: List[LineItem]
+	notes: Optional[str] = None
+
+
+def make_orders(n_objects: int) -> List[Order]:
+	"""
+	Construct a list of orders containing approximately ``n_objects`` dataclass instances.
+
+	:param n_objects:
+	"""
+
+	orders = []
+	for i in range(n_objects // 6):
+		address = Address(f"{i} High Street", "Cambridge", "CB1 1AA")
+		customer = Customer(f"Customer {i}", f"customer{i}@example.com", address)
+		items = [LineItem(f"SKU-{i}-{j}", j + 1, 9.99 * (j + 1)) for j in range(3)]
+		orders.append(Order(i, customer, items))
+
+	return orders
+
+
+def bench(label: str, orders: List[Order], expected: str) -> None:
+	assert sdjson.dumps(orders) == expected
+	best = min(timeit.repeat(lambda: sdjson.dumps(orders), number=5, repeat=5)) / 5
+	print(f"{label:<24}  {best * 1000:>9.2f} ms")
+
+
+def main(argv: List[str]) -> int:
+	n_objects = int(argv[0]) if argv else 10_000
+	orders = make_orders(n_objects)
+	classes = (Address, Customer, LineItem, Order)
+
+	print(f"Encoding {len(orders)} orders ({len(orders) * 6} dataclass instances)")
+
+	for cls in classes:
+		sdjson.register_encoder(cls, dataclasses.asdict)
+	expected = sdjson.dumps(orders)
+	bench("dataclasses.asdict", orders, expected)
+	for cls in classes:
+		sdjson.unregister_encoder(cls)
+
+	sdjson.register_field_encoders()
+	bench("encode_fields", orders, expected)
+	sdjson.unregister_encoder(sdjson.DataclassInstance)
+	sdjson.unregister_encoder(sdjson.AttrsInstance)
+
+	for cls in classes:
+		sdjson.compile_encoder(cls)
+	bench("compile_encoder", orders, expected)
+	for cls in classes:
+		sdjson.unregister_encoder(cls)
+
+	# Innermost first, so the schemas of nested classes are found.
+	for cls in classes:
+		sdjson.register_schema(cls)
+	bench("register_schema", orders, expected)
+	for cls in classes:
+		sdjson.unregister_encoder(cls)
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
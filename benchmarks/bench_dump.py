@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+#
+#  bench_dump.py
+"""
+Compare the throughput and peak memory usage of :func:`sdjson.dump`
+with the previous implementation, which wrote the output of :func:`sdjson.dumps`
+to the file one character at a time.
+
+Each measurement runs in a fresh subprocess so the peak RSS figures are independent.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_dump.py [size_mb ...]
+"""
+
+# stdlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# this package
+import sdjson
+
+VARIANTS = ("per_character", "chunked")
+
+
+def make_payload(size_mb: float) -> list:
+	"""
+	Construct a list of records which serializes to approximately ``size_mb`` megabytes.
+
+	:param size_mb:
+	"""
+
+	record = {"id": 0, "name": "record", "tags": ["a", "b", "c"], "value": 1.5, "active": True}
+	record_size = len(sdjson.dumps(record)) + 2
+	n_records = int(size_mb * 1024 * 1024 / record_size)
+	return [dict(record, id=i) for i in range(n_records)]
+
+
+def dump_per_character(obj, fp) -> None:  # noqa: MAN001
+	for chunk in sdjson.dumps(obj):
+		fp.write(chunk)
+
+
+def run_variant(variant: str, size_mb: float) -> None:
+	payload = make_payload(size_mb)
+	baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		with open(os.path.join(tmpdir, "out.json"), "w", encoding="UTF-8") as fp:
+			start = time.perf_counter()
+			if variant == "per_character":
+				dump_per_character(payload, fp)
+			else:
+				sdjson.dump(payload, fp)
+			elapsed = time.perf_counter() - start
+			written = fp.tell()
+
+	peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	print(f"{elapsed} {written} {max(peak_rss - baseline_rss, 0)}")
+
+
+def main(argv: list) -> int:
+	sizes = [float(arg) for arg in argv] or [1, 100]
+
+	print(f"{'size':>8}  {'variant':<14}  {'time (s)':>9}  {'MB/s':>8}  {'extra peak RSS (MB)':>20}")
+
+	for size_mb in sizes:
+		for variant in VARIANTS:
+			output = subprocess.check_output(
+					[sys.executable, __file__, "--run", variant, str(size_mb)],
+					universal_newlines=True,
+					)
+			elapsed, written, rss_kb = output.split()
+			throughput = int(written) / float(elapsed) / 1024 / 1024
+			print(
+					f"{size_mb:>6}MB  {variant:<14}  {float(elapsed):>9.3f}  "
+					f"{throughput:>8.1f}  {int(rss_kb) / 1024:>20.1f}"
+					)
+
+	return 0
+
+
+if __name__ == "__main__":
+	if sys.argv[1:2] == ["--run"]:
+		run_variant(sys.argv[2], float(sys.argv[3]))
+		sys.exit(0)
+
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#
+#  bench_load_path.py
+"""
+Compare the peak resident set size of loading a large JSON file with:
+
+* ``sdjson.load(open(path))``, which reads the whole file into a :class:`str` first;
+* ``sdjson.load(open(path, 'rb'))``, which keeps the :class:`bytes` read from the file alive while parsing;
+* ``sdjson.load_path(path)``, which reads the whole file into a :class:`bytes` object first;
+* ``sdjson.load_path(path, mmap=True)``, which decodes the memory-mapped file.
+
+The decoded :class:`str` must exist in full while the JSON is parsed, so the peak is usually reached while
+parsing, and both ``load_path()`` variants match ``load(open())``. They save the size of the file
+compared to ``load(open(path, 'rb'))``. Memory-mapping the file gives no further saving,
+as the mapped pages count towards the RSS while they are decoded.
+
+Each method is run in a fresh interpreter so the peak RSS of one does not hide that of another.
+The baseline is the RSS of the interpreter after importing sdjson and building nothing.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_load_path.py [size_mib]
+
+Requires a platform with the :mod:`resource` module (Linux or macOS).
+"""
+
+# stdlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+# this package
+import sdjson
+
+METHODS: Dict[str, str] = {
+		"baseline": "None",
+		"load(open())": "sdjson.load(open(path, encoding='UTF-8'))",
+		"load(open('rb'))": "sdjson.load(open(path, 'rb'))",
+		"load_path()": "sdjson.load_path(path)",
+		"load_path(mmap=True)": "sdjson.load_path(path, mmap=True)",
+		}
+
+CHILD = """
+import resource, sys, time
+import sdjson
+path = sys.argv[1]
+start = time.perf_counter()
+obj = {expression}
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+	peak //= 1024
+print(peak, elapsed)
+"""
+
+
+def write_file(path: str, size_mib: float) -> None:
+	"""
+	Write a JSON file of approximately ``size_mib`` MiB, consisting mostly of strings.
+
+	:param path:
+	:param size_mib:
+	"""
+
+	record = {"id": 0, "name": "x" * 40, "description": "Ünïcödé " * 20, "tags": ["a", "b", "c"], "score": 1.5}
+	n_records = int(size_mib * 2**20 / len(sdjson.dumps(record, ensure_ascii=False)))
+
+	with open(path, 'w', encoding="UTF-8") as fp:
+		sdjson.dump([dict(record, id=i) for i in range(n_records)], fp, ensure_ascii=False)
+
+
+def measure(expression: str, path: str) -> List[float]:
+	output = subprocess.check_output(
+			[sys.executable, "-c", CHILD.format(expression=expression), path],
+			env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+			)
+	peak, elapsed = output.split()
+	return [int(peak) / 1024, float(elapsed)]
+
+
+def main(argv: List[str]) -> int:
+	size_mib = float(argv[0]) if argv else 200
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		path = os.path.join(tmpdir, "data.json")
+		start = time.perf_counter()
+		write_file(path, size_mib)
+		print(f"Wrote {os.path.getsize(path) / 2**20:.0f} MiB in {time.perf_counter() - start:.1f} s")
+
+		for label, expression in METHODS.items():
+			peak, elapsed = measure(expression, path)
+			print(f"{label:<24}  {peak:>8.0f} MiB peak RSS  {elapsed:>6.2f} s")
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+#
+#  bench_loads_into.py
+"""
+Compare ways of decoding a list of orders into nested dataclass instances:
+
+* :func:`sdjson.loads` followed by hand-written constructors for each class;
+* an ``object_hook`` which guesses the class of each object from its keys;
+* ``sdjson.loads(text, into=List[Order])``.
+
+The time is the best of several runs, and the peak memory is measured with :mod:`tracemalloc`.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_loads_into.py [n_objects]
+"""
+
+# stdlib
+import dataclasses
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# this package
+import sdjson
+
+
+@dataclasses.dataclass
+class Address:
+	street: str
+	city: str
+	postcode: str
+
+
+@dataclasses.dataclass
+class Customer:
+	name: str
+	email: str
+	address: Address
+
+
+@dataclasses.dataclass
+class LineItem:
+	sku: str
+	quantity: int
+	price: float
+
+
+@dataclasses.dataclass
+class Order:
+	id: int  # noqa: A003
+	customer: Customer
+	items: List[LineItem]
+	notes: Optional[str] = None
+
+
+def make_text(n_objects: int) -> str:
+	"""
+	Construct the JSON for a list of orders containing approximately ``n_objects`` objects.
+
+	:param n_objects:
+	"""
+
+	orders = []
+	for i in range(n_objects // 6):
+		address = {"street": f"{i} High Street", "city": "Cambridge", "postcode": "CB1 1AA"}
+		customer = {"name": f"Customer {i}", "email": f"customer{i}@example.com", "address": address}
+		items = [{"sku": f"SKU-{i}-{j}", "quantity": j + 1, "price": 9.99 * (j + 1)} for j in range(3)]
+		orders.append({"id": i, "customer": customer, "items": items})
+
+	return sdjson.dumps(orders)
+
+
+def by_hand(text: str) -> List[Order]:
+	orders = []
+	for order in sdjson.loads(text):
+		customer = order["customer"]
+		orders.append(
+				Order(
+						order["id"],
+						Customer(customer["name"], customer["email"], Address(**customer["address"])),
+						[LineItem(**item) for item in order["items"]],
+						order.get("notes"),
+						)
+				)
+	return orders
+
+
+_classes_by_keys: Dict[frozenset, Callable[..., Any]] = {
+		frozenset(f.name for f in dataclasses.fields(cls)): cls
+		for cls in (Address, Customer, LineItem)
+		}
+
+
+def _guess_class(obj: Dict[str, Any]) -> Any:
+	keys = frozenset(obj)
+	if "id" in keys:
+		return Order(**obj)
+	return _classes_by_keys[keys](**obj)
+
+
+def with_object_hook(text: str) -> List[Order]:
+	return sdjson.loads(text, object_hook=_guess_class)
+
+
+def with_into(text: str) -> List[Order]:
+	return sdjson.loads(text, into=List[Order])
+
+
+def bench(label: str, func: Callable[[str], List[Order]], text: str, expected: List[Order]) -> None:
+	assert func(text) == expected
+
+	best = min(timeit.repeat(lambda: func(text), number=3, repeat=5)) / 3
+
+	tracemalloc.start()
+	func(text)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	print(f"{label:<16}  {best * 1000:>9.2f} ms  {peak / 2**20:>8.1f} MiB peak")
+
+
+def main(argv: List[str]) -> int:
+	n_objects = int(argv[0]) if argv else 60_000
+	text = make_text(n_objects)
+	expected = by_hand(text)
+
+	print(f"Decoding {len(expected)} orders ({len(text) / 2**20:.1f} MiB of JSON)")
+
+	bench("by hand", by_hand, text, expected)
+	bench("object_hook", with_object_hook, text, expected)
+	bench("into=", with_into, text, expected)
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
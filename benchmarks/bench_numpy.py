@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+#
+#  bench_numpy.py
+"""
+Compare ways of encoding large NumPy arrays:
+
+* a handler returning ``arr.tolist()``, encoded by the C encoder;
+* joining the result of one vectorised string conversion (``arr.astype(str)``);
+* :func:`sdjson.encode_numpy`, registered with :func:`sdjson.register_numpy_encoders`.
+
+For double precision floats the time is dominated by formatting each value,
+which CPython's ``float.__repr__`` does faster than NumPy's string conversion;
+materialising the Python floats with :meth:`~numpy.ndarray.tolist` is a small fraction of the total.
+For single precision floats :func:`sdjson.encode_numpy` is slower than ``tolist()``,
+but the output is much smaller as the values are not widened to double precision first.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/bench_numpy.py [n_elements]
+"""
+
+# stdlib
+import sys
+import timeit
+from typing import Any, Callable, List
+
+# 3rd party
+import numpy
+
+# this package
+import sdjson
+
+
+def bench(label: str, func: Callable[[], str]) -> None:
+	size = len(func())
+	best = min(timeit.repeat(func, number=1, repeat=3))
+	print(f"{label:<24}  {best * 1000:>9.2f} ms  {size / 1e6:>7.2f} MB")
+
+
+def join_strings(array: Any) -> str:
+	return "[" + ", ".join(array.astype(str).tolist()) + "]"
+
+
+def main(argv: List[str]) -> int:
+	n_elements = int(argv[0]) if argv else 1_000_000
+	rng = numpy.random.default_rng(0)
+	arrays = {
+			"float64": rng.standard_normal(n_elements),
+			"float32": rng.standard_normal(n_elements).astype(numpy.float32),
+			"int64": rng.integers(-1_000_000, 1_000_000, n_elements),
+			}
+
+	for dtype, array in arrays.items():
+		print(f"Encoding {n_elements} {dtype} values")
+
+		sdjson.register_encoder(numpy.ndarray, lambda obj: obj.tolist())
+		bench("tolist", lambda: sdjson.dumps(array))
+		sdjson.unregister_encoder(numpy.ndarray)
+
+		bench("astype(str) + join", lambda: join_strings(array))
+
+		sdjson.register_numpy_encoders()
+		bench("encode_numpy", lambda: sdjson.dumps(array))
+		sdjson.unregister_encoder(numpy.ndarray)
+		sdjson.unregister_encoder(numpy.generic)
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv[1:]))
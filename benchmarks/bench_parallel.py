@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+#
+#  bench_parallel.py
+"""
+Compare :func:`sdjson.dumps` with :func:`sdjson.dumps_parallel` for a large list of records
+containing custom objects, for increasing numbers of worker processes.
+
+``fork`` workers inherit the records from this process. ``spawn`` workers are sent pickled shards
+and pick up the encoders through ``registry_spec``.
+
+Usage::
+
+	PYTHONPATH=.:benchmarks python benchmarks/bench_parallel.py [n_records [workers ...]]
+"""
+
+# stdlib
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import List
+
+# this package
+import sdjson
+
+
+class Money:
+
+	def __init__(self, amount: Decimal, currency: str):
+		self.amount = amount
+		self.currency = currency
+
+
+registry = sdjson.Registry()
+
+
+@registry.register(Money)
+def encode_money(obj: Money) -> dict:
+	return {"amount": str(obj.amount.quantize(Decimal("0.01"))), "currency": obj.currency}
+
+
+@registry.register(datetime.datetime)
+def encode_datetime(obj: datetime.datetime) -> str:
+	return obj.isoformat()
+
+
+def make_records(n_records: int) -> list:
+	"""
+	Construct a list of ``n_records`` records, each containing several custom objects.
+
+	:param n_records:
+	"""
+
+	start = datetime.datetime(2020, 1, 1)
+	return [{
+			"id": i,
+			"created": start + datetime.timedelta(minutes=i),
+			"price": Money(Decimal(i) / 7, "GBP"),
+			"tax": Money(Decimal(i) / 35, "GBP"),
+			"tags": ["a", "b", "c"],
+			} for i in range(n_records)]
+
+
+def report(label: str, elapsed: float, baseline: float) -> None:
+	print(f"{label:<22}  {elapsed:>9.3f}  {baseline / elapsed:>8.2f}")
+
+
+def main(argv: List[str]) -> int:
+	n_records = int(argv[0]) if argv else 500_000
+	worker_counts = [int(arg) for arg in argv[1:]] or sorted({1, 2, 4, os.cpu_count() or 1})
+	records = make_records(n_records)
+
+	start = time.perf_counter()
+	expected = sdjson.dumps(records, registry=registry)
+	baseline = time.perf_counter() - start
+
+	print(f"Encoding {n_records} records ({len(expected) / 1024 / 1024:.1f}MB)")
+	print(f"{'method':<22}  {'time (s)':>9}  {'speedup':>8}")
+	report("dumps()", baseline, baseline)
+
+	for workers in worker_counts:
+		start = time.perf_counter()
+		output = sdjson.dumps_parallel(records, workers=workers, registry=registry)
+		report(f"fork({workers})", time.perf_counter() - start, baseline)
+		assert output == expected
+
+		# Start the pool up front so process start-up isn't included in the timings.
+		context = multiprocessing.get_context("spawn")
+		with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+			list(executor.map(abs, range(workers)))
+			start = time.perf_counter()
+			output = sdjson.dumps_parallel(
+					records,
+					executor=executor,
+					registry_spec="bench_parallel:registry",
+					registry=registry,
+					)
+			report(f"spawn+spec({workers})", time.perf_counter() - start, baseline)
+
+		assert output == expected
+
+	return 0
+
+
+if __name__ == "__main__":
+	# Use the importable module, so the classes pickled for the workers match those in ``registry_spec``.
+	# this package
+	import bench_parallel
+
+	sys.exit(bench_parallel.main(sys.argv[1:]))
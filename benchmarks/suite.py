@@ -0,0 +1,490 @@
+#!/usr/bin/env python
+#
+#  suite.py
+"""
+Benchmark suite for :mod:`sdjson`, covering dispatch, :func:`sdjson.dumps`, :func:`sdjson.dump`
+and protocol handlers with realistic payloads.
+
+Each case is timed against the equivalent call to the :mod:`json` module where there is one,
+using a ``default`` function in place of the registered encoders.
+Expressing the results as a ratio to the standard library makes the thresholds in :func:`make_cases`
+independent of the speed of the machine running the suite. The script exits with a non-zero
+status if any ratio exceeds its threshold.
+
+Results can also be saved, and compared against a previous run on the same machine,
+failing if any case has slowed down by more than ``--tolerance``.
+
+Usage::
+
+	PYTHONPATH=. python benchmarks/suite.py [--quick] [-k SUBSTRING] [--save FILE] [--compare FILE] [--tolerance 0.1]
+"""
+
+# stdlib
+import argparse
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import sys
+import timeit
+import uuid
+from abc import abstractmethod
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# 3rd party
+from typing_extensions import Protocol, runtime_checkable
+
+# this package
+import sdjson
+
+
+class Case(NamedTuple):
+	#: The name of the benchmark.
+	name: str
+
+	#: The function to time.
+	func: Callable[[], Any]
+
+	#: The equivalent function using the :mod:`json` module, if any.
+	reference: Optional[Callable[[], Any]] = None
+
+	#: The maximum permitted ratio of the time taken by ``func`` to that taken by ``reference``.
+	max_ratio: Optional[float] = None
+
+
+class Result(NamedTuple):
+	name: str
+	time: float
+	reference_time: Optional[float]
+	max_ratio: Optional[float]
+
+	@property
+	def ratio(self) -> Optional[float]:
+		if self.reference_time is None:
+			return None
+		return self.time / self.reference_time
+
+	@property
+	def passed(self) -> bool:
+		return self.max_ratio is None or self.ratio is None or self.ratio <= self.max_ratio
+
+
+# Payloads
+
+
+class Vector:
+
+	def __init__(self, x: float, y: float, z: float):
+		self.x = x
+		self.y = y
+		self.z = z
+
+
+def encode_vector(obj: Vector) -> Dict[str, float]:
+	return {"x": obj.x, "y": obj.y, "z": obj.z}
+
+
+@runtime_checkable
+class SupportsJSON(Protocol):
+
+	@abstractmethod
+	def __json__(self) -> Any:
+		pass
+
+
+class Tag:
+
+	def __init__(self, name: str, colour: str):
+		self.name = name
+		self.colour = colour
+
+	def __json__(self) -> Any:
+		return [self.name, self.colour]
+
+
+@dataclasses.dataclass(frozen=True)
+class Currency:
+	"""
+	An immutable value which recurs throughout a document.
+	"""
+
+	code: str
+	symbol: str
+	digits: int
+
+
+def encode_record_value(obj: Any) -> Any:
+	if isinstance(obj, Decimal):
+		return str(obj)
+	elif isinstance(obj, (datetime.datetime, datetime.date)):
+		return obj.isoformat()
+	elif isinstance(obj, uuid.UUID):
+		return str(obj)
+	raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def reference_default(obj: Any) -> Any:
+	"""
+	The ``default`` function passed to the :mod:`json` module in place of the registry.
+	"""
+
+	if isinstance(obj, Vector):
+		return encode_vector(obj)
+	elif isinstance(obj, Tag):
+		return obj.__json__()
+	elif isinstance(obj, Currency):
+		return dataclasses.asdict(obj)
+	return encode_record_value(obj)
+
+
+registry = sdjson.Registry()
+registry.register(Vector, encode_vector)
+registry.register(SupportsJSON, lambda obj: obj.__json__())
+registry.register(Currency, dataclasses.asdict, cache=True)
+for _cls in (Decimal, datetime.datetime, datetime.date, uuid.UUID):
+	registry.register(_cls, encode_record_value)
+
+
+def make_nested(depth: int, breadth: int) -> Dict[str, Any]:
+	"""
+	A deeply nested tree of dicts, as produced by configuration files and API responses.
+
+	:param depth:
+	:param breadth: The number of leaf values at each level.
+	"""
+
+	node: Dict[str, Any] = {f"leaf{i}": i * 1.5 for i in range(breadth)}
+	for level in range(depth):
+		node = {
+				"level": level,
+				"name": f"node {level}",
+				"enabled": level % 2 == 0,
+				"tags": ["alpha", "beta"],
+				"child": node,
+				"sibling": {f"leaf{i}": str(i) for i in range(breadth)},
+				}
+	return node
+
+
+def make_vectors(n: int) -> List[Vector]:
+	return [Vector(i, i * 0.5, -i) for i in range(n)]
+
+
+def make_records(n: int) -> List[Dict[str, Any]]:
+	start = datetime.datetime(2021, 1, 1, 12, 0)
+	return [{
+			"id": uuid.UUID(int=i),
+			"created": start + datetime.timedelta(seconds=i),
+			"date": datetime.date(2021, 1, 1) + datetime.timedelta(days=i % 365),
+			"amount": Decimal(i) / 100,
+			"tax": Decimal(i) / 600,
+			"currency": "GBP",
+			} for i in range(n)]
+
+
+def make_telemetry(n: int) -> List[Dict[str, Any]]:
+	return [{
+			"t": 1_600_000_000 + i * 0.25,
+			"lat": 51.5072 + i / 7_000,
+			"lon": -0.1275 - i / 11_000,
+			"readings": [15 + i / 13, 1013.25 - i / 17, 0.1 * i / 3],
+			} for i in range(n)]
+
+
+def make_tags(n: int) -> List[Dict[str, Any]]:
+	return [{"id": i, "tag": Tag(f"tag{i}", "red")} for i in range(n)]
+
+
+def make_prices(n: int) -> List[Dict[str, Any]]:
+	currencies = [Currency("GBP", "£", 2), Currency("EUR", "€", 2), Currency("JPY", "¥", 0)]
+	return [{"sku": i, "amount": i * 25, "currency": currencies[i % 3]} for i in range(n)]
+
+
+def make_profiles(n: int) -> List[str]:
+	"""
+	Serialized user profiles, as would be retrieved from a cache for embedding in a response.
+
+	:param n:
+	"""
+
+	return [
+			json.dumps({
+					"id": i,
+					"name": f"User {i}",
+					"email": f"user{i}@example.com",
+					"roles": ["reader", "editor"] if i % 3 else ["reader"],
+					"settings": {"theme": "dark", "notifications": i % 2 == 0, "scale": 1.25},
+					}) for i in range(n)
+			]
+
+
+# Cases
+
+
+def make_cases(scale: float) -> List[Case]:
+	"""
+	Construct the benchmark cases.
+
+	:param scale: Multiplier for the size of each payload.
+	"""
+
+	nested = [make_nested(depth=40, breadth=5) for _ in range(int(25 * scale) or 1)]
+	vectors = make_vectors(int(10_000 * scale) or 1)
+	records = make_records(int(2_000 * scale) or 1)
+	tags = make_tags(int(10_000 * scale) or 1)
+	telemetry = make_telemetry(int(10_000 * scale) or 1)
+	prices = make_prices(int(10_000 * scale) or 1)
+	profiles = make_profiles(int(10_000 * scale) or 1)
+	raw_profiles = [{"profile": sdjson.RawJSON(profile)} for profile in profiles]
+
+	vector = vectors[0]
+	tag = tags[0]["tag"]
+
+	def resolve(obj: Any) -> Callable[[], Any]:
+
+		def func() -> Any:
+			registry._state.table.clear()
+			return registry.dispatch(obj)
+
+		return func
+
+	devnull = open(os.devnull, "w", encoding="UTF-8")  # Left open until the process exits.
+
+	return [
+			Case("dispatch_concrete", lambda: registry.dispatch(vector)),
+			Case("dispatch_protocol", lambda: registry.dispatch(tag)),
+			Case("resolve_concrete", resolve(vector)),
+			Case("resolve_protocol", resolve(tag)),
+			Case(
+					"dumps_nested",
+					lambda: sdjson.dumps(nested, registry=registry),
+					lambda: json.dumps(nested),
+					max_ratio=1.25,
+					),
+			Case(
+					"dumps_nested_indent",
+					lambda: sdjson.dumps(nested, indent=2, registry=registry),
+					lambda: json.dumps(nested, indent=2),
+					max_ratio=1.25,
+					),
+			Case(
+					"dumps_custom_objects",
+					lambda: sdjson.dumps(vectors, registry=registry),
+					lambda: json.dumps(vectors, default=reference_default),
+					max_ratio=1.5,
+					),
+			Case(
+					"dumps_decimal_datetime",
+					lambda: sdjson.dumps(records, registry=registry),
+					lambda: json.dumps(records, default=reference_default),
+					max_ratio=1.5,
+					),
+			Case(
+					"dumps_protocol",
+					lambda: sdjson.dumps(tags, registry=registry),
+					lambda: json.dumps(tags, default=reference_default),
+					max_ratio=1.5,
+					),
+			Case(
+					"dumps_cached_handler",
+					lambda: sdjson.dumps(prices, registry=registry),
+					lambda: json.dumps(prices, default=reference_default),
+					max_ratio=0.6,
+					),
+			Case(
+					"dumps_float_precision",
+					lambda: sdjson.dumps(telemetry, float_precision=4, registry=registry),
+					lambda: json.dumps(telemetry),
+					max_ratio=2.0,
+					),
+			Case(
+					"dumps_float_format",
+					lambda: sdjson.dumps(telemetry, float_format=".6g", registry=registry),
+					lambda: json.dumps(telemetry),
+					max_ratio=2.5,
+					),
+			Case(
+					"dumps_raw_json",
+					lambda: sdjson.dumps(raw_profiles, registry=registry),
+					lambda: json.dumps([{"profile": json.loads(profile)} for profile in profiles]),
+					max_ratio=0.5,
+					),
+			Case(
+					"dump_file_nested",
+					lambda: sdjson.dump(nested, devnull, registry=registry),
+					lambda: json.dump(nested, devnull),
+					max_ratio=1.25,
+					),
+			Case(
+					"dump_file_decimal_datetime",
+					lambda: sdjson.dump(records, devnull, registry=registry),
+					lambda: json.dump(records, devnull, default=reference_default),
+					max_ratio=1.5,
+					),
+			Case(
+					"dump_file_raw_json",
+					lambda: sdjson.dump(raw_profiles, devnull, registry=registry),
+					lambda: json.dump([{"profile": json.loads(profile)} for profile in profiles], devnull),
+					max_ratio=0.5,
+					),
+			]
+
+
+# Measurement
+
+
+def calibrate(timer: timeit.Timer, min_time: float) -> int:
+	"""
+	Returns the number of calls needed for a run of ``timer`` to take at least ``min_time`` seconds.
+
+	:param timer:
+	:param min_time:
+	"""
+
+	number, elapsed = timer.autorange()
+	if elapsed < min_time:
+		number = max(int(number * min_time / elapsed), number)
+	return number
+
+
+def measure(funcs: List[Callable[[], Any]], repeat: int, min_time: float) -> List[float]:
+	"""
+	Returns the best time per call, in seconds, for each of ``funcs`` over ``repeat`` runs.
+
+	The runs of each function are interleaved, so that changes in the speed of the machine
+	during the benchmark affect each function equally.
+
+	:param funcs:
+	:param repeat:
+	:param min_time: The minimum duration of each run.
+	"""
+
+	timers = [timeit.Timer(func) for func in funcs]
+	numbers = [calibrate(timer, min_time) for timer in timers]
+	best = [float("inf")] * len(timers)
+
+	for _ in range(repeat):
+		for idx, (timer, number) in enumerate(zip(timers, numbers)):
+			best[idx] = min(best[idx], timer.timeit(number) / number)
+
+	return best
+
+
+def format_time(seconds: float) -> str:
+	for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+		if seconds >= scale:
+			return f"{seconds / scale:.2f} {unit}"
+	return f"{seconds / 1e-9:.0f} ns"
+
+
+def run(cases: List[Case], repeat: int, min_time: float) -> List[Result]:
+	results = []
+
+	print(f"{'benchmark':<28}  {'sdjson':>10}  {'json':>10}  {'ratio':>6}  {'limit':>6}")
+
+	for case in cases:
+		# Warm up caches (dispatch tables, encoder cache) before timing.
+		case.func()
+		if case.reference is not None:
+			case.reference()
+
+		if case.reference is None:
+			time, = measure([case.func], repeat, min_time)
+			reference_time = None
+		else:
+			time, reference_time = measure([case.func, case.reference], repeat, min_time)
+
+		result = Result(case.name, time, reference_time, case.max_ratio)
+		results.append(result)
+
+		ratio = "" if result.ratio is None else f"{result.ratio:.2f}"
+		limit = "" if case.max_ratio is None else f"{case.max_ratio:.2f}"
+		reference = "" if reference_time is None else format_time(reference_time)
+		status = "" if result.passed else "  FAIL"
+		print(f"{case.name:<28}  {format_time(time):>10}  {reference:>10}  {ratio:>6}  {limit:>6}{status}")
+
+	return results
+
+
+def compare(results: List[Result], baseline_file: str, tolerance: float) -> bool:
+	"""
+	Compare ``results`` with those saved in ``baseline_file``.
+
+	:param results:
+	:param baseline_file:
+	:param tolerance: The permitted fractional increase in time for each case.
+
+	:returns: Whether every case is within the tolerance.
+	"""
+
+	with open(baseline_file, encoding="UTF-8") as fp:
+		baseline = {result["name"]: result["time"] for result in json.load(fp)["results"]}
+
+	ok = True
+	print(f"\nCompared with {baseline_file} (tolerance {tolerance:.0%})")
+
+	for result in results:
+		if result.name not in baseline:
+			continue
+
+		change = result.time / baseline[result.name] - 1
+		status = ""
+		if change > tolerance:
+			status = "  SLOWER"
+			ok = False
+		print(f"{result.name:<28}  {change:>+8.1%}{status}")
+
+	return ok
+
+
+def save(results: List[Result], filename: str) -> None:
+	data = {
+			"python": platform.python_version(),
+			"implementation": platform.python_implementation(),
+			"machine": platform.machine(),
+			"results": [{
+					"name": result.name,
+					"time": result.time,
+					"reference_time": result.reference_time,
+					} for result in results],
+			}
+
+	with open(filename, "w", encoding="UTF-8") as fp:
+		json.dump(data, fp, indent=2)
+		fp.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser = argparse.ArgumentParser(description="Benchmark sdjson against the json module.")
+	parser.add_argument("--quick", action="store_true", help="Use smaller payloads and fewer repeats.")
+	parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose names contain this string.")
+	parser.add_argument("--save", metavar="FILE", help="Save the results to FILE as JSON.")
+	parser.add_argument("--compare", metavar="FILE", help="Compare the results with those saved in FILE.")
+	parser.add_argument(
+			"--tolerance",
+			type=float,
+			default=0.1,
+			help="The permitted fractional slowdown compared with --compare. Default 0.1.",
+			)
+	args = parser.parse_args(argv)
+
+	cases = make_cases(scale=0.1 if args.quick else 1)
+	if args.keyword:
+		cases = [case for case in cases if args.keyword in case.name]
+
+	print(f"sdjson {sdjson.__version__} on {platform.python_implementation()} {platform.python_version()}\n")
+	results = run(cases, repeat=3 if args.quick else 7, min_time=0.05 if args.quick else 0.2)
+	ok = all(result.passed for result in results)
+
+	if args.compare:
+		ok = compare(results, args.compare, args.tolerance) and ok
+	if args.save:
+		save(results, args.save)
+
+	return 0 if ok else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -72,8 +72,20 @@ different one it is not necessary to call this function: the
 :func:`@sdjson.register_encoder <sdjson.register_encoder>`
 decorator will replace any existing decorator for the given class.
 
+Custom decoders can be registered in a similar way, keyed on a type tag stored in each JSON object:
 
-.. TODO:: This module does not currently support custom decoders, but might in the future.
+.. code-block:: python
+
+	>>> @sdjson.register_decoder("myclass")
+	>>> def decode_myclass(obj):
+	...     return MyClass(obj["menu"])
+	>>>
+	>>> sdjson.loads('{"__type__": "myclass", "menu": ["spam"]}')
+	<MyClass object at 0x...>
+	>>>
+
+The key holding the type tag can be changed, or replaced by a function of the whole object,
+with :func:`~.set_decoder_discriminator`.
 """  # noqa: D400
 #
 #  Copyright © 2020-2021 Dominic Davis-Foster <dominic@davis-foster.co.uk>
@@ -113,32 +125,96 @@ decorator will replace any existing decorator for the given class.
 #
 
 # stdlib
+import codecs
+import collections.abc
+import importlib
+import io
+import itertools
 import json
+import operator
+import os
+import re
 import sys
-from functools import singledispatch
-from typing import IO, Any, Callable, Iterator, Optional, Tuple, Type, Union
+import threading
+from abc import get_cache_token
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, singledispatch
+from keyword import iskeyword
+from time import perf_counter
+from typing import (
+		IO,
+		TYPE_CHECKING,
+		Any,
+		Callable,
+		ClassVar,
+		Dict,
+		FrozenSet,
+		Hashable,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		NamedTuple,
+		Optional,
+		Sequence,
+		Tuple,
+		Type,
+		Union,
+		get_type_hints
+		)
 
-# 3rd party
-from domdf_python_tools.doctools import append_docstring_from, is_documented_by, make_sphinx_links
+if TYPE_CHECKING:
+	# stdlib
+	import concurrent.futures
 
 if sys.version_info < (3, 8):  # pragma: no cover (py38+)
 	# 3rd party
-	from typing_extensions import _ProtocolMeta
+	from typing_extensions import Protocol, _ProtocolMeta, runtime_checkable
 else:  # pragma: no cover (<py38)
 	# stdlib
-	from typing import _ProtocolMeta
+	from typing import Protocol, _ProtocolMeta, runtime_checkable
 
 __all__ = [
 		"load",
 		"loads",
+		"load_path",
+		"iterload",
 		"JSONDecoder",
 		"JSONDecodeError",
 		"dump",
+		"dump_async",
 		"dumps",
+		"dumps_bytes",
+		"dumps_parallel",
+		"dump_lines",
+		"load_lines",
 		"JSONEncoder",
+		"RawJSON",
 		"encoders",
+		"Registry",
+		"HandlerStats",
+		"get_registry",
 		"register_encoder",
 		"unregister_encoder",
+		"compile_encoder",
+		"register_schema",
+		"decoders",
+		"register_decoder",
+		"unregister_decoder",
+		"register_constructor",
+		"unregister_constructor",
+		"set_decoder_discriminator",
+		"DataclassInstance",
+		"AttrsInstance",
+		"encode_fields",
+		"register_field_encoders",
+		"encode_numpy",
+		"register_numpy_encoders",
+		"DEFAULT_CHUNK_SIZE",
+		"ENCODER_CACHE_SIZE",
+		"encoder_cache_info",
+		"clear_encoder_cache",
 		]
 
 __author__ = "Dominic Davis-Foster"
@@ -147,7 +223,12 @@ __license__ = "MIT"
 __version__ = "0.3.1"
 __email__ = "dominic@davis-foster.co.uk"
 
-# TODO: perhaps add a limit on number of decimal places for floats etc, like with pandas' jsons
+#: The default number of characters buffered by :func:`~.dump` before each call to ``fp.write()``,
+#: and read at a time by :func:`~.iterload`.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+#: The maximum number of encoders with non-default options retained by :func:`~.dumps` for reuse.
+ENCODER_CACHE_SIZE = 128
 
 json.decoder.JSONDecoder.__module__ = "json"
 json.encoder.JSONEncoder.__module__ = "json"
@@ -180,9 +261,18 @@ def allow_unregister(func) -> Callable:  # noqa: MAN001
 def sphinxify_json_docstring() -> Callable:
 	"""
 	Turn references in the docstring to :class:`~json.JSONEncoder` into proper links.
+
+	The links are only useful in the documentation, so the docstring is left unchanged
+	unless Sphinx has been imported.
 	"""
 
 	def wrapper(target):  # noqa: MAN001,MAN002
+		if "sphinx" not in sys.modules:
+			return target
+
+		# 3rd party
+		from domdf_python_tools.doctools import make_sphinx_links
+
 		# To save having the `sphinxify_docstring` decorator too
 		target.__doc__ = make_sphinx_links(target.__doc__)
 
@@ -194,241 +284,3233 @@ def sphinxify_json_docstring() -> Callable:
 	return wrapper
 
 
-class _Encoders:
+def _cleandoc(doc: str) -> str:
+	"""
+	Equivalent to :func:`inspect.cleandoc`, without the cost of importing :mod:`inspect`.
 
-	def __init__(self):
-		self._registry = allow_unregister(singledispatch(lambda x: None))
-		self._protocol_registry = {}
-		self.registry = self._registry.registry
+	:param doc:
+	"""
 
-	def register(self, cls: Type, func: Optional[Callable] = None) -> Callable:
-		"""
-		Registers a new handler for the given type.
+	lines = doc.expandtabs().split("\n")
+	margin = min((len(line) - len(line.lstrip()) for line in lines[1:] if line.lstrip()), default=0)
+	lines = [lines[0].lstrip()] + [line[margin:] for line in lines[1:]]
 
-		Can be used as a decorator or a regular function:
+	while lines and not lines[-1]:
+		lines.pop()
+	while lines and not lines[0]:
+		lines.pop(0)
 
-		.. code-block:: python
+	return "\n".join(lines)
 
-			@register_encoder(bytes)
-			def bytes_encoder(obj):
-				return obj.decode("UTF-8")
 
-			def int_encoder(obj):
-				return int(obj)
+def _append_docstring_from(original: Callable) -> Callable:
+	"""
+	Decorator to append the docstring from the ``original`` function to the ``target`` function.
 
-			register_encoder(int, int_encoder)
+	Equivalent to :func:`domdf_python_tools.doctools.append_docstring_from`.
 
+	:param original:
+	"""
 
-		:param cls:
-		:param func:
-		"""
+	def wrapper(target):  # noqa: MAN001,MAN002
+		if isinstance(original.__doc__, str):
+			if isinstance(target.__doc__, str):
+				target.__doc__ = f"{_cleandoc(target.__doc__)}\n\n{_cleandoc(original.__doc__)}\n"
+			else:
+				target.__doc__ = f"{_cleandoc(original.__doc__)}\n"
+		return target
 
-		if func is None:
-			return lambda f: self.register(cls, f)
+	return wrapper
 
-		if isinstance(cls, _ProtocolMeta):
-			if getattr(cls, "_is_runtime_protocol", False):
-				self._protocol_registry[cls] = func
-			else:
-				raise TypeError("Protocols must be @runtime_checkable")
-			return func
-		else:
-			return self._registry.register(cls, func)
 
-	def dispatch(self, cls: object) -> Optional[Callable]:
-		"""
-		Returns the best available implementation for the given object.
+def _is_documented_by(original: Callable) -> Callable:
+	"""
+	Decorator to set the docstring of the ``target`` function to that of the ``original`` function.
 
-		:param cls:
-		"""
+	:param original:
+	"""
 
-		if object in self.registry:
-			self.unregister(object)
+	def wrapper(target):  # noqa: MAN001,MAN002
+		target.__doc__ = original.__doc__
+		return target
 
-		handler = self._registry.dispatch(type(cls))
-		if handler is not None:
-			return handler
-		else:
-			for protocol, handler in self._protocol_registry.items():
-				if isinstance(cls, protocol):
-					return handler
+	return wrapper
 
-		return None
 
-	def unregister(self, cls: Type) -> None:
-		"""
-		Unregister the handler for the given type.
+def _static_fields(cls: Type) -> Optional[List[Tuple[str, str]]]:
+	"""
+	Returns a list of ``(key, attribute)`` pairs for the fields of ``cls``,
+	or :py:obj:`None` if they cannot be determined from the class alone.
 
-		.. code-block:: python
+	Dataclasses, attrs classes, namedtuples, and classes using ``__slots__`` throughout their MRO are supported.
 
-			unregister_encoder(int)
+	:param cls:
+	"""
 
-		:param cls:
+	if hasattr(cls, "__dataclass_fields__"):
+		# stdlib
+		import dataclasses
+		fields = [(f.name, f.name) for f in dataclasses.fields(cls)]
 
-		:raise KeyError: if no handler is found.
-		"""
+	elif hasattr(cls, "__attrs_attrs__"):
+		fields = [(a.name, a.name) for a in cls.__attrs_attrs__]
 
-		if cls in self.registry:
-			self._registry.unregister(cls)
-		elif cls in self._protocol_registry:
-			del self._protocol_registry[cls]
-		else:
-			raise KeyError
+	elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+		fields = [(name, name) for name in cls._fields]
 
+	else:
+		fields = []
+		for klass in reversed(cls.__mro__[:-1]):
+			if "__slots__" not in vars(klass):
+				# Instances have a __dict__, so may have any number of attributes.
+				return None
 
-encoders = _Encoders()
-register_encoder = encoders.register
-unregister_encoder = encoders.unregister
+			slots = klass.__slots__
+			if isinstance(slots, str):
+				slots = (slots, )
 
+			for name in slots:
+				if name == "__dict__":
+					return None
+				elif name == "__weakref__":
+					continue
+				elif name.startswith("__") and not name.endswith("__"):
+					fields.append((name, f"_{klass.__name__.lstrip('_')}{name}"))
+				else:
+					fields.append((name, name))
 
-@sphinxify_json_docstring()
-@append_docstring_from(json.dump)
-def dump(obj: Any, fp: IO, **kwargs: Any):  # TODO  # noqa: MAN001,MAN002
+		if not fields:
+			return None
+
+	for key, attribute in fields:
+		if not attribute.isidentifier() or iskeyword(attribute):
+			return None
+
+	return fields
+
+
+def _compile_plan(cls: Type, fields: List[Tuple[str, str]]) -> Callable:
 	"""
-	Serialize custom Python classes to JSON.
-	Custom classes can be registered using the ``@encoders.register(<type>)`` decorator.
+	Generate a function which converts instances of ``cls`` into a :class:`dict`,
+	reading each of the given fields directly.
+
+	:param cls:
+	:param fields: A list of ``(key, attribute)`` pairs.
 	"""
 
-	iterable = dumps(obj, **kwargs)
+	items = ", ".join(f"{key!r}: obj.{attribute}" for key, attribute in fields)
+	namespace: Dict[str, Any] = {}
+	exec(f"def encode(obj):\n\treturn {{{items}}}\n", namespace)
 
-	for chunk in iterable:
-		fp.write(chunk)
+	plan = namespace["encode"]
+	plan.__name__ = plan.__qualname__ = f"encode_{cls.__name__}"
+	plan.__module__ = __name__
+	return plan
 
 
-dump.__doc__ += "\n.. latex:clearpage::\n"
+def _is_classvar(hint: Any) -> bool:
+	return hint is ClassVar or getattr(hint, "__origin__", None) is ClassVar
 
 
-@sphinxify_json_docstring()
-@append_docstring_from(json.dumps)
-def dumps(
-		obj: Any,
-		*,
-		skipkeys: bool = False,
-		ensure_ascii: bool = True,
-		check_circular: bool = True,
-		allow_nan: bool = True,
-		cls: Optional[Type[json.JSONEncoder]] = None,
-		indent: Union[None, int, str] = None,
-		separators: Optional[Tuple[str, str]] = None,
-		default: Optional[Callable[[Any], Any]] = None,
-		sort_keys: bool = False,
-		**kwargs: Any,
-		) -> str:
+def _unwrap_optional(hint: Any) -> Any:
 	"""
-	Serialize custom Python classes to JSON.
-	Custom classes can be registered using the ``@encoders.register(<type>)`` decorator.
+	Returns ``T`` for ``Optional[T]``, otherwise returns ``hint`` unchanged.
+
+	:param hint:
 	"""
 
-	if (
-			not skipkeys and ensure_ascii and check_circular and allow_nan and cls is None and indent is None
-			and separators is None and default is None and not sort_keys and not kwargs
+	if getattr(hint, "__origin__", None) is Union:
+		args = [arg for arg in hint.__args__ if arg is not type(None)]
+		if len(args) == 1:
+			return args[0]
+
+	return hint
+
+
+def _schema_fields(cls: Type) -> Optional[List[Tuple[str, str, Any]]]:
+	"""
+	Returns a list of ``(key, attribute, type hint)`` triples for the fields of ``cls``,
+	or :py:obj:`None` if they cannot be determined.
+
+	The fields are those found by :func:`~._static_fields`, or failing that the annotated attributes of the class.
+	Fields without a usable annotation have the type hint :py:obj:`typing.Any`.
+
+	:param cls:
+	"""
+
+	try:
+		hints = get_type_hints(cls)
+	except Exception:
+		# e.g. forward references which cannot be resolved.
+		hints = {}
+
+	fields = _static_fields(cls)
+	if fields is None:
+		fields = [
+				(name, name)
+				for name, hint in hints.items()
+				if not _is_classvar(hint) and name.isidentifier() and not iskeyword(name)
+				]
+		if not fields:
+			return None
+
+	return [(key, attribute, hints.get(key, Any)) for key, attribute in fields]
+
+
+_SEQUENCE_ORIGINS = (list, tuple, collections.abc.Sequence, collections.abc.MutableSequence)
+_MAPPING_ORIGINS = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def _schema_conversion(
+		hint: Any,
+		resolve: Callable[[Any], Optional[Callable]],
+		namespace: Dict[str, Any],
+		variable: str,
+		) -> Optional[str]:
+	"""
+	Returns the source code of the statements converting the value in ``variable`` according to the type hint,
+	or :py:obj:`None` if no conversion is required.
+
+	The handlers and types used by the statements are added to ``namespace``.
+
+	:param hint:
+	:param resolve: Function returning the handler for the given type, if any.
+	:param namespace:
+	:param variable:
+	"""
+
+	hint = _unwrap_optional(hint)
+	handler_name, type_name = f"{variable}_handler", f"{variable}_type"
+
+	handler = resolve(hint)
+	if handler is not None:
+		namespace[handler_name], namespace[type_name] = handler, hint
+		return f"\tif {variable}.__class__ is {type_name}:\n\t\t{variable} = {handler_name}({variable})"
+
+	origin = getattr(hint, "__origin__", None)
+	args = getattr(hint, "__args__", None) or ()
+
+	if origin in _SEQUENCE_ORIGINS and args:
+		if origin is tuple and not (len(args) == 1 or (len(args) == 2 and args[1] is Ellipsis)):
+			# Heterogeneous tuple
+			return None
+
+		element = _unwrap_optional(args[0])
+		handler = resolve(element)
+		if handler is None:
+			return None
+
+		namespace[handler_name], namespace[type_name] = handler, element
+		return (
+				f"\tif {variable}.__class__ is list or {variable}.__class__ is tuple:\n"
+				f"\t\t{variable} = [{handler_name}(x) if x.__class__ is {type_name} else x for x in {variable}]"
+				)
+
+	if origin in _MAPPING_ORIGINS and len(args) == 2:
+		element = _unwrap_optional(args[1])
+		handler = resolve(element)
+		if handler is None:
+			return None
+
+		namespace[handler_name], namespace[type_name] = handler, element
+		return (
+				f"\tif {variable}.__class__ is dict:\n"
+				f"\t\t{variable} = {{k: {handler_name}(x) if x.__class__ is {type_name} else x "
+				f"for k, x in {variable}.items()}}"
+				)
+
+	return None
+
+
+def _compile_schema(
+		cls: Type,
+		fields: List[Tuple[str, str, Any]],
+		resolve: Callable[[Any], Optional[Callable]],
+		) -> Callable:
+	"""
+	Generate a function which converts instances of ``cls`` into a :class:`dict`,
+	reading each of the given fields directly and calling the handler for its annotated type.
+
+	:param cls:
+	:param fields: A list of ``(key, attribute, type hint)`` triples.
+	:param resolve: Function returning the handler for the given type, if any.
+	"""
+
+	namespace: Dict[str, Any] = {}
+	statements = []
+	items = []
+
+	for index, (key, attribute, hint) in enumerate(fields):
+		variable = f"v{index}"
+		conversion = _schema_conversion(hint, resolve, namespace, variable)
+		if conversion is None:
+			items.append(f"{key!r}: obj.{attribute}")
+		else:
+			statements.append(f"\t{variable} = obj.{attribute}")
+			statements.append(conversion)
+			items.append(f"{key!r}: {variable}")
+
+	body = "".join(f"{statement}\n" for statement in statements)
+	exec(f"def encode(obj):\n{body}\treturn {{{', '.join(items)}}}\n", namespace)
+
+	plan = namespace["encode"]
+	plan.__name__ = plan.__qualname__ = f"encode_{cls.__name__}"
+	plan.__module__ = __name__
+	return plan
+
+
+# Types which the json module serializes itself, without calling ``default()``.
+_NATIVE_TYPES = (str, int, float, list, tuple, dict)
+
+
+#: The maximum number of types whose handlers are stored by :meth:`Registry.dispatch() <.Registry.dispatch>`.
+_MAX_DISPATCH_TABLE_SIZE = 1024
+
+
+class _RegistryState:
+	"""
+	An immutable snapshot of the handlers in a :class:`~.Registry`.
+
+	:param handlers: Mapping of concrete types to handlers.
+	:param protocols: Mapping of protocols to handlers.
+	:param plans: Mapping of types to encoders generated by :meth:`Registry.compile() <.Registry.compile>`.
+	"""
+
+	__slots__ = ("handlers", "protocols", "plans", "dispatcher", "registry", "table", "cache_token", "intercepted")
+
+	def __init__(
+			self,
+			handlers: Dict[Type, Callable],
+			protocols: Dict[Type, Callable],
+			plans: Dict[Type, Callable],
 			):
-		return _default_encoder.encode(obj)
-	if cls is None:  # pragma: no cover (!CPython)   # TODO
-		cls = _CustomEncoder
-	return cls(
-			skipkeys=skipkeys,
-			ensure_ascii=ensure_ascii,
-			check_circular=check_circular,
-			allow_nan=allow_nan,
-			indent=indent,
-			separators=separators,
-			default=default,
-			sort_keys=sort_keys,
-			**kwargs
-			).encode(obj)
+		self.handlers = handlers
+		self.protocols = protocols
+		self.plans = plans
 
+		self.dispatcher = allow_unregister(singledispatch(lambda x: None))
 
-# Provide access to remaining objects from json module.
-# We have to do it this way to sort out the docstrings for sphinx without
-#  modifying the original docstrings.
-@sphinxify_json_docstring()
-@append_docstring_from(json.load)
-def load(*args, **kwargs):  # pragma: no cover (!CPython)  # TODO  # noqa: MAN001,MAN002
+		# singledispatch registers its default implementation for ``object``,
+		# which would otherwise match everything before the protocols are tried.
+		self.dispatcher.unregister(object)
+
+		self.cache_token: Optional[object] = None
+		for cls, func in handlers.items():
+			self.dispatcher.register(cls, func)
+			if self.cache_token is None and hasattr(cls, "__abstractmethods__"):
+				# Registering virtual subclasses of an ABC can change the dispatch result.
+				self.cache_token = get_cache_token()
+
+		self.registry = self.dispatcher.registry
+		self.table: Dict[Type, Optional[Callable]] = {}
+		self.intercepted = frozenset(
+				cls for cls in (*self.registry, *plans)
+				if isinstance(cls, type) and issubclass(cls, _NATIVE_TYPES) and cls not in _NATIVE_TYPES
+				)
+
+
+class HandlerStats(NamedTuple):
 	"""
-	Alias of :func:`json.load`.
+	Statistics for a handler, as returned by :meth:`Registry.stats() <.Registry.stats>`.
 	"""
 
-	return json.load(*args, **kwargs)
+	#: How the handler was resolved: ``"compiled"``, ``"concrete"`` or ``"protocol"``.
+	path: str
 
+	#: The number of times the handler was called.
+	calls: int
 
-@sphinxify_json_docstring()
-@append_docstring_from(json.loads)
-def loads(*args, **kwargs):  # pragma: no cover (!CPython)  # TODO  # noqa: MAN001,MAN002
+	#: The total time, in seconds, spent in the handler.
+	#: This excludes encoding the value it returns.
+	total_time: float
+
+	#: The number of times a type was resolved to the handler.
+	resolutions: int
+
+	#: The total time, in seconds, spent resolving types to the handler.
+	resolution_time: float
+
+
+class _StatsRecord:
 	"""
-	Alias of :func:`json.loads`.
+	Mutable counterpart of :class:`~.HandlerStats`, updated by instrumented handlers.
 	"""
 
-	return json.loads(*args, **kwargs)
+	__slots__ = ("path", "calls", "total_time", "resolutions", "resolution_time")
 
+	def __init__(self, path: str):
+		self.path = path
+		self.calls = 0
+		self.total_time = 0.0
+		self.resolutions = 0
+		self.resolution_time = 0.0
 
-@sphinxify_json_docstring()
-@append_docstring_from(json.JSONEncoder)
-class JSONEncoder(json.JSONEncoder):
+
+def _instrument(handler: Callable, record: _StatsRecord) -> Callable:
 	"""
-	Alias of :class:`json.JSONEncoder`.
+	Wrap ``handler`` to count its calls and the time spent in it in ``record``.
 
-	.. autosummary-widths:: 31/100
+	:param handler:
+	:param record:
 	"""
 
-	def __init__(self, *args, **kwargs):
-		super().__init__(*args, **kwargs)
+	def instrumented(obj: Any) -> Any:
+		start = perf_counter()
+		try:
+			return handler(obj)
+		finally:
+			record.calls += 1
+			record.total_time += perf_counter() - start
 
-	@sphinxify_json_docstring()
-	@is_documented_by(json.JSONEncoder.default)
-	def default(self, o: Any) -> Any:  # noqa: D102
-		return super().default(o)
+	instrumented.__wrapped__ = handler  # type: ignore[attr-defined]
+	return instrumented
 
-	@sphinxify_json_docstring()
-	@is_documented_by(json.JSONEncoder.encode)
-	def encode(self, o: Any) -> Any:  # noqa: D102
-		return super().encode(o)
 
-	@sphinxify_json_docstring()
-	@is_documented_by(json.JSONEncoder.iterencode)
-	def iterencode(  # noqa: D102
-			self,
-			o: Any,
-			_one_shot: bool = False,
-			) -> Iterator[str]:  # pragma: no cover (!CPython)
-		return super().iterencode(o, _one_shot)
+class _CacheKey:
+	"""
+	Key for the results cached by :func:`~._cache_handler`, which compares equal to keys
+	for which ``key`` is equal, and carries the object to pass to the handler.
 
+	:param key: The hashable key.
+	:param obj: The object passed to the handler.
 
-@sphinxify_json_docstring()
-@append_docstring_from(json.JSONDecoder)
-class JSONDecoder(json.JSONDecoder):  # pragma: no cover (!CPython)  # TODO
+	:raises TypeError: If ``key`` is unhashable.
 	"""
-	Alias of :class:`json.JSONDecoder`.
 
-	.. autosummary-widths:: 35/100
+	__slots__ = ("key", "obj", "hashvalue")
+
+	def __init__(self, key: Any, obj: Any):
+		self.key = key
+		self.obj = obj
+		self.hashvalue = hash(key)
+
+	def __hash__(self) -> int:
+		return self.hashvalue
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, _CacheKey) and self.key == other.key
+
+
+def _default_cache_key(obj: Any) -> Any:
 	"""
+	Returns the key under which the result of the handler for ``obj`` is cached.
 
-	def __init__(self, *args, **kwargs):
-		super().__init__(*args, **kwargs)
+	Equal objects may be serialized differently (for example ``Decimal("1.5")`` and ``Decimal("1.50")``),
+	so their :func:`repr` is compared as well as the objects themselves, if their class defines one.
 
-	@sphinxify_json_docstring()
-	@is_documented_by(json.JSONDecoder.decode)
-	def decode(self, *args, **kwargs):  # noqa: MAN002,D102
-		return super().decode(*args, **kwargs)
+	:param obj:
+	"""
 
-	@sphinxify_json_docstring()
-	@is_documented_by(json.JSONDecoder.raw_decode)
-	def raw_decode(self, *args, **kwargs):  # noqa: MAN002,D102
-		return super().raw_decode(*args, **kwargs)
+	obj_type = type(obj)
+	if obj_type.__repr__ is object.__repr__:
+		# The default repr() identifies the object rather than its value.
+		return obj_type, obj
 
+	return obj_type, obj, repr(obj)
 
-JSONDecodeError = json.JSONDecodeError
 
+def _cache_handler(
+		handler: Callable,
+		maxsize: Optional[int],
+		key: Callable[[Any], Hashable] = _default_cache_key,
+		) -> Callable:
+	"""
+	Wrap ``handler`` with a least-recently-used cache of its results,
+	keyed on the value returned by ``key`` for each (hashable) object.
 
-# Custom encoder for sdjson
-class _CustomEncoder(JSONEncoder):
+	The wrapper has the ``cache_info()`` and ``cache_clear()`` methods of :func:`functools.lru_cache`.
 
-	def default(self, obj):  # noqa: MAN001,MAN002
-		handler = encoders.dispatch(obj)
-		if handler is not None:
+	:param handler:
+	:param maxsize: The maximum number of results to retain, or :py:obj:`None` for no limit.
+	:param key: Function returning the key for each object.
+	"""  # noqa: D400
+
+	cached = lru_cache(maxsize=maxsize)(lambda cache_key: handler(cache_key.obj))
+
+	def cached_handler(obj: Any) -> Any:
+		try:
+			cache_key = _CacheKey(key(obj), obj)
+		except TypeError:
+			# Unhashable objects are passed straight to the handler.
 			return handler(obj)
 
-		return super().default(obj)
+		return cached(cache_key)
+
+	cached_handler.cache_info = cached.cache_info  # type: ignore[attr-defined]
+	cached_handler.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+	cached_handler.__wrapped__ = handler  # type: ignore[attr-defined]
+	return cached_handler
+
+
+class Registry:
+	"""
+	A registry of custom encoders.
+
+	The module-level functions such as :func:`~.register_encoder` operate on the default registry, :data:`~.encoders`.
+	Separate registries can be created for use with particular calls to :func:`~.dumps`
+	(via the ``registry`` keyword argument) or within a particular context (see :meth:`~.Registry.activate`).
+
+	Modifying a registry replaces its contents with a new immutable snapshot,
+	so encoding in other threads is never blocked and never sees a partially updated registry.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._state = _RegistryState({}, {}, {})
+		self._stats_enabled = False
+		self._stats: Dict[Type, _StatsRecord] = {}
+		self._schemas: Dict[Type, List[Tuple[str, str, Any]]] = {}
+
+	@property
+	def registry(self) -> Mapping[Type, Callable]:
+		"""
+		Read-only mapping of concrete types to their handlers.
+		"""
+
+		return self._state.registry
+
+	@property
+	def _registry(self) -> Callable:
+		return self._state.dispatcher
+
+	@property
+	def _protocol_registry(self) -> Dict[Type, Callable]:
+		return self._state.protocols
+
+	@property
+	def _plans(self) -> Dict[Type, Callable]:
+		return self._state.plans
+
+	@property
+	def _dispatch_table(self) -> Dict[Type, Optional[Callable]]:
+		return self._state.table
+
+	@property
+	def _intercepted(self) -> FrozenSet[Type]:
+		return self._state.intercepted
+
+	def register(
+			self,
+			cls: Type,
+			func: Optional[Callable] = None,
+			*,
+			cache: bool = False,
+			maxsize: Optional[int] = 128,
+			key: Optional[Callable[[Any], Hashable]] = None,
+			) -> Callable:
+		"""
+		Registers a new handler for the given type.
+
+		Can be used as a decorator or a regular function:
+
+		.. code-block:: python
+
+			@register_encoder(bytes)
+			def bytes_encoder(obj):
+				return obj.decode("UTF-8")
+
+			def int_encoder(obj):
+				return int(obj)
+
+			register_encoder(int, int_encoder)
+
+		Pass ``cache=True`` to retain the results of the handler for up to ``maxsize`` hashable objects,
+		so values which recur throughout a document, such as constants or frozen dataclasses,
+		are only passed to the handler once. The results are reused for any object of the same type which is equal
+		and (if its class defines one) has the same :func:`repr`,
+		so ``Decimal("1.5")`` and ``Decimal("1.50")`` are kept apart.
+		Pass a ``key`` function to choose which objects share a result instead.
+		This is only worthwhile for handlers which take longer than hashing the object,
+		such as :func:`dataclasses.asdict`. The results should not be modified once returned.
+		See :meth:`~.Registry.cache_info` and :meth:`~.Registry.cache_clear`.
+
+		:param cls:
+		:param func:
+		:param cache: Whether to cache the results of the handler.
+		:param maxsize: The maximum number of results to cache, or :py:obj:`None` for no limit.
+		:param key: Function returning the (hashable) key under which the result for each object is cached.
+		"""
+
+		if func is None:
+			return lambda f: self.register(cls, f, cache=cache, maxsize=maxsize, key=key)
+
+		handler = _cache_handler(func, maxsize, key or _default_cache_key) if cache else func
+
+		with self._lock:
+			state = self._state
+
+			if isinstance(cls, _ProtocolMeta):
+				if not getattr(cls, "_is_runtime_protocol", False):
+					raise TypeError("Protocols must be @runtime_checkable")
+				self._set_state(state.handlers, {**state.protocols, cls: handler}, state.plans)
+			else:
+				self._set_state({**state.handlers, cls: handler}, state.protocols, state.plans)
+
+		return func
+
+	def dispatch(self, cls: object) -> Optional[Callable]:
+		"""
+		Returns the best available implementation for the given object.
+
+		The handler is resolved once per type, checking compiled encoders,
+		then the concrete types and then the protocols,
+		and the result (including the absence of a handler) is stored until a handler is next
+		registered or unregistered.
+
+		:param cls:
+		"""
+
+		state = self._state
+
+		if state.cache_token is not None:
+			current_token = get_cache_token()
+			if state.cache_token != current_token:
+				state.table = {}
+				state.cache_token = current_token
+
+		table = state.table
+
+		try:
+			return table[type(cls)]
+		except KeyError:
+			pass
+
+		obj_type = type(cls)
+
+		if self._stats_enabled:
+			start = perf_counter()
+			handler, registered, path = self._resolve(state, cls)
+			if handler is not None:
+				record = self._stats.get(registered)
+				if record is None:
+					record = self._stats.setdefault(registered, _StatsRecord(path))
+				record.resolutions += 1
+				record.resolution_time += perf_counter() - start
+				handler = _instrument(handler, record)
+		else:
+			handler = self._resolve(state, cls)[0]
+
+		if len(table) >= _MAX_DISPATCH_TABLE_SIZE:
+			# Start again rather than keep every class ever encoded (including those created at runtime) alive.
+			table.clear()
+
+		table[obj_type] = handler
+		return handler
+
+	@staticmethod
+	def _resolve(state: _RegistryState, obj: object) -> Tuple[Optional[Callable], Any, str]:
+		"""
+		Find the handler for the given object in ``state``.
+
+		:param state:
+		:param obj:
+
+		:returns: The handler, the type or protocol it was registered for, and how it was found.
+		"""
+
+		obj_type = type(obj)
+
+		handler = state.plans.get(obj_type)
+		if handler is not None:
+			return handler, obj_type, "compiled"
+
+		handler = state.dispatcher.dispatch(obj_type)
+		if handler is not None:
+			# Find which registered type matched, for the statistics.
+			for registered in obj_type.__mro__:
+				if state.handlers.get(registered) is handler:
+					return handler, registered, "concrete"
+			for registered, func in state.handlers.items():
+				if func is handler:
+					return handler, registered, "concrete"
+
+		for protocol, protocol_handler in state.protocols.items():
+			if isinstance(obj, protocol):
+				return protocol_handler, protocol, "protocol"
+
+		return None, None, ""
+
+	def unregister(self, cls: Type) -> None:
+		"""
+		Unregister the handler for the given type.
+
+		.. code-block:: python
+
+			unregister_encoder(int)
+
+		:param cls:
+
+		:raise KeyError: if no handler is found.
+		"""
+
+		with self._lock:
+			state = self._state
+			handlers = dict(state.handlers)
+			protocols = dict(state.protocols)
+			plans = dict(state.plans)
+
+			plan = plans.pop(cls, None)
+			self._schemas.pop(cls, None)
+
+			if cls in handlers:
+				del handlers[cls]
+			elif cls in protocols:
+				del protocols[cls]
+			elif plan is None:
+				raise KeyError
+
+			self._set_state(handlers, protocols, plans)
+
+	def compile(self, cls: Type) -> Optional[Callable]:  # noqa: A003
+		"""
+		Generate a specialised encoder for instances of the given class,
+		which reads each field directly rather than via :func:`dataclasses.asdict`, :func:`vars` or similar.
+
+		.. code-block:: python
+
+			@dataclass
+			class Point:
+				x: int
+				y: int
+
+			compile_encoder(Point)
+
+		The fields are determined from dataclasses, attrs classes and classes which define ``__slots__``.
+		For any other class :py:obj:`None` is returned and any handler registered with
+		:func:`~.register_encoder` continues to be used.
+
+		The compiled encoder only applies to instances of ``cls`` itself, not its subclasses,
+		and takes precedence over registered handlers. It can be removed with :func:`~.unregister_encoder`.
+
+		:param cls:
+
+		:returns: The compiled encoder, or :py:obj:`None` if the fields of ``cls`` could not be determined.
+		"""
+
+		fields = _static_fields(cls)
+		if fields is None:
+			return None
+
+		plan = _compile_plan(cls, fields)
+
+		with self._lock:
+			state = self._state
+			self._schemas.pop(cls, None)
+			self._set_state(state.handlers, state.protocols, {**state.plans, cls: plan})
+
+		return plan
+
+	def register_schema(self, cls: Type) -> Optional[Callable]:
+		"""
+		Generate a specialised encoder for instances of the given class from its type annotations.
+
+		As with :func:`~.compile_encoder` each field is read directly.
+		In addition the handler for each field's annotated type is looked up once, and called directly
+		for values of exactly that type, rather than the encoder dispatching on each value in turn.
+		This also applies to ``Optional[T]``, and to the elements of ``List[T]``, ``Tuple[T, ...]`` and ``Dict[str, T]``.
+
+		.. code-block:: python
+
+			@dataclass
+			class LineItem:
+				sku: str
+				price: Decimal
+
+			@dataclass
+			class Order:
+				placed: datetime
+				items: List[LineItem]
+
+			register_encoder(Decimal, str)
+			register_encoder(datetime, datetime.isoformat)
+			register_schema(LineItem)
+			register_schema(Order)
+
+		The handlers are looked up when this method is called,
+		and again whenever a handler is registered or unregistered.
+		Values which are not exactly of the annotated type are serialized as normal.
+
+		The fields are determined from dataclasses, attrs classes, namedtuples and classes which define ``__slots__``,
+		or failing that from the class' annotations.
+		The encoder only applies to instances of ``cls`` itself, not its subclasses,
+		and takes precedence over registered handlers. It can be removed with :func:`~.unregister_encoder`.
+
+		:param cls:
+
+		:returns: The generated encoder, or :py:obj:`None` if the fields of ``cls`` could not be determined.
+		"""
+
+		fields = _schema_fields(cls)
+		if fields is None:
+			return None
+
+		with self._lock:
+			state = self._state
+			self._schemas[cls] = fields
+			self._set_state(state.handlers, state.protocols, state.plans)
+			return self._state.plans[cls]
+
+	def _set_state(
+			self,
+			handlers: Dict[Type, Callable],
+			protocols: Dict[Type, Callable],
+			plans: Dict[Type, Callable],
+			) -> None:
+		"""
+		Replace the contents of the registry, regenerating the encoders for the classes
+		passed to :meth:`~.Registry.register_schema` from the new handlers.
+
+		Must be called with the lock held.
+
+		:param handlers: Mapping of concrete types to handlers.
+		:param protocols: Mapping of protocols to handlers.
+		:param plans: Mapping of types to compiled encoders.
+		"""
+
+		state = _RegistryState(handlers, protocols, dict(plans))
+		pending = dict(self._schemas)
+
+		def resolve(cls: Any) -> Optional[Callable]:
+			if cls in pending:
+				# Nested schemas are regenerated first, whatever order they were registered in.
+				build(cls)
+
+			handler, registered, path = self._resolve_type(state, cls)
+			if handler is not None and self._stats_enabled:
+				record = self._stats.get(registered)
+				if record is None:
+					record = self._stats.setdefault(registered, _StatsRecord(path))
+				handler = _instrument(handler, record)
+
+			return handler
+
+		def build(cls: Type) -> None:
+			state.plans[cls] = _compile_schema(cls, pending.pop(cls), resolve)
+
+		while pending:
+			build(next(iter(pending)))
+
+		self._state = state
+
+	@staticmethod
+	def _resolve_type(state: _RegistryState, cls: Any) -> Tuple[Optional[Callable], Any, str]:
+		"""
+		Find the handler in ``state`` which would be used for instances of ``cls``,
+		if it can be determined from the type alone.
+
+		:param state:
+		:param cls:
+
+		:returns: The handler, the type or protocol it was registered for, and how it was found.
+		"""
+
+		if not isinstance(cls, type) or cls is object or cls is type(None) or issubclass(cls, _NATIVE_TYPES):
+			# The json module serializes these itself (or they could be anything).
+			return None, None, ""
+
+		handler = state.plans.get(cls)
+		if handler is not None:
+			return handler, cls, "compiled"
+
+		handler = state.dispatcher.dispatch(cls)
+		if handler is not None:
+			for registered in cls.__mro__:
+				if state.handlers.get(registered) is handler:
+					return handler, registered, "concrete"
+			for registered, func in state.handlers.items():
+				if func is handler:
+					return handler, registered, "concrete"
+
+		for protocol, protocol_handler in state.protocols.items():
+			try:
+				if issubclass(cls, protocol):
+					return protocol_handler, protocol, "protocol"
+			except TypeError:
+				# Protocols with data members don't support issubclass()
+				continue
+
+		return None, None, ""
+
+	def enable_stats(self) -> None:
+		"""
+		Start recording statistics for each handler, which can be retrieved with :meth:`~.Registry.stats`.
+
+		Handlers are wrapped to time them as types are resolved to them,
+		so there is no overhead while statistics are disabled.
+		"""
+
+		with self._lock:
+			self._stats_enabled = True
+			self._reset_state()
+
+	def disable_stats(self) -> None:
+		"""
+		Stop recording statistics for each handler.
+
+		The statistics recorded so far are retained until :meth:`~.Registry.reset_stats` is called.
+		"""
+
+		with self._lock:
+			self._stats_enabled = False
+			self._reset_state()
+
+	def reset_stats(self) -> None:
+		"""
+		Discard the statistics recorded so far.
+		"""
+
+		with self._lock:
+			self._stats = {}
+			self._reset_state()
+
+	def _reset_state(self) -> None:
+		"""
+		Discard the handlers resolved so far, which may have been wrapped to record statistics.
+
+		Must be called with the lock held.
+		"""
+
+		state = self._state
+		self._set_state(state.handlers, state.protocols, state.plans)
+
+	def stats(self) -> Dict[Type, HandlerStats]:
+		"""
+		Returns the statistics recorded for each handler since :meth:`~.Registry.enable_stats` was called,
+		keyed on the type or protocol the handler was registered for.
+
+		.. code-block:: python
+
+			sdjson.encoders.enable_stats()
+			sdjson.dumps(data)
+
+			for cls, stats in sorted(sdjson.encoders.stats().items(), key=lambda item: -item[1].total_time):
+				print(cls.__name__, stats.calls, stats.total_time)
+
+		The counts may be slightly low if the registry is used by several threads at once.
+		"""
+
+		return {
+				cls: HandlerStats(record.path, record.calls, record.total_time, record.resolutions, record.resolution_time)
+				for cls, record in self._stats.items()
+				}
+
+	def _cached_handlers(self) -> Dict[Type, Callable]:
+		"""
+		Returns the handlers registered with ``cache=True``, keyed on their type or protocol.
+		"""
+
+		state = self._state
+		return {
+				cls: handler
+				for cls, handler in (*state.handlers.items(), *state.protocols.items())
+				if hasattr(handler, "cache_clear")
+				}
+
+	def cache_info(self, cls: Type) -> Any:
+		"""
+		Returns statistics about the results cached for the handler registered with ``cache=True`` for ``cls``,
+		as a named tuple of ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+
+		.. code-block:: python
+
+			sdjson.register_encoder(Currency, encode_currency, cache=True)
+			sdjson.dumps(prices)
+			sdjson.encoders.cache_info(Currency)  # CacheInfo(hits=9998, misses=2, maxsize=128, currsize=2)
+
+		:param cls:
+
+		:raise KeyError: if no handler for ``cls`` was registered with ``cache=True``.
+		"""
+
+		return self._cached_handlers()[cls].cache_info()
+
+	def cache_clear(self, cls: Optional[Type] = None) -> None:
+		"""
+		Discard the results cached for the handler registered with ``cache=True`` for ``cls``,
+		or for all such handlers if ``cls`` is :py:obj:`None`.
+
+		:param cls:
+
+		:raise KeyError: if no handler for ``cls`` was registered with ``cache=True``.
+		"""
+
+		handlers = self._cached_handlers()
+
+		if cls is None:
+			for handler in handlers.values():
+				handler.cache_clear()  # type: ignore[attr-defined]
+		else:
+			handlers[cls].cache_clear()  # type: ignore[attr-defined]
+
+	def copy(self) -> "Registry":
+		"""
+		Returns a new registry containing the same handlers as this one.
+		"""
+
+		new_registry = Registry()
+
+		with self._lock:
+			state = self._state
+			new_registry._schemas = dict(self._schemas)
+			new_registry._set_state(state.handlers, state.protocols, state.plans)
+
+		return new_registry
+
+	@contextmanager
+	def activate(self) -> Iterator["Registry"]:
+		"""
+		Context manager to use this registry in place of the default for the current context.
+
+		.. code-block:: python
+
+			tenant_encoders = sdjson.Registry()
+			tenant_encoders.register(Decimal, str)
+
+			with tenant_encoders.activate():
+				sdjson.dumps(Decimal("1.23"))  # '"1.23"'
+
+		The registry is stored in a :class:`contextvars.ContextVar`,
+		so it applies to the current thread or asyncio task only.
+		"""
+
+		token = _active_registry.set(self)
+		try:
+			yield self
+		finally:
+			_active_registry.reset(token)
+
+
+_active_registry: ContextVar[Optional[Registry]] = ContextVar("sdjson_registry", default=None)
+
+# Retained for backwards compatibility.
+_Encoders = Registry
+
+
+def get_registry() -> Registry:
+	"""
+	Returns the registry activated for the current context with :meth:`Registry.activate() <.Registry.activate>`,
+	or the default registry (:data:`~.encoders`) if none is active.
+	"""
+
+	registry = _active_registry.get()
+	return encoders if registry is None else registry
+
+
+#: The default registry of custom encoders.
+encoders = Registry()
+register_encoder = encoders.register
+unregister_encoder = encoders.unregister
+compile_encoder = encoders.compile
+register_schema = encoders.register_schema
+
+
+class _Decoders:
+
+	def __init__(self):
+		self.registry: Dict[Any, Callable] = {}
+		#: Handlers which construct instances of classes given as the ``into`` argument to :func:`~.loads`.
+		#: These are kept separate from the type tags so they do not cause the ``object_hook`` to be installed.
+		self.constructors: Dict[type, Callable] = {}
+		self.type_key = "__type__"
+		self.discriminator: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+	def register(self, tag: Any, func: Optional[Callable] = None) -> Callable:
+		"""
+		Registers a new handler for JSON objects with the given type tag.
+
+		Can be used as a decorator or a regular function:
+
+		.. code-block:: python
+
+			@register_decoder("point")
+			def point_decoder(obj):
+				return Point(obj["x"], obj["y"])
+
+			register_decoder("fraction", lambda obj: Fraction(obj["numerator"], obj["denominator"]))
+
+		The handler is passed the decoded :class:`dict`, including the type tag,
+		and its return value takes the place of the :class:`dict` in the output.
+
+		:param tag: The value of the object's ``"__type__"`` key
+			(or the return value of the discriminator, see :func:`~.set_decoder_discriminator`).
+		:param func:
+		"""
+
+		if func is None:
+			return lambda f: self.register(tag, f)
+
+		self.registry[tag] = func
+		return func
+
+	def unregister(self, tag: Any) -> None:
+		"""
+		Unregister the handler for the given type tag.
+
+		.. code-block:: python
+
+			unregister_decoder("point")
+
+		:param tag:
+
+		:raise KeyError: if no handler is found.
+		"""
+
+		del self.registry[tag]
+
+	def register_constructor(self, cls: Type, func: Optional[Callable] = None) -> Callable:
+		"""
+		Registers a function which constructs instances of ``cls`` from decoded JSON
+		when ``cls`` is the target type given to :func:`~.loads` (see the ``into`` argument),
+		or the type of one of its fields.
+
+		Can be used as a decorator or a regular function:
+
+		.. code-block:: python
+
+			register_constructor(datetime.date, datetime.date.fromisoformat)
+
+		Unlike the handlers registered with :func:`~.register_decoder`,
+		these are not applied to every JSON object, so do not slow down other calls to :func:`~.loads`.
+
+		:param cls:
+		:param func:
+		"""
+
+		if func is None:
+			return lambda f: self.register_constructor(cls, f)
+
+		self.constructors[cls] = func
+		_construction_plans.clear()
+		return func
+
+	def unregister_constructor(self, cls: Type) -> None:
+		"""
+		Unregister the function which constructs instances of ``cls``.
+
+		.. code-block:: python
+
+			unregister_constructor(datetime.date)
+
+		:param cls:
+
+		:raise KeyError: if no function is found.
+		"""
+
+		del self.constructors[cls]
+		_construction_plans.clear()
+
+	def set_discriminator(self, discriminator: Union[str, Callable[[Dict[str, Any]], Any]]) -> None:
+		"""
+		Set how the type tag of each JSON object is determined.
+
+		.. code-block:: python
+
+			# Use the value of the "kind" key
+			set_decoder_discriminator("kind")
+
+			# Use a function of the whole object
+			set_decoder_discriminator(lambda obj: "point" if obj.keys() == {"x", "y"} else None)
+
+		:param discriminator: Either the name of the key holding the type tag (``"__type__"`` by default),
+			or a function which returns the type tag for a given :class:`dict`.
+		"""
+
+		if isinstance(discriminator, str):
+			self.type_key = discriminator
+			self.discriminator = None
+		else:
+			self.discriminator = discriminator
+
+	def object_hook(self, obj: Dict[str, Any]) -> Any:
+		"""
+		Decode the given JSON object using the handler registered for its type tag, if any.
+
+		Suitable for use as the ``object_hook`` argument to :func:`json.loads`.
+
+		:param obj:
+		"""
+
+		if self.discriminator is None:
+			tag = obj.get(self.type_key)
+		else:
+			tag = self.discriminator(obj)
+
+		try:
+			handler = self.registry[tag]
+		except (KeyError, TypeError):
+			# No handler, or an unhashable tag.
+			return obj
+
+		return handler(obj)
+
+
+decoders = _Decoders()
+register_decoder = decoders.register
+unregister_decoder = decoders.unregister
+register_constructor = decoders.register_constructor
+unregister_constructor = decoders.unregister_constructor
+set_decoder_discriminator = decoders.set_discriminator
+
+#: Functions which construct the target type passed to :func:`~.loads` from the decoded JSON, keyed on the type.
+_construction_plans: Dict[Any, Callable[[Any], Any]] = {}
+
+
+def _construction_plan(hint: Any) -> Callable[[Any], Any]:
+	"""
+	Returns the function which constructs an instance of the type hint ``hint`` from decoded JSON.
+
+	The function is generated the first time each type is requested,
+	and discarded if a decoder is registered or unregistered for a class.
+
+	:param hint:
+	"""
+
+	try:
+		return _construction_plans[hint]
+	except KeyError:
+		pass
+	except TypeError:  # pragma: no cover
+		# Unhashable type hint
+		return _build_construction_plan(hint)
+
+	# Recursive types refer to their own plan before it has been generated.
+	def deferred(value: Any) -> Any:
+		return _construction_plans[hint](value)
+
+	_construction_plans[hint] = deferred
+	try:
+		plan = _construction_plans[hint] = _build_construction_plan(hint)
+	except BaseException:
+		del _construction_plans[hint]
+		raise
+
+	return plan
+
+
+def _identity(value: Any) -> Any:
+	return value
+
+
+def _build_construction_plan(hint: Any) -> Callable[[Any], Any]:
+	"""
+	Generate the function which constructs an instance of the type hint ``hint`` from decoded JSON.
+
+	:param hint:
+	"""
+
+	hint = _unwrap_optional(hint)
+
+	if isinstance(hint, type):
+		if hint in decoders.constructors:
+			handler = decoders.constructors[hint]
+			return lambda value: value if value is None else handler(value)
+
+		if hint in {str, int, float, bool, list, dict, object, type(None)}:
+			return _identity
+
+		# stdlib
+		import enum
+
+		if issubclass(hint, enum.Enum):
+			return lambda value: value if value is None or value.__class__ is hint else hint(value)
+
+		fields = _constructor_fields(hint)
+		if fields is not None:
+			return _compile_constructor(hint, fields)
+
+		return _identity
+
+	origin = getattr(hint, "__origin__", None)
+	args = getattr(hint, "__args__", None) or ()
+
+	if origin in _SEQUENCE_ORIGINS or origin in {set, frozenset, collections.abc.Set, collections.abc.MutableSet}:
+		if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+			element_plans = [_construction_plan(arg) for arg in args]
+
+			def construct_tuple(value: Any) -> Any:
+				if value.__class__ is not list:
+					return value
+				return tuple(plan(item) for plan, item in zip(element_plans, value))
+
+			return construct_tuple
+
+		element_plan = _construction_plan(args[0]) if args else _identity
+		container = {tuple: tuple, set: set, frozenset: frozenset, collections.abc.Set: set}.get(origin)
+
+		def construct_sequence(value: Any) -> Any:
+			if value.__class__ is not list:
+				return value
+			if element_plan is not _identity:
+				# Replace each element in turn, so the decoded value can be freed as soon as it has been converted.
+				for index, item in enumerate(value):
+					value[index] = element_plan(item)
+			return value if container is None else container(value)
+
+		return construct_sequence
+
+	if origin in _MAPPING_ORIGINS:
+		key_type = _unwrap_optional(args[0]) if args else str
+		if key_type in {int, float}:
+			# Object keys are always strings in JSON
+			key_plan = key_type
+		elif key_type in {str, Any}:
+			key_plan = _identity
+		else:
+			key_plan = _construction_plan(key_type)
+		value_plan = _construction_plan(args[1]) if len(args) == 2 else _identity
+
+		def construct_mapping(value: Any) -> Any:
+			if value.__class__ is not dict:
+				return value
+			if key_plan is not _identity:
+				return {key_plan(key): value_plan(item) for key, item in value.items()}
+			if value_plan is not _identity:
+				for key, item in value.items():
+					value[key] = value_plan(item)
+			return value
+
+		return construct_mapping
+
+	return _identity
+
+
+def _constructor_fields(cls: Type) -> Optional[List[Tuple[str, str, Any]]]:
+	"""
+	Returns a list of ``(key, argument, type hint)`` triples for the arguments which construct ``cls``,
+	where ``key`` is the key of the corresponding value in the JSON object,
+	or :py:obj:`None` if they cannot be determined.
+
+	:param cls:
+	"""
+
+	if hasattr(cls, "__dataclass_fields__"):
+		# stdlib
+		import dataclasses
+		names = [(f.name, f.name) for f in dataclasses.fields(cls) if f.init]
+
+	elif hasattr(cls, "__attrs_attrs__"):
+		names = [
+				(a.name, getattr(a, "alias", None) or a.name.lstrip("_"))
+				for a in cls.__attrs_attrs__
+				if a.init
+				]
+
+	else:
+		fields = _schema_fields(cls)
+		if fields is None:
+			return None
+		names = [(key, key) for key, attribute, hint in fields]
+
+	try:
+		hints = get_type_hints(cls)
+	except Exception:
+		# e.g. forward references which cannot be resolved.
+		hints = {}
+
+	for key, argument in names:
+		if not argument.isidentifier() or iskeyword(argument):
+			return None
+
+	return [(key, argument, hints.get(key, Any)) for key, argument in names]
+
+
+def _compile_constructor(cls: Type, fields: List[Tuple[str, str, Any]]) -> Callable[[Any], Any]:
+	"""
+	Generate a function which constructs an instance of ``cls`` from a decoded JSON object,
+	passing the value for each field (converted according to its type hint) as a keyword argument.
+
+	Namedtuples are also constructed from JSON arrays, which is how they are serialized,
+	passing the value for each field positionally.
+	Other values (including those already converted by a decoder) are returned unchanged.
+
+	:param cls:
+	:param fields: A list of ``(key, argument, type hint)`` triples.
+	"""
+
+	namespace: Dict[str, Any] = {"cls": cls, "keys": frozenset(key for key, argument, hint in fields)}
+	arguments = []
+	positional = []
+	statements = []
+
+	for index, (key, argument, hint) in enumerate(fields):
+		plan = _construction_plan(hint)
+		namespace[f"plan{index}"] = plan
+		if plan is _identity:
+			value = f"obj[{key!r}]"
+			positional.append(f"obj[{index}]")
+		else:
+			value = f"plan{index}(obj[{key!r}])"
+			positional.append(f"plan{index}(obj[{index}])")
+		arguments.append(f"{argument}={value}")
+		statements.append(f"\tif {key!r} in obj:\n\t\tkwargs[{argument!r}] = {value}\n")
+
+	from_list = ""
+	if issubclass(cls, tuple) and hasattr(cls, "_fields"):
+		# Arrays shorter than the number of fields use the defaults for the remainder,
+		# and longer arrays are left for the constructor to reject.
+		plans = ", ".join(f"plan{index}" for index in range(len(fields)))
+		from_list = (
+				f"\tif obj.__class__ is list:\n"
+				f"\t\tif len(obj) == {len(fields)}:\n\t\t\treturn cls({', '.join(positional)})\n"
+				f"\t\treturn cls(*[plan(item) for plan, item in zip(({plans}, ), obj)], *obj[{len(fields)}:])\n"
+				)
+
+	# When every field is present the arguments can be passed directly,
+	# otherwise the constructor's defaults are used for the missing ones.
+	exec(
+			f"def construct(obj):\n{from_list}\tif obj.__class__ is not dict:\n\t\treturn obj\n"
+			f"\tif obj.keys() >= keys:\n\t\treturn cls({', '.join(arguments)})\n"
+			f"\tkwargs = {{}}\n{''.join(statements)}\treturn cls(**kwargs)\n",
+			namespace,
+			)
+
+	plan = namespace["construct"]
+	plan.__name__ = plan.__qualname__ = f"construct_{cls.__name__}"
+	plan.__module__ = __name__
+	return plan
+
+
+def _is_binary_file(fp: IO) -> bool:
+	"""
+	Returns whether ``fp`` is a binary-mode file-like object.
+
+	:param fp:
+	"""
+
+	return isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", "")
+
+
+def _iter_blocks(iterable: Iterable[str], chunk_size: int) -> Iterator[str]:
+	"""
+	Join the strings in ``iterable`` into blocks of at least ``chunk_size`` characters
+	(except for the final block).
+
+	:param iterable:
+	:param chunk_size:
+	"""  # noqa: D400
+
+	buffer: List[str] = []
+	buffered = 0
+
+	for chunk in iterable:
+		buffer.append(chunk)
+		buffered += len(chunk)
+		if buffered >= chunk_size:
+			yield "".join(buffer)
+			buffer.clear()
+			buffered = 0
+
+	if buffer:
+		yield "".join(buffer)
+
+
+def _iter_encoded_blocks(encoder: json.JSONEncoder, obj: Any, chunk_size: int) -> Iterator[str]:
+	"""
+	Encode ``obj`` with ``encoder.iterencode()``, joining the output into blocks
+	of at least ``chunk_size`` characters (except for the final block).
+
+	Any :class:`~.RawJSON` values are substituted into each block as it is completed.
+	Each placeholder is a single chunk of the output, so is never split between blocks.
+
+	:param encoder:
+	:param obj:
+	:param chunk_size:
+	"""  # noqa: D400
+
+	if not isinstance(encoder, _CustomEncoder):
+		yield from _iter_blocks(encoder.iterencode(obj), chunk_size)
+		return
+
+	# The output may already have been written by the time a RawJSON value is found,
+	# so a copy of the encoder which is prepared for them is always used.
+	raw_encoder = encoder._raw_copy()
+
+	for block in _iter_blocks(raw_encoder.iterencode(obj), chunk_size):
+		yield raw_encoder._substitute_raw(block)
+
+
+def _write_blocks(blocks: Iterable[str], fp: IO) -> None:
+	"""
+	Write each string in ``blocks`` to ``fp``.
+
+	If ``fp`` is a binary-mode file each block is encoded as UTF-8.
+
+	:param blocks:
+	:param fp:
+	"""
+
+	write = fp.write
+
+	if _is_binary_file(fp):
+		for block in blocks:
+			write(block.encode("UTF-8"))
+	else:
+		for block in blocks:
+			write(block)
+
+
+def _write_chunked(iterable: Iterable[str], fp: IO, chunk_size: int) -> None:
+	"""
+	Write the strings in ``iterable`` to ``fp``, joining them into blocks
+	of at least ``chunk_size`` characters first.
+
+	If ``fp`` is a binary-mode file each block is encoded as UTF-8.
+
+	:param iterable:
+	:param fp:
+	:param chunk_size:
+	"""  # noqa: D400
+
+	_write_blocks(_iter_blocks(iterable, chunk_size), fp)
+
+
+@runtime_checkable
+class DataclassInstance(Protocol):
+	"""
+	:class:`~typing.Protocol` matching instances of :func:`dataclasses <dataclasses.dataclass>`.
+	"""
+
+	__dataclass_fields__: ClassVar[Dict[str, Any]]
+
+
+@runtime_checkable
+class AttrsInstance(Protocol):
+	"""
+	:class:`~typing.Protocol` matching instances of `attrs <https://www.attrs.org>`_ classes.
+	"""
+
+	__attrs_attrs__: ClassVar[Tuple[Any, ...]]
+
+
+_field_plans: Dict[Type, Callable] = {}
+
+
+def encode_fields(obj: Any) -> Dict[str, Any]:
+	"""
+	Encoder for dataclasses, attrs classes and classes which define ``__slots__``,
+	which returns a shallow :class:`dict` of the object's fields.
+
+	Unlike :func:`dataclasses.asdict` the field values are not copied;
+	they are left for the encoder to serialize (using any registered handlers).
+	The field names are determined once per class.
+
+	:param obj:
+	"""
+
+	obj_type = type(obj)
+
+	try:
+		plan = _field_plans[obj_type]
+	except KeyError:
+		fields = _static_fields(obj_type)
+		if fields is None:
+			raise TypeError(f"Object of type {obj_type.__name__} is not JSON serializable")
+		plan = _field_plans[obj_type] = _compile_plan(obj_type, fields)
+
+	return plan(obj)
+
+
+def register_field_encoders() -> None:
+	"""
+	Register :func:`~.encode_fields` as the handler for all dataclasses and attrs classes.
+
+	This is equivalent to:
+
+	.. code-block:: python
+
+		register_encoder(DataclassInstance, encode_fields)
+		register_encoder(AttrsInstance, encode_fields)
+
+	The handlers can be removed with :func:`~.unregister_encoder`.
+	"""
+
+	encoders.register(DataclassInstance, encode_fields)
+	encoders.register(AttrsInstance, encode_fields)
+
+
+def encode_numpy(obj: Any) -> Any:
+	"""
+	Encoder for NumPy arrays and scalars.
+
+	Arrays are converted to (nested) lists in a single call to :meth:`numpy.ndarray.tolist`,
+	and scalars to the equivalent Python type with :meth:`numpy.generic.item`.
+	Half and single precision floats are formatted with the shortest representation
+	which round-trips at their own precision (e.g. ``0.1`` rather than ``0.10000000149011612``),
+	using one vectorised string conversion per array.
+
+	:param obj:
+	"""
+
+	# 3rd party
+	import numpy
+
+	dtype = obj.dtype
+	if dtype.kind == "f" and dtype.itemsize < 8:
+		if isinstance(obj, numpy.ndarray):
+			return obj.astype(str).astype(numpy.float64).tolist()
+		return float(str(obj))
+
+	if isinstance(obj, numpy.ndarray):
+		return obj.tolist()
+
+	return obj.item()
+
+
+def register_numpy_encoders() -> None:
+	"""
+	Register :func:`~.encode_numpy` as the handler for NumPy arrays and scalars.
+
+	This is equivalent to:
+
+	.. code-block:: python
+
+		register_encoder(numpy.ndarray, encode_numpy)
+		register_encoder(numpy.generic, encode_numpy)
+
+	The handlers can be removed with :func:`~.unregister_encoder`.
+
+	:raises ImportError: If NumPy is not installed.
+	"""
+
+	# 3rd party
+	import numpy
+
+	encoders.register(numpy.ndarray, encode_numpy)
+	encoders.register(numpy.generic, encode_numpy)
+
+
+@lru_cache(maxsize=ENCODER_CACHE_SIZE)
+def _cached_encoder(
+		cls: Type[json.JSONEncoder],
+		skipkeys: bool,
+		ensure_ascii: bool,
+		check_circular: bool,
+		allow_nan: bool,
+		indent: Union[None, int, str],
+		separators: Optional[Tuple[str, str]],
+		default: Optional[Callable[[Any], Any]],
+		sort_keys: bool,
+		kwargs: Tuple[Tuple[str, Any], ...],
+		) -> json.JSONEncoder:
+	return cls(
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			**dict(kwargs)
+			)
+
+
+def _get_encoder(
+		cls: Optional[Type[json.JSONEncoder]],
+		skipkeys: bool,
+		ensure_ascii: bool,
+		check_circular: bool,
+		allow_nan: bool,
+		indent: Union[None, int, str],
+		separators: Optional[Tuple[str, str]],
+		default: Optional[Callable[[Any], Any]],
+		sort_keys: bool,
+		kwargs: Dict[str, Any],
+		) -> json.JSONEncoder:
+	"""
+	Returns an encoder for the given keyword arguments to :func:`~.dumps`.
+
+	Encoders for hashable combinations of arguments are reused between calls.
+	"""
+
+	if (
+			not skipkeys and ensure_ascii and check_circular and allow_nan and cls is None and indent is None
+			and separators is None and default is None and not sort_keys and not kwargs
+			):
+		return _default_encoder
+
+	if cls is None:
+		cls = _CustomEncoder
+	if separators is not None:
+		separators = tuple(separators)  # type: ignore[assignment]
+
+	key = (
+			cls,
+			skipkeys,
+			ensure_ascii,
+			check_circular,
+			allow_nan,
+			indent,
+			separators,
+			default,
+			sort_keys,
+			tuple(sorted(kwargs.items())),
+			)
+
+	try:
+		hash(key)
+	except TypeError:
+		# Unhashable arguments, such as a list for ``separators``.
+		return cls(
+				skipkeys=skipkeys,
+				ensure_ascii=ensure_ascii,
+				check_circular=check_circular,
+				allow_nan=allow_nan,
+				indent=indent,
+				separators=separators,
+				default=default,
+				sort_keys=sort_keys,
+				**kwargs
+				)
+
+	return _cached_encoder(*key)
+
+
+def encoder_cache_info() -> Any:
+	"""
+	Returns statistics about the cache of encoders used by :func:`~.dump` and :func:`~.dumps`
+	for non-default keyword arguments, as a named tuple
+	of ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+
+	The encoder used when all arguments have their default values is not counted.
+	"""
+
+	return _cached_encoder.cache_info()
+
+
+def clear_encoder_cache() -> None:
+	"""
+	Discard all cached encoders and reset the statistics returned by :func:`~.encoder_cache_info`.
+	"""
+
+	_cached_encoder.cache_clear()
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.dump)
+def dump(
+		obj: Any,
+		fp: IO,
+		*,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		indent: Union[None, int, str] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		**kwargs: Any,
+		) -> None:
+	"""
+	Serialize custom Python classes to JSON.
+	Custom classes can be registered using the ``@encoders.register(<type>)`` decorator.
+
+	The output of ``JSONEncoder.iterencode()`` is buffered and written to ``fp``
+	in blocks of roughly ``chunk_size`` characters, rather than one write per fragment.
+	``fp`` may be opened in either text or binary mode; in the latter case the output is encoded as UTF-8.
+	"""
+
+	encoder = _get_encoder(
+			cls=cls,
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			kwargs=kwargs,
+			)
+
+	_write_blocks(_iter_encoded_blocks(encoder, obj, chunk_size), fp)
+
+
+dump.__doc__ += "\n.. latex:clearpage::\n"
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.dumps)
+def dumps(
+		obj: Any,
+		*,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		indent: Union[None, int, str] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		**kwargs: Any,
+		) -> str:
+	"""
+	Serialize custom Python classes to JSON.
+	Custom classes can be registered using the ``@encoders.register(<type>)`` decorator.
+
+	Subclasses of :class:`str`, :class:`int`, :class:`float`, :class:`list`, :class:`tuple`
+	and :class:`dict` (such as :class:`enum.IntEnum` members) are normally serialized by the json module
+	without consulting the registered encoders. Pass ``intercept_subclasses=True`` to apply the encoders
+	registered for such subclasses. This has no cost unless an encoder has been registered for one.
+
+	Pass ``registry=<Registry>`` to use the encoders in that :class:`~.Registry`
+	rather than those in the registry for the current context (see :func:`~.get_registry`).
+
+	Pass ``float_precision=<N>`` to round floats to ``N`` decimal places, which can make
+	float-heavy output much smaller. Alternatively, ``float_format`` may be a format specification
+	such as ``".6g"`` or a function returning the text for a float, which must be valid JSON.
+	``float_precision`` is faster, as the floats can still be written by the json module's C encoder.
+
+	JSON which has already been serialized, such as a cached fragment of a response,
+	can be embedded without being parsed again by wrapping it in :class:`~.RawJSON`.
+
+	Dictionary keys of types not supported by the json module, such as :class:`uuid.UUID` or :class:`datetime.date`,
+	are converted with the registered encoders, provided they return a :class:`str`, :class:`int`,
+	:class:`float`, :class:`bool` or :py:obj:`None`. This happens before ``skipkeys`` is applied.
+	The object is encoded a second time when such a key is found (reusing the values already returned by
+	the handlers, which are only called once), so there is no cost for objects without them.
+	"""
+
+	return _get_encoder(
+			cls=cls,
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			kwargs=kwargs,
+			).encode(obj)
+
+
+def dumps_bytes(
+		obj: Any,
+		*,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		indent: Union[None, int, str] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		**kwargs: Any,
+		) -> bytes:
+	"""
+	Serialize ``obj`` to UTF-8 encoded JSON :class:`bytes`.
+
+	The arguments have the same meaning as for :func:`~.dumps`.
+
+	:param obj:
+	"""
+
+	return _get_encoder(
+			cls=cls,
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			kwargs=kwargs,
+			).encode(obj).encode("UTF-8")
+
+
+#: Registries resolved from registry specs in this process, keyed on the spec.
+_spec_registries: Dict[str, Optional[Registry]] = {}
+
+
+def _resolve_registry_spec(spec: str) -> Optional[Registry]:
+	"""
+	Import the module named in ``spec`` (``"package.module"`` or ``"package.module:attribute"``),
+	and return the :class:`~.Registry` it refers to, if any.
+
+	If the attribute is callable it is called (once per process) and its return value used instead.
+
+	:param spec:
+	"""
+
+	if spec in _spec_registries:
+		return _spec_registries[spec]
+
+	module_name, _, attribute = spec.partition(":")
+	target: Any = importlib.import_module(module_name)
+
+	if attribute:
+		for name in attribute.split("."):
+			target = getattr(target, name)
+		if callable(target) and not isinstance(target, Registry):
+			target = target()
+
+	registry = target if isinstance(target, Registry) else None
+	_spec_registries[spec] = registry
+	return registry
+
+
+def _encode_shard(registry_spec: Optional[str], shard: Any, kwargs: Dict[str, Any]) -> str:
+	"""
+	Encode one shard of the collection passed to :func:`~.dumps_parallel`, in a worker process.
+
+	:param registry_spec:
+	:param shard:
+	:param kwargs:
+	"""
+
+	if registry_spec is not None:
+		registry = _resolve_registry_spec(registry_spec)
+		if registry is not None and kwargs.get("cls") is None and "registry" not in kwargs:
+			kwargs = dict(kwargs, registry=registry)
+
+	return dumps(shard, **kwargs)
+
+
+#: Collections being encoded by :func:`~.dumps_parallel` in forked workers, keyed on a token.
+#: The workers inherit this when they are forked, so the collection doesn't have to be pickled.
+_inherited_payloads: Dict[int, Tuple[Sequence[Any], bool, Dict[str, Any]]] = {}
+_payload_tokens = itertools.count()
+
+
+def _encode_inherited_shard(registry_spec: Optional[str], token: int, start: int, stop: int) -> str:
+	"""
+	Encode ``items[start:stop]`` of a collection inherited from the parent process.
+
+	:param registry_spec:
+	:param token: The key of the collection in ``_inherited_payloads``.
+	:param start:
+	:param stop:
+	"""
+
+	items, is_dict, kwargs = _inherited_payloads[token]
+	shard = dict(items[start:stop]) if is_dict else items[start:stop]
+	return _encode_shard(registry_spec, shard, kwargs)
+
+
+def dumps_parallel(
+		obj: Any,
+		*,
+		workers: Optional[int] = None,
+		shards: Optional[int] = None,
+		registry_spec: Optional[str] = None,
+		executor: Optional["concurrent.futures.Executor"] = None,
+		inherit: bool = False,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		indent: Union[None, int, str] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		**kwargs: Any,
+		) -> str:
+	"""
+	Serialize a large top-level :class:`list`, :class:`tuple` or :class:`dict` to JSON using several processes.
+
+	The collection is split into ``shards`` contiguous slices which are encoded in a
+	:class:`concurrent.futures.ProcessPoolExecutor`, and the results are joined with the
+	same separators and indentation :func:`~.dumps` would have used. The output is identical
+	to that of :func:`~.dumps`. Any other object, or a collection with fewer elements than
+	there are shards, is encoded in the current process.
+
+	Each shard is pickled to send it to a worker, which for many types costs as much
+	as encoding them. The workers then only see encoders registered at import time of the modules
+	they import. If the encoders are registered elsewhere, pass ``registry_spec`` naming an importable
+	module, optionally followed by ``:attribute``. The module is imported in each worker before encoding.
+	If the attribute is a :class:`~.Registry` its encoders are used; if it is callable it is called
+	once per worker, and the :class:`~.Registry` it returns (if any) is used.
+	Classes defined in the ``__main__`` module won't match encoders registered for
+	the same classes in an imported module.
+
+	.. code-block:: python
+
+		sdjson.dumps_parallel(records, executor=pool, registry_spec="myapp.serialization:encoders")
+
+	Alternatively, pass ``inherit=True`` to fork the workers for this call, so they inherit the collection
+	and the encoders from the current process and only the encoded text is sent between processes.
+	This requires the ``fork`` start method, which is unavailable on Windows, and is unsafe on macOS
+	and in processes which are running other threads, as the workers may deadlock.
+
+	:param obj:
+	:param workers: The number of worker processes. Defaults to :func:`os.cpu_count`.
+	:param shards: The number of slices to split the collection into. Defaults to four per worker.
+	:param registry_spec: The module (and optionally attribute) providing the encoders in the workers.
+	:param executor: An existing executor to submit the shards to, instead of creating one for this call.
+	:param inherit: Whether to fork the workers for this call, so they inherit the collection and the encoders.
+
+	If ``registry=<Registry>`` is given without ``inherit=True``,
+	``registry_spec`` must also be given to provide the workers' encoders.
+
+	The remaining arguments have the same meaning as for :func:`~.dumps`.
+	"""
+
+	encoder_kwargs = dict(
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			cls=cls,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			**kwargs,
+			)
+
+	if workers is None:
+		workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+	if shards is None:
+		shards = workers * 4
+
+	if isinstance(obj, dict):
+		items: Sequence[Any] = sorted(obj.items(), key=operator.itemgetter(0)) if sort_keys else list(obj.items())
+		brackets = "{}"
+	elif isinstance(obj, (list, tuple)):
+		items = obj
+		brackets = "[]"
+	else:
+		items = ()
+		brackets = ""
+
+	# stdlib
+	import concurrent.futures
+	import multiprocessing
+
+	if inherit:
+		if executor is not None:
+			raise ValueError("'inherit' and 'executor' cannot both be given.")
+		if sys.version_info < (3, 7) or "fork" not in multiprocessing.get_all_start_methods():
+			raise ValueError("'inherit' requires the 'fork' start method, which is not available.")
+	elif "registry" in kwargs and registry_spec is None:
+		raise ValueError(
+				"'registry' cannot be sent to worker processes; pass 'registry_spec' or inherit=True as well."
+				)
+
+	if not brackets or workers < 2 or len(items) < max(shards, 2):
+		return dumps(obj, **encoder_kwargs)
+
+	shard_size = -(-len(items) // shards)
+	bounds = [(start, min(start + shard_size, len(items))) for start in range(0, len(items), shard_size)]
+
+	if inherit:
+		# Forked workers inherit the collection (and the registry) rather than having them pickled.
+		if cls is None and "registry" not in encoder_kwargs:
+			encoder_kwargs["registry"] = get_registry()
+
+		token = next(_payload_tokens)
+		_inherited_payloads[token] = (items, brackets == "{}", encoder_kwargs)
+		try:
+			context = multiprocessing.get_context("fork")
+			with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+				futures = [
+						pool.submit(_encode_inherited_shard, registry_spec, token, start, stop)
+						for start, stop in bounds
+						]
+				texts = [future.result() for future in futures]
+		finally:
+			del _inherited_payloads[token]
+
+	else:
+		# A Registry can't be sent to the workers; they get theirs from registry_spec instead.
+		worker_kwargs = {k: v for k, v in encoder_kwargs.items() if k != "registry"}
+		slices = [items[start:stop] for start, stop in bounds]
+		if brackets == "{}":
+			slices = [dict(shard) for shard in slices]
+
+		pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+		try:
+			futures = [pool.submit(_encode_shard, registry_spec, shard, worker_kwargs) for shard in slices]
+			texts = [future.result() for future in futures]
+		finally:
+			if executor is None:
+				pool.shutdown()
+
+	# Recreate the separators the json module would have used.
+	if separators is not None:
+		item_separator = separators[0]
+	elif indent is not None:
+		item_separator = ","
+	else:
+		item_separator = ", "
+
+	if indent is None:
+		open_bracket, close_bracket = brackets
+	else:
+		if not isinstance(indent, str):
+			indent = " " * indent
+		# Each shard is "[\n<indent>...\n]", with the elements at the same depth as in the full collection.
+		open_bracket, close_bracket = brackets[0] + "\n" + indent, "\n" + brackets[1]
+		item_separator += "\n" + indent
+
+	# With skipkeys=True every key in a shard of a dict may have been skipped.
+	bodies = [text[len(open_bracket):-len(close_bracket)] for text in texts]
+	if not any(bodies):
+		return texts[0]
+
+	return open_bracket + item_separator.join(filter(None, bodies)) + close_bracket
+
+
+# Provide access to remaining objects from json module.
+# We have to do it this way to sort out the docstrings for sphinx without
+#  modifying the original docstrings.
+def _decoder_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+	"""
+	Add the ``object_hook`` for the registered decoders to the keyword arguments for :func:`json.loads`,
+	unless a decoder class or hook was given.
+
+	:param kwargs:
+	"""
+
+	if (
+			decoders.registry and kwargs.get("cls") is None and kwargs.get("object_hook") is None
+			and kwargs.get("object_pairs_hook") is None
+			):
+		kwargs["object_hook"] = decoders.object_hook
+
+	return kwargs
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.load)
+def load(fp: IO, *, into: Any = None, **kwargs: Any) -> Any:
+	"""
+	Deserialize JSON to Python objects, applying any decoders registered with
+	:func:`~.register_decoder` unless ``cls``, ``object_hook`` or ``object_pairs_hook`` is given.
+
+	``into`` has the same meaning as for :func:`~.loads`.
+	"""  # noqa: D400
+
+	obj = json.load(fp, **_decoder_kwargs(kwargs))
+	return obj if into is None else _construction_plan(into)(obj)
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.loads)
+def loads(s: Union[str, bytes], *, into: Any = None, **kwargs: Any) -> Any:
+	"""
+	Deserialize JSON to Python objects, applying any decoders registered with
+	:func:`~.register_decoder` unless ``cls``, ``object_hook`` or ``object_pairs_hook`` is given.
+
+	Pass ``into=<type>`` to construct an instance of that type (e.g. a dataclass, or ``List[Order]``)
+	rather than returning plain dictionaries and lists.
+
+	.. code-block:: python
+
+		orders = sdjson.loads(text, into=List[Order])
+
+	The fields of dataclasses, attrs classes, namedtuples (from JSON objects or arrays) and annotated classes
+	are constructed according to their type annotations, as are the elements of lists, tuples, sets and dictionaries,
+	:class:`enum.Enum` members, and any class registered with :func:`~.register_constructor`.
+	Other values are left unchanged, and are not validated against the annotations.
+	The function which constructs each type is generated once and reused. Decoded containers are converted in place,
+	so each object can be freed as soon as it has been converted, which reduces the peak memory use.
+	"""  # noqa: D400
+
+	obj = json.loads(s, **_decoder_kwargs(kwargs))
+	return obj if into is None else _construction_plan(into)(obj)
+
+
+def load_path(
+		path: Union[str, "os.PathLike[str]"],
+		*,
+		mmap: bool = False,
+		into: Any = None,
+		**kwargs: Any,
+		) -> Any:
+	"""
+	Deserialize the JSON document in the file at ``path`` to Python objects.
+
+	The encoding (UTF-8, UTF-16 or UTF-32) is detected from the start of the file, as for :func:`~.loads`,
+	and the text is decoded before the JSON is parsed, so unlike :func:`~.load` with a binary file
+	a copy of the file's contents is not kept in memory alongside the parsed objects.
+
+	If ``mmap`` is :py:obj:`True` the file is memory-mapped and the text decoded from the mapped pages
+	rather than from a :class:`bytes` copy of the file. This does not reduce the peak memory use,
+	as the mapped pages are resident while they are decoded and the decoded text must exist in full
+	while it is parsed.
+
+	:param path:
+	:param mmap: Whether to memory-map the file.
+	:param into: The type to construct, as for :func:`~.loads`.
+	:param kwargs: Keyword arguments for the :class:`~json.JSONDecoder`, as for :func:`~.loads`.
+	"""
+
+	with open(path, "rb") as fp:
+		# Empty files cannot be mapped.
+		if mmap and os.fstat(fp.fileno()).st_size:
+			# stdlib
+			import mmap as mmap_module
+
+			with mmap_module.mmap(fp.fileno(), 0, access=mmap_module.ACCESS_READ) as mapped:
+				with memoryview(mapped) as view:
+					text = str(view, json.detect_encoding(mapped[:4]), "surrogatepass")
+		else:
+			data = fp.read()
+			text = data.decode(json.detect_encoding(data), "surrogatepass")
+			# Free the bytes before decoding the JSON, unlike ``json.loads(data)``.
+			del data
+
+	return loads(text, into=into, **kwargs)
+
+
+async def dump_async(
+		obj: Any,
+		writer: Any,
+		*,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		indent: Union[None, int, str] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		**kwargs: Any,
+		) -> None:
+	"""
+	Serialize ``obj`` to an asynchronous writer as UTF-8 encoded JSON,
+	without blocking the event loop for the whole document.
+
+	The output is produced incrementally in blocks of roughly ``chunk_size`` characters.
+	After each block is written the writer's ``drain()`` method (if any) is awaited
+	and control is returned to the event loop, so other tasks are only ever blocked
+	while a single block is encoded.
+
+	.. code-block:: python
+
+		async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+			await sdjson.dump_async(large_object, writer)
+
+	The remaining arguments have the same meaning as for :func:`~.dump`.
+
+	:param obj:
+	:param writer: An object with a ``write()`` method accepting :class:`bytes`,
+		such as an :class:`asyncio.StreamWriter`. ``write()`` may be a coroutine function.
+	"""
+
+	encoder = _get_encoder(
+			cls=cls,
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=indent,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			kwargs=kwargs,
+			)
+
+	# stdlib
+	import asyncio
+	import inspect
+
+	write = writer.write
+	drain = getattr(writer, "drain", None)
+
+	for block in _iter_encoded_blocks(encoder, obj, chunk_size):
+		result = write(block.encode("UTF-8"))
+		if inspect.isawaitable(result):
+			await result
+
+		if drain is not None:
+			await drain()
+
+		await asyncio.sleep(0)
+
+
+def dump_lines(
+		iterable: Iterable[Any],
+		fp: IO,
+		*,
+		skipkeys: bool = False,
+		ensure_ascii: bool = True,
+		check_circular: bool = True,
+		allow_nan: bool = True,
+		cls: Optional[Type[json.JSONEncoder]] = None,
+		separators: Optional[Tuple[str, str]] = None,
+		default: Optional[Callable[[Any], Any]] = None,
+		sort_keys: bool = False,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		**kwargs: Any,
+		) -> None:
+	"""
+	Serialize each object in ``iterable`` to ``fp`` as `JSON Lines <https://jsonlines.org>`_,
+	one JSON document per line.
+
+	A single encoder is used for every object, and the output is written to ``fp``
+	in blocks of roughly ``chunk_size`` characters.
+	The remaining arguments have the same meaning as for :func:`~.dump`.
+
+	:param iterable:
+	:param fp: A text or binary (UTF-8) file-like object.
+	"""
+
+	encode = _get_encoder(
+			cls=cls,
+			skipkeys=skipkeys,
+			ensure_ascii=ensure_ascii,
+			check_circular=check_circular,
+			allow_nan=allow_nan,
+			indent=None,
+			separators=separators,
+			default=default,
+			sort_keys=sort_keys,
+			kwargs=kwargs,
+			).encode
+
+	_write_chunked((encode(obj) + "\n" for obj in iterable), fp, chunk_size)
+
+
+def load_lines(fp: Iterable[Union[str, bytes]], **kwargs: Any) -> Iterator[Any]:
+	"""
+	Lazily deserialize `JSON Lines <https://jsonlines.org>`_ from ``fp``, yielding one object per line.
+
+	Blank lines are ignored. A single decoder is used for every line,
+	and any decoders registered with :func:`~.register_decoder` are applied as for :func:`~.load`.
+
+	:param fp: A text or binary (UTF-8) file-like object, or any other iterable of lines.
+	:param kwargs: Keyword arguments for the :class:`~json.JSONDecoder`, as for :func:`~.load`.
+
+	:raises json.JSONDecodeError: If a line is not a valid JSON document.
+	"""
+
+	kwargs = _decoder_kwargs(kwargs)
+	cls = kwargs.pop("cls", None) or json.JSONDecoder
+	decode = cls(**kwargs).decode
+
+	for line in fp:
+		if isinstance(line, bytes):
+			line = line.decode("UTF-8")
+
+		if line.strip():
+			yield decode(line)
+
+
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _StreamReader:
+	"""
+	Reads JSON values from a file-like object, holding only a bounded window of the text in memory.
+
+	:param fp:
+	:param decoder: The decoder used to parse each value.
+	:param chunk_size: The number of characters (or bytes) to read from ``fp`` at a time.
+	"""
+
+	def __init__(self, fp: IO, decoder: json.JSONDecoder, chunk_size: int):
+		self.fp = fp
+		self.decoder = decoder
+		self.chunk_size = chunk_size
+		self.buffer = ""
+		self.pos = 0
+		self.eof = False
+		self._bytes_decoder: Optional[codecs.IncrementalDecoder] = None
+
+	def _read(self, size: int) -> None:
+		"""
+		Read at least ``size`` more characters into the buffer, unless the end of the file is reached.
+
+		:param size:
+		"""
+
+		if self.pos >= self.chunk_size:
+			# Discard the text which has already been parsed.
+			self.buffer = self.buffer[self.pos:]
+			self.pos = 0
+
+		chunks = []
+		read = 0
+		while read < size:
+			data = self.fp.read(self.chunk_size)
+
+			if isinstance(data, bytes):
+				if self._bytes_decoder is None:
+					self._bytes_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+				chunk = self._bytes_decoder.decode(data, final=not data)
+			else:
+				chunk = data
+
+			chunks.append(chunk)
+			read += len(chunk)
+
+			if not data:
+				self.eof = True
+				break
+
+		self.buffer += "".join(chunks)
+
+	def peek(self) -> str:
+		"""
+		Returns the next non-whitespace character, without consuming it, or an empty string at the end of the file.
+		"""
+
+		while True:
+			buffer = self.buffer
+			pos = self.pos
+			length = len(buffer)
+
+			while pos < length and buffer[pos] in " \t\n\r":
+				pos += 1
+
+			self.pos = pos
+			if pos < length:
+				return buffer[pos]
+			elif self.eof:
+				return ""
+
+			self._read(self.chunk_size)
+
+	def expect(self, char: str, description: str) -> None:
+		"""
+		Consume the next non-whitespace character, which must be ``char``.
+
+		:param char:
+		:param description: The name of the expected token, for the error message.
+
+		:raises json.JSONDecodeError: If a different character is found.
+		"""
+
+		if self.peek() != char:
+			raise JSONDecodeError(f"Expecting {description}", self.buffer, self.pos)
+		self.pos += 1
+
+	def decode(self) -> Any:
+		"""
+		Decode the next JSON value.
+
+		:raises json.JSONDecodeError: If the value is invalid or incomplete.
+		"""
+
+		self.peek()
+
+		while True:
+			try:
+				value, end = self.decoder.raw_decode(self.buffer, self.pos)
+			except JSONDecodeError:
+				if self.eof:
+					raise
+			else:
+				# A number at the end of the buffer may continue in the next chunk.
+				if self.eof or self.buffer[self.pos] not in _NUMBER_START or self.buffer[end:].strip(_NUMBER_CHARS):
+					self.pos = end
+					return value
+
+			# Grow the buffer geometrically so values spanning many chunks are parsed in linear time.
+			self._read(max(self.chunk_size, len(self.buffer) - self.pos))
+
+	def iter_path(self, path: Sequence[str]) -> Iterator[Any]:
+		"""
+		Yields the values at the given path.
+
+		:param path: A sequence of object keys, or ``'item'`` for each element of an array.
+		"""
+
+		if not path:
+			yield self.decode()
+			return
+
+		head, rest = path[0], path[1:]
+		token = self.peek()
+
+		if head == "item" and token == "[":
+			self.pos += 1
+			if self.peek() == "]":
+				self.pos += 1
+				return
+
+			while True:
+				yield from self.iter_path(rest)
+				if self.peek() == "]":
+					self.pos += 1
+					return
+				self.expect(",", "',' delimiter")
+
+		elif head != "item" and token == "{":
+			self.pos += 1
+			if self.peek() == "}":
+				self.pos += 1
+				return
+
+			while True:
+				if self.peek() != '"':
+					raise JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+				key = self.decode()
+				self.expect(":", "':' delimiter")
+
+				if key == head:
+					yield from self.iter_path(rest)
+				else:
+					self.decode()
+
+				if self.peek() == "}":
+					self.pos += 1
+					return
+				self.expect(",", "',' delimiter")
+
+		else:
+			# The value doesn't match the path; skip it.
+			self.decode()
+
+
+def iterload(
+		fp: IO,
+		path: str = "item",
+		*,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		into: Any = None,
+		**kwargs: Any,
+		) -> Iterator[Any]:
+	"""
+	Incrementally deserialize the JSON document in ``fp``, yielding the values at ``path`` one at a time.
+
+	The file is read ``chunk_size`` characters (or bytes) at a time,
+	so only the value currently being decoded needs to fit in memory.
+
+	.. code-block:: python
+
+		# [{"id": 1}, {"id": 2}, ...]
+		for record in sdjson.iterload(fp):
+			...
+
+		# {"count": 2, "results": [{"id": 1}, {"id": 2}]}
+		for record in sdjson.iterload(fp, "results.item"):
+			...
+
+	:param fp: A text or binary (UTF-8) file-like object.
+	:param path: A dot-separated sequence of object keys, with ``item`` representing each element of an array.
+		The default yields each element of a top-level array. An empty string yields the entire document.
+	:param chunk_size:
+	:param into: The type to construct each value as, as for :func:`~.loads`.
+	:param kwargs: Keyword arguments for the :class:`~json.JSONDecoder`, as for :func:`~.load`.
+		Any decoders registered with :func:`~.register_decoder` are applied to each value.
+
+	:raises json.JSONDecodeError: If the document is invalid.
+	"""
+
+	kwargs = _decoder_kwargs(kwargs)
+	cls = kwargs.pop("cls", None) or json.JSONDecoder
+	reader = _StreamReader(fp, cls(**kwargs), chunk_size)
+
+	if into is None:
+		yield from reader.iter_path(path.split(".") if path else [])
+	else:
+		yield from map(_construction_plan(into), reader.iter_path(path.split(".") if path else []))
+
+	if reader.peek():
+		raise JSONDecodeError("Extra data", reader.buffer, reader.pos)
+
+
+class RawJSON:
+	"""
+	A fragment of JSON text, such as a cached response, which is written to the output verbatim.
+
+	The text is neither parsed nor escaped, so it must already be valid JSON.
+	:class:`~.RawJSON` values may appear anywhere a value is permitted (but not as dictionary keys)
+	in the objects passed to :func:`~.dump`, :func:`~.dumps` and related functions,
+	or be returned by registered encoders.
+	They are not supported by custom encoder classes passed as ``cls``.
+
+	:param text:
+	"""
+
+	__slots__ = ("text", )
+
+	def __init__(self, text: str):
+		self.text: str = text
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({self.text!r})"
+
+
+class _RawJSONFound(Exception):
+	"""
+	Raised by :meth:`_CustomEncoder.default` on finding a :class:`~.RawJSON` value
+	when the encoder is not prepared to substitute them.
+	"""  # noqa: D400
+
+
+class _FloatKeysCollide(Exception):
+	"""
+	Raised by :meth:`_CustomEncoder._round_floats` when two float keys of a dictionary are equal once rounded,
+	so would be merged into one.
+	"""  # noqa: D400
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.JSONEncoder)
+class JSONEncoder(json.JSONEncoder):
+	"""
+	Alias of :class:`json.JSONEncoder`.
+
+	.. autosummary-widths:: 31/100
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+
+	@sphinxify_json_docstring()
+	@_is_documented_by(json.JSONEncoder.default)
+	def default(self, o: Any) -> Any:  # noqa: D102
+		return super().default(o)
+
+	@sphinxify_json_docstring()
+	@_is_documented_by(json.JSONEncoder.encode)
+	def encode(self, o: Any) -> Any:  # noqa: D102
+		return super().encode(o)
+
+	@sphinxify_json_docstring()
+	@_is_documented_by(json.JSONEncoder.iterencode)
+	def iterencode(  # noqa: D102
+			self,
+			o: Any,
+			_one_shot: bool = False,
+			) -> Iterator[str]:  # pragma: no cover (!CPython)
+		return super().iterencode(o, _one_shot)
+
+
+@sphinxify_json_docstring()
+@_append_docstring_from(json.JSONDecoder)
+class JSONDecoder(json.JSONDecoder):  # pragma: no cover (!CPython)  # TODO
+	"""
+	Alias of :class:`json.JSONDecoder`.
+
+	.. autosummary-widths:: 35/100
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+
+	@sphinxify_json_docstring()
+	@_is_documented_by(json.JSONDecoder.decode)
+	def decode(self, *args, **kwargs):  # noqa: MAN002,D102
+		return super().decode(*args, **kwargs)
+
+	@sphinxify_json_docstring()
+	@_is_documented_by(json.JSONDecoder.raw_decode)
+	def raw_decode(self, *args, **kwargs):  # noqa: MAN002,D102
+		return super().raw_decode(*args, **kwargs)
+
+
+JSONDecodeError = json.JSONDecodeError
+
+def _make_iterencode(
+		markers: Optional[Dict[int, Any]],
+		_default: Callable[[Any], Any],
+		_encoder: Callable[[str], str],
+		_indent: Union[None, int, str],
+		_floatstr: Callable[[float], str],
+		_key_separator: str,
+		_item_separator: str,
+		_sort_keys: bool,
+		_skipkeys: bool,
+		_one_shot: bool,
+		_convert_key: Callable[[Any], Any],
+		## HACK: hand-optimized bytecode; turn globals into locals
+		ValueError: Type[ValueError] = ValueError,
+		dict: Type[dict] = dict,  # noqa: A002
+		float: Type[float] = float,  # noqa: A002
+		id: Callable[[Any], int] = id,  # noqa: A002
+		int: Type[int] = int,  # noqa: A002
+		isinstance: Callable[[Any, Any], bool] = isinstance,  # noqa: A002
+		list: Type[list] = list,  # noqa: A002
+		str: Type[str] = str,  # noqa: A002
+		tuple: Type[tuple] = tuple,  # noqa: A002
+		_intstr: Callable[[int], str] = int.__repr__,
+		) -> Callable[[Any, int], Iterator[str]]:
+	"""
+	The json module's pure-Python encoder, modified to convert dictionary keys of unsupported types
+	with ``_convert_key`` as they are found (before they are skipped with ``skipkeys``).
+
+	``_convert_key`` returns the converted key, or the key itself if it cannot be converted.
+	It is only called for keys which are not :class:`str`, :class:`int`, :class:`float`, :class:`bool` or
+	:py:obj:`None`, so there is no cost for dictionaries without such keys.
+	"""
+
+	if _indent is not None and not isinstance(_indent, str):
+		_indent = " " * _indent
+
+	def _keystr(key: Any) -> str:
+		if isinstance(key, str):
+			return key
+		elif isinstance(key, float):
+			return _floatstr(key)
+		elif key is True:
+			return "true"
+		elif key is False:
+			return "false"
+		elif key is None:
+			return "null"
+		else:
+			return _intstr(key)
+
+	def _iterencode_list(lst, _current_indent_level):  # noqa: MAN001,MAN002
+		if not lst:
+			yield "[]"
+			return
+		if markers is not None:
+			markerid = id(lst)
+			if markerid in markers:
+				raise ValueError("Circular reference detected")
+			markers[markerid] = lst
+		buf = "["
+		if _indent is not None:
+			_current_indent_level += 1
+			newline_indent = "\n" + _indent * _current_indent_level
+			separator = _item_separator + newline_indent
+			buf += newline_indent
+		else:
+			newline_indent = None
+			separator = _item_separator
+		first = True
+		for value in lst:
+			if first:
+				first = False
+			else:
+				buf = separator
+			if isinstance(value, str):
+				yield buf + _encoder(value)
+			elif value is None:
+				yield buf + "null"
+			elif value is True:
+				yield buf + "true"
+			elif value is False:
+				yield buf + "false"
+			elif isinstance(value, int):
+				# Subclasses of int/float may override __repr__, but we still
+				# want to encode them as integers/floats in JSON. One example
+				# within the standard library is IntEnum.
+				yield buf + _intstr(value)
+			elif isinstance(value, float):
+				# see comment above for int
+				yield buf + _floatstr(value)
+			else:
+				yield buf
+				if isinstance(value, (list, tuple)):
+					chunks = _iterencode_list(value, _current_indent_level)
+				elif isinstance(value, dict):
+					chunks = _iterencode_dict(value, _current_indent_level)
+				else:
+					chunks = _iterencode(value, _current_indent_level)
+				yield from chunks
+		if newline_indent is not None:
+			_current_indent_level -= 1
+			yield "\n" + _indent * _current_indent_level
+		yield "]"
+		if markers is not None:
+			del markers[markerid]
+
+	def _iterencode_dict(dct, _current_indent_level):  # noqa: MAN001,MAN002
+		if not dct:
+			yield "{}"
+			return
+		if markers is not None:
+			markerid = id(dct)
+			if markerid in markers:
+				raise ValueError("Circular reference detected")
+			markers[markerid] = dct
+		yield "{"
+		if _indent is not None:
+			_current_indent_level += 1
+			newline_indent = "\n" + _indent * _current_indent_level
+			item_separator = _item_separator + newline_indent
+			yield newline_indent
+		else:
+			newline_indent = None
+			item_separator = _item_separator
+		first = True
+		if _sort_keys:
+			try:
+				items = sorted(dct.items())
+			except TypeError:
+				# Keys of unsupported types may only be comparable once converted.
+				items = sorted((_convert_key(key), value) for key, value in dct.items())
+		else:
+			items = dct.items()
+		for key, value in items:
+			if isinstance(key, str):
+				pass
+			# JavaScript is weakly typed for these, so it makes sense to
+			# also allow them.  Many encoders seem to do something like this.
+			elif isinstance(key, float):
+				# see comment for int/float in _make_iterencode
+				key = _floatstr(key)
+			elif key is True:
+				key = "true"
+			elif key is False:
+				key = "false"
+			elif key is None:
+				key = "null"
+			elif isinstance(key, int):
+				# see comment for int/float in _make_iterencode
+				key = _intstr(key)
+			else:
+				converted = _convert_key(key)
+				if converted is not key:
+					key = _keystr(converted)
+				elif _skipkeys:
+					continue
+				else:
+					raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+			if first:
+				first = False
+			else:
+				yield item_separator
+			yield _encoder(key)
+			yield _key_separator
+			if isinstance(value, str):
+				yield _encoder(value)
+			elif value is None:
+				yield "null"
+			elif value is True:
+				yield "true"
+			elif value is False:
+				yield "false"
+			elif isinstance(value, int):
+				# see comment for int/float in _make_iterencode
+				yield _intstr(value)
+			elif isinstance(value, float):
+				# see comment for int/float in _make_iterencode
+				yield _floatstr(value)
+			else:
+				if isinstance(value, (list, tuple)):
+					chunks = _iterencode_list(value, _current_indent_level)
+				elif isinstance(value, dict):
+					chunks = _iterencode_dict(value, _current_indent_level)
+				else:
+					chunks = _iterencode(value, _current_indent_level)
+				yield from chunks
+		if newline_indent is not None:
+			_current_indent_level -= 1
+			yield "\n" + _indent * _current_indent_level
+		yield "}"
+		if markers is not None:
+			del markers[markerid]
+
+	def _iterencode(o, _current_indent_level):  # noqa: MAN001,MAN002
+		if isinstance(o, str):
+			yield _encoder(o)
+		elif o is None:
+			yield "null"
+		elif o is True:
+			yield "true"
+		elif o is False:
+			yield "false"
+		elif isinstance(o, int):
+			# see comment for int/float in _make_iterencode
+			yield _intstr(o)
+		elif isinstance(o, float):
+			# see comment for int/float in _make_iterencode
+			yield _floatstr(o)
+		elif isinstance(o, (list, tuple)):
+			yield from _iterencode_list(o, _current_indent_level)
+		elif isinstance(o, dict):
+			yield from _iterencode_dict(o, _current_indent_level)
+		else:
+			if markers is not None:
+				markerid = id(o)
+				if markerid in markers:
+					raise ValueError("Circular reference detected")
+				markers[markerid] = o
+			o = _default(o)
+			yield from _iterencode(o, _current_indent_level)
+			if markers is not None:
+				del markers[markerid]
+
+	return _iterencode
+
+
+# Custom encoder for sdjson
+class _CustomEncoder(JSONEncoder):
+
+	def __init__(
+			self,
+			*,
+			intercept_subclasses: bool = False,
+			registry: Optional[Registry] = None,
+			float_precision: Optional[int] = None,
+			float_format: Union[None, str, Callable[[float], str]] = None,
+			**kwargs: Any,
+			):
+		super().__init__(**kwargs)
+		self.intercept_subclasses = intercept_subclasses
+		self.registry = registry
+		self.float_precision = float_precision
+		self.float_format = float_format
+
+		self._format_float: Optional[Callable[[float], str]] = None
+
+		if float_precision is not None and float_format is not None:
+			raise ValueError("'float_precision' and 'float_format' cannot both be given.")
+		elif float_precision is not None:
+			# float.__repr__ gives the shortest string which round-trips,
+			# so has no more than ``float_precision`` decimal places once rounded.
+			self._format_float = lambda f: float.__repr__(round(f, float_precision))  # type: ignore[arg-type]
+		elif isinstance(float_format, str):
+			self._format_float = f"{{:{float_format}}}".format
+		elif float_format is not None:
+			self._format_float = float_format
+
+		#: The text of the :class:`~.RawJSON` values found so far, keyed on the encoded form of
+		#: the placeholder strings written in their place.
+		#: This is only set on the single-use copies of the encoder made by :meth:`~._raw_copy`.
+		self._raw_fragments: Optional[Dict[str, str]] = None
+		self._raw_nonce = ""
+
+		#: Whether the pure-Python encoder, which converts dictionary keys with the registered handlers,
+		#: is used in place of the C encoder, which does not call back into Python for them.
+		#: This is only set on the single-use copies of the encoder made by :meth:`~._key_converting_copy`.
+		self._convert_keys_enabled = False
+
+	def default(self, obj):  # noqa: MAN001,MAN002
+		if isinstance(obj, RawJSON):
+			return self._raw_placeholder(obj)
+
+		registry = self.registry or _active_registry.get() or encoders
+		handler = registry.dispatch(obj)
+		if handler is None:
+			return super().default(obj)
+
+		value = handler(obj)
+		if self.intercept_subclasses and registry._intercepted:
+			value = self._intercept(value)
+		return value
+
+	def _rounding_default(self, obj):  # noqa: MAN001,MAN002
+		# The C encoder formats the floats in the value returned by default() itself,
+		# so they are rounded beforehand.
+		return self._round_floats(self.default(obj))
+
+	def encode(self, o: Any) -> str:  # noqa: D102
+		if self.intercept_subclasses and (self.registry or get_registry())._intercepted:
+			o = self._intercept(o)
+
+		# Objects containing RawJSON values, dictionary keys which need converting, or float keys which are
+		# equal once rounded, are encoded again with a copy of the encoder prepared for them,
+		# so that encoding other objects costs nothing extra.
+		# The handlers for any values encoded before the first attempt stopped are called again.
+		encoder = self
+
+		while True:
+			try:
+				return encoder._substitute_raw(encoder._encode(o))
+			except _RawJSONFound:
+				encoder = encoder._raw_copy()
+			except _FloatKeysCollide:
+				encoder = encoder._key_converting_copy()
+			except TypeError as e:
+				if encoder._convert_keys_enabled or not encoder._is_key_error(e):
+					raise
+				encoder = encoder._key_converting_copy()
+
+	def _encode(self, o: Any) -> str:
+		if isinstance(o, str):
+			return super().encode(o)
+
+		chunks = self._iterencode(o, _one_shot=True)
+		if not isinstance(chunks, (list, tuple)):  # pragma: no cover (!CPython)
+			chunks = list(chunks)
+		return "".join(chunks)
+
+	def iterencode(self, o: Any, _one_shot: bool = False) -> Iterator[str]:  # noqa: D102
+		if self.intercept_subclasses and (self.registry or get_registry())._intercepted:
+			o = self._intercept(o)
+
+		return self._iterencode(o, _one_shot)
+
+	def _iterencode(self, o: Any, _one_shot: bool) -> Iterator[str]:
+		if (
+				_one_shot and json.encoder.c_make_encoder is not None and self.indent is None
+				and self.float_format is None and not self._convert_keys_enabled
+				):
+			if self.float_precision is not None:
+				# The C encoder always uses float.__repr__, so round the floats beforehand.
+				o = self._round_floats(o)
+
+			# With skipkeys the C encoder would skip keys which could be converted, so they are reported instead
+			# and the object encoded again by the pure-Python encoder, which converts them before skipping the rest.
+			return json.encoder.c_make_encoder(  # type: ignore[attr-defined]
+				{} if self.check_circular else None,
+				self.default if self.float_precision is None else self._rounding_default,
+				json.encoder.encode_basestring_ascii if self.ensure_ascii else json.encoder.encode_basestring,
+				self.indent,
+				self.key_separator,
+				self.item_separator,
+				self.sort_keys,
+				False,
+				self.allow_nan,
+				)(o, 0)
+
+		return self._make_iterencode(_one_shot)(o, 0)
+
+	def _is_key_error(self, exc: TypeError) -> bool:
+		"""
+		Returns whether ``exc`` was raised by the json module on finding a dictionary key of an unsupported type.
+
+		:param exc:
+		"""
+
+		message = str(exc)
+		if message.startswith("keys must be"):
+			return True
+
+		# With sort_keys the keys are sorted first, which fails if they are of different types.
+		return self.sort_keys and "not supported between instances of" in message
+
+	def _key_converting_copy(self) -> "_CustomEncoder":
+		"""
+		Returns a copy of the encoder, for a single call, which uses the pure-Python encoder
+		to apply the registered handlers to dictionary keys which the json module does not support,
+		and to format float keys without first rounding them into one another.
+		"""
+
+		# stdlib
+		import copy
+
+		key_encoder = copy.copy(self)
+		key_encoder._convert_keys_enabled = True
+		return key_encoder
+
+	def _convert_key(self, key: Any) -> Any:
+		"""
+		Apply the registered handler to the dictionary key ``key``, provided it returns a
+		:class:`str`, :class:`int`, :class:`float`, :class:`bool` or :py:obj:`None`.
+
+		Returns ``key`` itself if it is already of one of those types, or it cannot be converted,
+		in which case it is left for the json module to report (or skip).
+
+		:param key:
+		"""
+
+		if isinstance(key, (str, int, float)) or key is None:
+			return key
+
+		handler = (self.registry or get_registry()).dispatch(key)
+		if handler is not None:
+			new_key = handler(key)
+			if isinstance(new_key, (str, int, float)) or new_key is None:
+				return new_key
+
+		return key
+
+	def _raw_copy(self) -> "_CustomEncoder":
+		"""
+		Returns a copy of the encoder, for a single call, which writes placeholders for :class:`~.RawJSON` values.
+		"""
+
+		# stdlib
+		import copy
+
+		raw_encoder = copy.copy(self)
+		raw_encoder._raw_fragments = {}
+		raw_encoder._raw_nonce = os.urandom(8).hex()
+		return raw_encoder
+
+	def _raw_placeholder(self, obj: RawJSON) -> str:
+		"""
+		Returns the placeholder string to encode in place of ``obj``, and records its text.
+
+		:param obj:
+
+		:raises _RawJSONFound: If the encoder is not a copy returned by :meth:`~._raw_copy`.
+		"""
+
+		fragments = self._raw_fragments
+		if fragments is None:
+			raise _RawJSONFound
+
+		# Control characters are always escaped by the json module, whatever the value of ensure_ascii,
+		# and the random nonce prevents the placeholder coinciding with any other string.
+		name = f"{self._raw_nonce}:{len(fragments)}"
+		fragments[f'"\\u0000{name}\\u0000"'] = obj.text
+		return f"\x00{name}\x00"
+
+	def _substitute_raw(self, text: str) -> str:
+		"""
+		Replace the encoded placeholders in ``text`` with the text of their :class:`~.RawJSON` values.
+
+		:param text:
+		"""
+
+		fragments = self._raw_fragments
+		if not fragments:
+			return text
+
+		pattern = re.escape(f'"\\u0000{self._raw_nonce}:') + r"\d+" + re.escape('\\u0000"')
+		return re.sub(pattern, lambda match: fragments[match.group()], text)
+
+	def _make_iterencode(self, _one_shot: bool) -> Callable[[Any, int], Iterator[str]]:
+		"""
+		Returns the pure-Python encoder, which uses ``float_format`` or ``float_precision`` to format floats
+		and converts dictionary keys with the registered handlers.
+
+		:param _one_shot:
+		"""
+
+		format_float: Callable[[float], str] = self._format_float or float.__repr__
+
+		def floatstr(
+				o: float,
+				allow_nan: bool = self.allow_nan,
+				_inf: float = float("inf"),
+				_neginf: float = -float("inf"),
+				) -> str:
+			if o != o:
+				text = "NaN"
+			elif o == _inf:
+				text = "Infinity"
+			elif o == _neginf:
+				text = "-Infinity"
+			else:
+				return format_float(o)
+
+			if not allow_nan:
+				raise ValueError("Out of range float values are not JSON compliant: " + repr(o))
+
+			return text
+
+		return _make_iterencode(
+			{} if self.check_circular else None,
+			self.default,
+			json.encoder.encode_basestring_ascii if self.ensure_ascii else json.encoder.encode_basestring,
+			self.indent,
+			floatstr,
+			self.key_separator,
+			self.item_separator,
+			self.sort_keys,
+			self.skipkeys,
+			_one_shot,
+			self._convert_key,
+			)
+
+	def _round_floats(self, o: Any) -> Any:
+		"""
+		Round each :class:`float` within ``o`` (including dictionary keys) to ``float_precision`` decimal places.
+
+		Containers are copied; other values are left unchanged.
+
+		:param o:
+
+		:raises _FloatKeysCollide: If two keys of a dictionary are equal once rounded.
+		"""
+
+		ndigits = self.float_precision
+		markers: Optional[Dict[int, Any]] = {} if self.check_circular else None
+		is_scalar = {str, int, bool, type(None)}.__contains__
+
+		def walk(value: Any) -> Any:
+			if isinstance(value, float):
+				return round(value, ndigits)
+			elif not isinstance(value, (dict, list, tuple)):
+				return value
+
+			if markers is not None:
+				marker_id = id(value)
+				if marker_id in markers:
+					raise ValueError("Circular reference detected")
+				markers[marker_id] = value
+
+			# Handle the common cases inline to avoid a call to walk() for each value.
+			if isinstance(value, dict):
+				rounded = {
+						round(k, ndigits) if type(k) is float else k:  # noqa: E131
+						round(v, ndigits) if type(v) is float else v if is_scalar(type(v)) else walk(v)
+						for k, v in value.items()
+						}
+				if len(rounded) != len(value):
+					raise _FloatKeysCollide
+				value = rounded
+			else:
+				value = [
+						round(v, ndigits) if type(v) is float else v if is_scalar(type(v)) else walk(v)
+						for v in value
+						]
+
+			if markers is not None:
+				del markers[marker_id]
+
+			return value
+
+		return walk(o)
+
+	def _intercept(self, o: Any) -> Any:
+		"""
+		Apply the registered handlers to any instances of subclasses of :class:`str`, :class:`int`,
+		:class:`float`, :class:`list`, :class:`tuple` and :class:`dict` within ``o``
+		for which a handler is registered (for the subclass or one of its bases),
+		which the json module would otherwise serialize without calling :meth:`~.default`.
+
+		Only the containers holding such objects are copied; all other values are left for
+		the json module to serialize as normal.
+
+		:param o:
+		"""
+
+		registry = self.registry or get_registry()
+		dispatch = registry.dispatch
+		intercepted = registry._intercepted
+		markers: Optional[Dict[int, Any]] = {} if self.check_circular else None
+
+		def walk(value: Any) -> Any:
+			value_type = type(value)
+
+			if value_type is str or value_type is int or value_type is float or value is None or value_type is bool:
+				return value
+
+			if value_type not in _NATIVE_TYPES:
+				if not isinstance(value, _NATIVE_TYPES):
+					# Handled by default()
+					return value
+
+				# Only subclasses registered directly (or subclasses of them) are intercepted,
+				# not those which merely match a handler for an ABC or protocol.
+				handler = None if intercepted.isdisjoint(value_type.__mro__) else dispatch(value)
+				if handler is not None:
+					value = handler(value)
+					if type(value) is value_type:
+						return value
+					return walk(value)
+
+			if isinstance(value, dict):
+				items = value.items()
+			elif isinstance(value, (list, tuple)):
+				items = enumerate(value)
+			else:
+				return value
+
+			if markers is not None:
+				marker_id = id(value)
+				if marker_id in markers:
+					raise ValueError("Circular reference detected")
+				markers[marker_id] = value
+
+			replacement = None
+			for key, item in items:
+				new_item = walk(item)
+				if new_item is not item:
+					if replacement is None:
+						replacement = dict(value) if isinstance(value, dict) else list(value)
+					replacement[key] = new_item
+
+			if markers is not None:
+				del markers[marker_id]
+
+			return value if replacement is None else replacement
+
+		return walk(o)
 
 
 _default_encoder = _CustomEncoder(
@@ -39,16 +39,26 @@
 #
 
 # stdlib
+import concurrent.futures
 import json
+import os
+from contextvars import ContextVar
 from typing import (
 		IO,
 		Any,
 		Callable,
+		ClassVar,
+		ContextManager,
 		Dict,
+		FrozenSet,
+		Hashable,
+		Iterable,
 		Iterator,
 		List,
 		Mapping,
+		NamedTuple,
 		Optional,
+		Sequence,
 		Tuple,
 		Type,
 		TypeVar,
@@ -68,6 +78,7 @@ __email__: str
 _T_co = TypeVar("_T_co", covariant=True)
 _LoadsString = Union[str, bytes]
 _T = TypeVar("_T")
+_F = TypeVar("_F", bound=Callable[..., Any])
 
 class SingleDispatch(Protocol):
 	"""
@@ -92,29 +103,236 @@ class SupportsRead(Protocol[_T_co]):
 	def read(self, __length: int = ...) -> _T_co: ...
 
 def allow_unregister(func: SingleDispatch) -> SingleDispatch: ...
+def _static_fields(cls: Type) -> Optional[List[Tuple[str, str]]]: ...
+def _compile_plan(cls: Type, fields: List[Tuple[str, str]]) -> Callable[[Any], Dict[str, Any]]: ...
+def _is_classvar(hint: Any) -> bool: ...
+def _unwrap_optional(hint: Any) -> Any: ...
+def _schema_fields(cls: Type) -> Optional[List[Tuple[str, str, Any]]]: ...
+
+_SEQUENCE_ORIGINS: Tuple[type, ...]
+_MAPPING_ORIGINS: Tuple[type, ...]
+
+def _schema_conversion(
+		hint: Any,
+		resolve: Callable[[Any], Optional[Callable[..., Any]]],
+		namespace: Dict[str, Any],
+		variable: str,
+		) -> Optional[str]: ...
+def _compile_schema(
+		cls: Type,
+		fields: List[Tuple[str, str, Any]],
+		resolve: Callable[[Any], Optional[Callable[..., Any]]],
+		) -> Callable[[Any], Dict[str, Any]]: ...
 def sphinxify_json_docstring() -> Callable: ...
+def _cleandoc(doc: str) -> str: ...
+def _append_docstring_from(original: Callable) -> Callable[[_F], _F]: ...
+def _is_documented_by(original: Callable) -> Callable[[_F], _F]: ...
 
-class _Encoders:
-	_registry: SingleDispatch
-	_protocol_registry: Mapping[Any, Callable[..., _T]]
-	registry: Mapping[Any, Callable[..., _T]]
+_NATIVE_TYPES: Tuple[Type, ...]
+
+_MAX_DISPATCH_TABLE_SIZE: int
+
+class _RegistryState:
+	handlers: Dict[Type, Callable[..., Any]]
+	protocols: Dict[Type, Callable[..., Any]]
+	plans: Dict[Type, Callable[[Any], Dict[str, Any]]]
+	dispatcher: SingleDispatch
+	registry: Mapping[Any, Callable[..., Any]]
+	table: Dict[Type, Optional[Callable[..., Any]]]
+	cache_token: Optional[object]
+	intercepted: FrozenSet[Type]
+
+	def __init__(
+			self,
+			handlers: Dict[Type, Callable[..., Any]],
+			protocols: Dict[Type, Callable[..., Any]],
+			plans: Dict[Type, Callable[[Any], Dict[str, Any]]],
+			) -> None: ...
+
+class HandlerStats(NamedTuple):
+	path: str
+	calls: int
+	total_time: float
+	resolutions: int
+	resolution_time: float
+
+class _StatsRecord:
+	path: str
+	calls: int
+	total_time: float
+	resolutions: int
+	resolution_time: float
+
+	def __init__(self, path: str) -> None: ...
+
+def _instrument(handler: Callable[[Any], _T], record: _StatsRecord) -> Callable[[Any], _T]: ...
+class _CacheKey:
+	key: Any
+	obj: Any
+	hashvalue: int
+
+	def __init__(self, key: Any, obj: Any) -> None: ...
+	def __hash__(self) -> int: ...
+	def __eq__(self, other: object) -> bool: ...
+
+def _default_cache_key(obj: Any) -> Tuple[Any, ...]: ...
+def _cache_handler(
+		handler: Callable[[Any], _T],
+		maxsize: Optional[int],
+		key: Callable[[Any], Hashable] = ...,
+		) -> Callable[[Any], _T]: ...
+
+class Registry:
+	_state: _RegistryState
+	_stats_enabled: bool
+	_stats: Dict[Type, _StatsRecord]
+	_schemas: Dict[Type, List[Tuple[str, str, Any]]]
+
+	@property
+	def registry(self) -> Mapping[Any, Callable[..., Any]]: ...
+	@property
+	def _registry(self) -> SingleDispatch: ...
+	@property
+	def _protocol_registry(self) -> Dict[Type, Callable[..., Any]]: ...
+	@property
+	def _plans(self) -> Dict[Type, Callable[[Any], Dict[str, Any]]]: ...
+	@property
+	def _dispatch_table(self) -> Dict[Type, Optional[Callable[..., Any]]]: ...
+	@property
+	def _intercepted(self) -> FrozenSet[Type]: ...
 
 	@overload
-	def register(self, cls: Any) -> Callable[[Callable[..., _T]], Callable[..., _T]]: ...
+	def register(
+			self,
+			cls: Any,
+			*,
+			cache: bool = ...,
+			maxsize: Optional[int] = ...,
+			key: Optional[Callable[[Any], Hashable]] = ...,
+			) -> Callable[[Callable[..., _T]], Callable[..., _T]]: ...
 
 	@overload
-	def register(self, cls: Any, func: Callable[..., _T]) -> Callable[..., _T]: ...
+	def register(
+			self,
+			cls: Any,
+			func: Callable[..., _T],
+			*,
+			cache: bool = ...,
+			maxsize: Optional[int] = ...,
+			key: Optional[Callable[[Any], Hashable]] = ...,
+			) -> Callable[..., _T]: ...
 
-	def dispatch(self, cls: Any) -> Callable[..., _T]: ...
+	def dispatch(self, cls: Any) -> Optional[Callable[..., Any]]: ...
+	@staticmethod
+	def _resolve(state: _RegistryState, obj: object) -> Tuple[Optional[Callable[..., Any]], Any, str]: ...
 	def unregister(self, cls: Type) -> Any: ...
+	def compile(self, cls: Type) -> Optional[Callable[[Any], Dict[str, Any]]]: ...
+	def register_schema(self, cls: Type) -> Optional[Callable[[Any], Dict[str, Any]]]: ...
+	def _set_state(
+			self,
+			handlers: Dict[Type, Callable[..., Any]],
+			protocols: Dict[Type, Callable[..., Any]],
+			plans: Dict[Type, Callable[[Any], Dict[str, Any]]],
+			) -> None: ...
+	@staticmethod
+	def _resolve_type(state: _RegistryState, cls: Any) -> Tuple[Optional[Callable[..., Any]], Any, str]: ...
+	def enable_stats(self) -> None: ...
+	def disable_stats(self) -> None: ...
+	def reset_stats(self) -> None: ...
+	def _reset_state(self) -> None: ...
+	def stats(self) -> Dict[Type, HandlerStats]: ...
+	def _cached_handlers(self) -> Dict[Type, Callable[..., Any]]: ...
+	def cache_info(self, cls: Type) -> "_CacheInfo": ...
+	def cache_clear(self, cls: Optional[Type] = ...) -> None: ...
+	def copy(self) -> "Registry": ...
+	def activate(self) -> ContextManager["Registry"]: ...
+
+_active_registry: ContextVar[Optional[Registry]]
+_Encoders = Registry
+
+def get_registry() -> Registry: ...
 
-encoders = _Encoders()
+encoders: Registry
 register_encoder = encoders.register
 unregister_encoder = encoders.unregister
+compile_encoder = encoders.compile
+register_schema = encoders.register_schema
+
+class DataclassInstance(Protocol):
+	__dataclass_fields__: ClassVar[Dict[str, Any]]
+
+class AttrsInstance(Protocol):
+	__attrs_attrs__: ClassVar[Tuple[Any, ...]]
+
+_field_plans: Dict[Type, Callable[[Any], Dict[str, Any]]]
+
+def encode_fields(obj: Any) -> Dict[str, Any]: ...
+def register_field_encoders() -> None: ...
+
+def encode_numpy(obj: Any) -> Any: ...
+def register_numpy_encoders() -> None: ...
+
+DEFAULT_CHUNK_SIZE: int
+ENCODER_CACHE_SIZE: int
+
+class _CacheInfo(NamedTuple):
+	hits: int
+	misses: int
+	maxsize: Optional[int]
+	currsize: int
+
+def encoder_cache_info() -> _CacheInfo: ...
+def clear_encoder_cache() -> None: ...
+
+class _Decoders:
+	registry: Dict[Any, Callable[[Dict[str, Any]], Any]]
+	constructors: Dict[type, Callable[[Any], Any]]
+	type_key: str
+	discriminator: Optional[Callable[[Dict[str, Any]], Any]]
+
+	@overload
+	def register(self, tag: Any) -> Callable[[Callable[..., _T]], Callable[..., _T]]: ...
+
+	@overload
+	def register(self, tag: Any, func: Callable[..., _T]) -> Callable[..., _T]: ...
+
+	def unregister(self, tag: Any) -> None: ...
+
+	@overload
+	def register_constructor(self, cls: Type[_T]) -> Callable[[Callable[[Any], _T]], Callable[[Any], _T]]: ...
+
+	@overload
+	def register_constructor(self, cls: Type[_T], func: Callable[[Any], _T]) -> Callable[[Any], _T]: ...
+
+	def unregister_constructor(self, cls: Type) -> None: ...
+	def set_discriminator(self, discriminator: Union[str, Callable[[Dict[str, Any]], Any]]) -> None: ...
+	def object_hook(self, obj: Dict[str, Any]) -> Any: ...
+
+decoders = _Decoders()
+register_decoder = decoders.register
+unregister_decoder = decoders.unregister
+register_constructor = decoders.register_constructor
+unregister_constructor = decoders.unregister_constructor
+set_decoder_discriminator = decoders.set_discriminator
+
+_construction_plans: Dict[Any, Callable[[Any], Any]]
+
+def _construction_plan(hint: Any) -> Callable[[Any], Any]: ...
+def _identity(value: _T) -> _T: ...
+def _build_construction_plan(hint: Any) -> Callable[[Any], Any]: ...
+def _constructor_fields(cls: Type) -> Optional[List[Tuple[str, str, Any]]]: ...
+def _compile_constructor(cls: Type, fields: List[Tuple[str, str, Any]]) -> Callable[[Any], Any]: ...
+
+def _decoder_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]: ...
+def _is_binary_file(fp: IO) -> bool: ...
+def _iter_blocks(iterable: Iterable[str], chunk_size: int) -> Iterator[str]: ...
+def _iter_encoded_blocks(encoder: json.JSONEncoder, obj: Any, chunk_size: int) -> Iterator[str]: ...
+def _write_blocks(blocks: Iterable[str], fp: IO) -> None: ...
+def _write_chunked(iterable: Iterable[str], fp: IO, chunk_size: int) -> None: ...
 
 def dump(
 		obj: Any,
-		fp: IO[str],
+		fp: Union[IO[str], IO[bytes]],
 		*,
 		skipkeys: bool = ...,
 		ensure_ascii: bool = ...,
@@ -125,6 +343,7 @@ def dump(
 		separators: Optional[Tuple[str, str]] = ...,
 		default: Optional[Callable[[Any], Any]] = ...,
 		sort_keys: bool = ...,
+		chunk_size: int = ...,
 		**kwargs: Any
 		) -> None: ...
 
@@ -143,9 +362,54 @@ def dumps(
 		**kwargs: Any
 		) -> str: ...
 
+def dumps_bytes(
+		obj: Any,
+		*,
+		skipkeys: bool = ...,
+		ensure_ascii: bool = ...,
+		check_circular: bool = ...,
+		allow_nan: bool = ...,
+		cls: Optional[Type[json.JSONEncoder]] = ...,
+		indent: Union[None, int, str] = ...,
+		separators: Optional[Tuple[str, str]] = ...,
+		default: Optional[Callable[[Any], Any]] = ...,
+		sort_keys: bool = ...,
+		**kwargs: Any
+		) -> bytes: ...
+
+_spec_registries: Dict[str, Optional[Registry]]
+
+def _resolve_registry_spec(spec: str) -> Optional[Registry]: ...
+def _encode_shard(registry_spec: Optional[str], shard: Any, kwargs: Dict[str, Any]) -> str: ...
+
+_inherited_payloads: Dict[int, Tuple[Sequence[Any], bool, Dict[str, Any]]]
+_payload_tokens: Iterator[int]
+
+def _encode_inherited_shard(registry_spec: Optional[str], token: int, start: int, stop: int) -> str: ...
+def dumps_parallel(
+		obj: Any,
+		*,
+		workers: Optional[int] = ...,
+		shards: Optional[int] = ...,
+		registry_spec: Optional[str] = ...,
+		executor: Optional[concurrent.futures.Executor] = ...,
+		inherit: bool = ...,
+		skipkeys: bool = ...,
+		ensure_ascii: bool = ...,
+		check_circular: bool = ...,
+		allow_nan: bool = ...,
+		cls: Optional[Type[json.JSONEncoder]] = ...,
+		indent: Union[None, int, str] = ...,
+		separators: Optional[Tuple[str, str]] = ...,
+		default: Optional[Callable[[Any], Any]] = ...,
+		sort_keys: bool = ...,
+		**kwargs: Any
+		) -> str: ...
+
 def loads(
 		s: _LoadsString,
 		*,
+		into: Any = ...,
 		cls: Optional[Type[json.JSONDecoder]] = ...,
 		object_hook: Optional[Callable[[Dict[Any, Any]], Any]] = ...,
 		parse_float: Optional[Callable[[str], Any]] = ...,
@@ -158,6 +422,21 @@ def loads(
 def load(
 		fp: SupportsRead[_LoadsString],
 		*,
+		into: Any = ...,
+		cls: Optional[Type[json.JSONDecoder]] = ...,
+		object_hook: Optional[Callable[[Dict[Any, Any]], Any]] = ...,
+		parse_float: Optional[Callable[[str], Any]] = ...,
+		parse_int: Optional[Callable[[str], Any]] = ...,
+		parse_constant: Optional[Callable[[str], Any]] = ...,
+		object_pairs_hook: Optional[Callable[[List[Tuple[Any, Any]]], Any]] = ...,
+		**kwargs: Any
+		) -> Any: ...
+
+def load_path(
+		path: Union[str, "os.PathLike[str]"],
+		*,
+		mmap: bool = ...,
+		into: Any = ...,
 		cls: Optional[Type[json.JSONDecoder]] = ...,
 		object_hook: Optional[Callable[[Dict[Any, Any]], Any]] = ...,
 		parse_float: Optional[Callable[[str], Any]] = ...,
@@ -167,6 +446,75 @@ def load(
 		**kwargs: Any
 		) -> Any: ...
 
+async def dump_async(
+		obj: Any,
+		writer: Any,
+		*,
+		skipkeys: bool = ...,
+		ensure_ascii: bool = ...,
+		check_circular: bool = ...,
+		allow_nan: bool = ...,
+		cls: Optional[Type[json.JSONEncoder]] = ...,
+		indent: Union[None, int, str] = ...,
+		separators: Optional[Tuple[str, str]] = ...,
+		default: Optional[Callable[[Any], Any]] = ...,
+		sort_keys: bool = ...,
+		chunk_size: int = ...,
+		**kwargs: Any
+		) -> None: ...
+
+def dump_lines(
+		iterable: Iterable[Any],
+		fp: Union[IO[str], IO[bytes]],
+		*,
+		skipkeys: bool = ...,
+		ensure_ascii: bool = ...,
+		check_circular: bool = ...,
+		allow_nan: bool = ...,
+		cls: Optional[Type[json.JSONEncoder]] = ...,
+		separators: Optional[Tuple[str, str]] = ...,
+		default: Optional[Callable[[Any], Any]] = ...,
+		sort_keys: bool = ...,
+		chunk_size: int = ...,
+		**kwargs: Any
+		) -> None: ...
+
+def load_lines(
+		fp: Iterable[_LoadsString],
+		*,
+		cls: Optional[Type[json.JSONDecoder]] = ...,
+		object_hook: Optional[Callable[[Dict[Any, Any]], Any]] = ...,
+		parse_float: Optional[Callable[[str], Any]] = ...,
+		parse_int: Optional[Callable[[str], Any]] = ...,
+		parse_constant: Optional[Callable[[str], Any]] = ...,
+		object_pairs_hook: Optional[Callable[[List[Tuple[Any, Any]]], Any]] = ...,
+		**kwargs: Any
+		) -> Iterator[Any]: ...
+
+def iterload(
+		fp: SupportsRead[_LoadsString],
+		path: str = ...,
+		*,
+		chunk_size: int = ...,
+		into: Any = ...,
+		cls: Optional[Type[json.JSONDecoder]] = ...,
+		object_hook: Optional[Callable[[Dict[Any, Any]], Any]] = ...,
+		parse_float: Optional[Callable[[str], Any]] = ...,
+		parse_int: Optional[Callable[[str], Any]] = ...,
+		parse_constant: Optional[Callable[[str], Any]] = ...,
+		object_pairs_hook: Optional[Callable[[List[Tuple[Any, Any]]], Any]] = ...,
+		**kwargs: Any
+		) -> Iterator[Any]: ...
+
+class RawJSON:
+	text: str
+
+	def __init__(self, text: str) -> None: ...
+	def __repr__(self) -> str: ...
+
+class _RawJSONFound(Exception): ...
+class _FloatKeysCollide(Exception): ...
+
 class JSONEncoder(json.JSONEncoder):
 
 	def __init__(
@@ -215,7 +563,60 @@ class JSONDecoder(json.JSONDecoder):
 
 JSONDecodeError = json.JSONDecodeError
 
-class _CustomEncoder(JSONEncoder): ...
+
+def _make_iterencode(
+		markers: Optional[Dict[int, Any]],
+		_default: Callable[[Any], Any],
+		_encoder: Callable[[str], str],
+		_indent: Union[None, int, str],
+		_floatstr: Callable[[float], str],
+		_key_separator: str,
+		_item_separator: str,
+		_sort_keys: bool,
+		_skipkeys: bool,
+		_one_shot: bool,
+		_convert_key: Callable[[Any], Any],
+		) -> Callable[[Any, int], Iterator[str]]: ...
+
+class _CustomEncoder(JSONEncoder):
+	intercept_subclasses: bool
+	registry: Optional[Registry]
+	float_precision: Optional[int]
+	float_format: Union[None, str, Callable[[float], str]]
+	_format_float: Optional[Callable[[float], str]]
+	_raw_fragments: Optional[Dict[str, str]]
+	_raw_nonce: str
+	_convert_keys_enabled: bool
+
+	def __init__(
+			self,
+			*,
+			intercept_subclasses: bool = ...,
+			registry: Optional[Registry] = ...,
+			float_precision: Optional[int] = ...,
+			float_format: Union[None, str, Callable[[float], str]] = ...,
+			skipkeys: bool = ...,
+			ensure_ascii: bool = ...,
+			check_circular: bool = ...,
+			allow_nan: bool = ...,
+			sort_keys: bool = ...,
+			indent: Optional[int] = ...,
+			separators: Optional[Tuple[str, str]] = ...,
+			default: Optional[Callable[..., Any]] = ...
+			) -> None: ...
+
+	def _rounding_default(self, obj: Any) -> Any: ...
+	def _encode(self, o: Any) -> str: ...
+	def _iterencode(self, o: Any, _one_shot: bool) -> Iterator[str]: ...
+	def _is_key_error(self, exc: TypeError) -> bool: ...
+	def _key_converting_copy(self) -> "_CustomEncoder": ...
+	def _convert_key(self, key: Any) -> Any: ...
+	def _raw_copy(self) -> "_CustomEncoder": ...
+	def _raw_placeholder(self, obj: RawJSON) -> str: ...
+	def _substitute_raw(self, text: str) -> str: ...
+	def _intercept(self, o: Any) -> Any: ...
+	def _make_iterencode(self, _one_shot: bool) -> Callable[[Any, int], Iterator[str]]: ...
+	def _round_floats(self, o: Any) -> Any: ...
 
 _default_encoder = _CustomEncoder(
 		skipkeys=False,
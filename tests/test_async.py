@@ -0,0 +1,157 @@
+"""
+Test serializing to asynchronous writers with dump_async
+"""
+
+# stdlib
+import asyncio
+from decimal import Decimal
+from typing import Any, Awaitable, List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class RecordingWriter:
+	"""
+	Mimics the write/drain interface of :class:`asyncio.StreamWriter`.
+	"""
+
+	def __init__(self):
+		self.writes: List[bytes] = []
+		self.drains = 0
+
+	def write(self, data: bytes) -> None:
+		assert isinstance(data, bytes)
+		self.writes.append(data)
+
+	async def drain(self) -> None:
+		self.drains += 1
+
+	def getvalue(self) -> bytes:
+		return b"".join(self.writes)
+
+
+class AsyncWriteWriter:
+	"""
+	A writer whose ``write()`` method is a coroutine function, and which has no ``drain()``.
+	"""
+
+	def __init__(self):
+		self.writes: List[bytes] = []
+
+	async def write(self, data: bytes) -> None:
+		self.writes.append(data)
+
+
+def run(coro: Awaitable[Any]) -> Any:
+	loop = asyncio.new_event_loop()
+	try:
+		return loop.run_until_complete(coro)
+	finally:
+		loop.close()
+
+
+payload = [{"id": i, "city": "Zürich", "value": 1.5, "tags": ["a", "b"]} for i in range(2000)]
+
+
+def test_dump_async() -> None:
+	writer = RecordingWriter()
+	run(sdjson.dump_async(payload, writer, chunk_size=1024))
+
+	assert writer.getvalue() == sdjson.dumps(payload).encode("UTF-8")
+	assert len(writer.writes) > 1
+	assert writer.drains == len(writer.writes)
+	assert all(len(block) >= 1024 for block in writer.writes[:-1])
+
+
+def test_dump_async_options() -> None:
+	writer = RecordingWriter()
+	run(sdjson.dump_async(payload[:10], writer, ensure_ascii=False, indent=2, sort_keys=True))
+
+	expected = sdjson.dumps(payload[:10], ensure_ascii=False, indent=2, sort_keys=True)
+	assert writer.getvalue().decode("UTF-8") == expected
+	assert len(writer.writes) == 1
+
+
+def test_dump_async_coroutine_write() -> None:
+	writer = AsyncWriteWriter()
+	run(sdjson.dump_async(payload, writer, chunk_size=4096))
+
+	assert b"".join(writer.writes) == sdjson.dumps(payload).encode("UTF-8")
+	assert len(writer.writes) > 1
+
+
+def test_dump_async_custom_encoder() -> None:
+
+	@sdjson.register_encoder(Decimal)
+	def encode_decimal(obj: Decimal) -> str:
+		return str(obj)
+
+	try:
+		writer = RecordingWriter()
+		run(sdjson.dump_async({"price": Decimal("9.99")}, writer))
+		assert writer.getvalue() == b'{"price": "9.99"}'
+	finally:
+		sdjson.unregister_encoder(Decimal)
+
+
+def test_dump_async_interleaves() -> None:
+	# Other tasks get to run between blocks
+	events: List[str] = []
+
+	class EventWriter(RecordingWriter):
+
+		def write(self, data: bytes) -> None:
+			events.append("write")
+			super().write(data)
+
+	async def ticker() -> None:
+		for _ in range(5):
+			events.append("tick")
+			await asyncio.sleep(0)
+
+	async def main() -> None:
+		await asyncio.gather(sdjson.dump_async(payload, EventWriter(), chunk_size=1024), ticker())
+
+	run(main())
+
+	first_tick = events.index("tick")
+	assert first_tick < len(events) - 1
+	assert "write" in events[first_tick:]
+	assert events[-1] == "write"
+
+
+def test_dump_async_stream_writer() -> None:
+	received: List[bytes] = []
+
+	async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		received.append(await reader.read())
+		writer.close()
+
+	async def main() -> None:
+		server = await asyncio.start_server(handle, "127.0.0.1", 0)
+		port = server.sockets[0].getsockname()[1]
+		try:
+			reader, writer = await asyncio.open_connection("127.0.0.1", port)
+			await sdjson.dump_async(payload, writer, chunk_size=8192)
+			writer.write_eof()
+			await reader.read()
+			writer.close()
+		finally:
+			server.close()
+			await server.wait_closed()
+
+	run(main())
+
+	assert received == [sdjson.dumps(payload).encode("UTF-8")]
+
+
+def test_dump_async_circular() -> None:
+	obj: List[Any] = []
+	obj.append(obj)
+
+	with pytest.raises(ValueError, match="Circular reference detected"):
+		run(sdjson.dump_async(obj, RecordingWriter()))
@@ -0,0 +1,66 @@
+"""
+Test producing UTF-8 encoded output with ``sdjson.dumps_bytes`` and binary files
+"""
+
+# stdlib
+from decimal import Decimal
+from io import BytesIO
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+import sdjson
+
+data = {"name": "café ☃", "values": [1, 2.5, None], "emoji": "\U0001f600"}
+
+
+def test_dumps_bytes() -> None:
+	assert sdjson.dumps_bytes(data) == sdjson.dumps(data).encode("UTF-8")
+	assert sdjson.dumps_bytes(data) == b'{"name": "caf\\u00e9 \\u2603", "values": [1, 2.5, null], "emoji": "\\ud83d\\ude00"}'
+
+	assert sdjson.dumps_bytes(data, ensure_ascii=False) == sdjson.dumps(data, ensure_ascii=False).encode("UTF-8")
+	assert sdjson.dumps_bytes(data, ensure_ascii=False) == (
+			'{"name": "café ☃", "values": [1, 2.5, null], "emoji": "\U0001f600"}'.encode("UTF-8")
+			)
+
+	assert sdjson.dumps_bytes(data, indent=1, sort_keys=True) == sdjson.dumps(data, indent=1, sort_keys=True).encode()
+
+
+def test_dumps_bytes_custom_encoder() -> None:
+
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	assert sdjson.dumps_bytes([Decimal("1.5")]) == b'["1.5"]'
+
+	sdjson.encoders.unregister(Decimal)
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_dump_binary(ensure_ascii: bool, chunk_size: int) -> None:
+	fp = BytesIO()
+	sdjson.dump(data, fp, ensure_ascii=ensure_ascii, chunk_size=chunk_size)
+	assert fp.getvalue() == sdjson.dumps_bytes(data, ensure_ascii=ensure_ascii)
+
+
+def test_dump_binary_file(tmp_pathplus: PathPlus) -> None:
+	with open(tmp_pathplus / "output.json", "wb") as fp:
+		sdjson.dump(data, fp, ensure_ascii=False)
+
+	assert (tmp_pathplus / "output.json").read_bytes() == sdjson.dumps_bytes(data, ensure_ascii=False)
+
+	with open(tmp_pathplus / "output.json", "rb") as fp:
+		assert sdjson.load(fp) == data
+
+
+def test_dump_lines_binary() -> None:
+	fp = BytesIO()
+	sdjson.dump_lines([{"a": "☃"}, [1]], fp, ensure_ascii=False)
+	assert fp.getvalue() == '{"a": "☃"}\n[1]\n'.encode("UTF-8")
+
+	fp.seek(0)
+	assert list(sdjson.load_lines(fp)) == [{"a": "☃"}, [1]]
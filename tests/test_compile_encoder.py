@@ -0,0 +1,133 @@
+"""
+Test the generation of specialised encoders with ``sdjson.compile_encoder``
+"""
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+dataclasses = pytest.importorskip("dataclasses")
+
+
+@dataclasses.dataclass
+class Point:
+	x: int
+	y: int
+	label: str = "origin"
+
+
+class Slotted:
+	__slots__ = ("name", "__secret")
+
+	def __init__(self, name: str):
+		self.name = name
+		self.__secret = 42
+
+
+class SlottedChild(Slotted):
+	__slots__ = "extra"
+
+	def __init__(self, name: str):
+		super().__init__(name)
+		self.extra = [1, 2]
+
+
+class Plain:
+
+	def __init__(self):
+		self.value = 1
+
+
+def test_compile_dataclass() -> None:
+	plan = sdjson.compile_encoder(Point)
+	assert plan is not None
+	assert plan.__name__ == "encode_Point"
+	assert plan(Point(1, 2)) == {"x": 1, "y": 2, "label": "origin"}
+
+	assert sdjson.dumps([Point(1, 2), Point(3, 4, "far")]) == (
+			'[{"x": 1, "y": 2, "label": "origin"}, {"x": 3, "y": 4, "label": "far"}]'
+			)
+	assert sdjson.dumps({"p": Point(0, 0)}, sort_keys=True) == '{"p": {"label": "origin", "x": 0, "y": 0}}'
+
+	sdjson.unregister_encoder(Point)
+
+	with pytest.raises(TypeError, match="Object of type '?Point'? is not JSON serializable"):
+		sdjson.dumps(Point(1, 2))
+
+	with pytest.raises(KeyError):
+		sdjson.unregister_encoder(Point)
+
+
+def test_compile_slots() -> None:
+	assert sdjson.compile_encoder(Slotted) is not None
+	assert sdjson.compile_encoder(SlottedChild) is not None
+
+	assert sdjson.dumps(Slotted("spam")) == '{"name": "spam", "__secret": 42}'
+	assert sdjson.dumps(SlottedChild("eggs")) == '{"name": "eggs", "__secret": 42, "extra": [1, 2]}'
+
+	sdjson.unregister_encoder(Slotted)
+	sdjson.unregister_encoder(SlottedChild)
+
+
+def test_compile_attrs() -> None:
+	attr = pytest.importorskip("attr")
+
+	@attr.s(slots=True)
+	class Coordinates:
+		lat = attr.ib()
+		lon = attr.ib()
+
+	assert sdjson.compile_encoder(Coordinates) is not None
+	assert sdjson.dumps(Coordinates(51.5, -0.1)) == '{"lat": 51.5, "lon": -0.1}'
+
+	sdjson.unregister_encoder(Coordinates)
+
+
+def test_compile_subclass_not_matched() -> None:
+
+	@dataclasses.dataclass
+	class Point3D(Point):
+		z: int = 0
+
+	sdjson.compile_encoder(Point)
+
+	with pytest.raises(TypeError, match="Object of type '?Point3D'? is not JSON serializable"):
+		sdjson.dumps(Point3D(1, 2))
+
+	sdjson.unregister_encoder(Point)
+
+
+def test_compile_fallback_to_handler() -> None:
+
+	# Fields of a regular class aren't known until it is instantiated
+	assert sdjson.compile_encoder(Plain) is None
+
+	@sdjson.encoders.register(Plain)
+	def encode_plain(obj):
+		return vars(obj)
+
+	assert sdjson.compile_encoder(Plain) is None
+	assert sdjson.dumps(Plain()) == '{"value": 1}'
+
+	sdjson.unregister_encoder(Plain)
+
+
+def test_compile_precedence() -> None:
+
+	@sdjson.encoders.register(Point)
+	def encode_point(obj):
+		return [obj.x, obj.y]
+
+	assert sdjson.dumps(Point(1, 2)) == "[1, 2]"
+
+	sdjson.compile_encoder(Point)
+	assert sdjson.dumps(Point(1, 2)) == '{"x": 1, "y": 2, "label": "origin"}'
+
+	# Unregistering removes both the compiled encoder and the handler
+	sdjson.unregister_encoder(Point)
+	assert Point not in sdjson.encoders.registry
+
+	with pytest.raises(TypeError, match="Object of type '?Point'? is not JSON serializable"):
+		sdjson.dumps(Point(1, 2))
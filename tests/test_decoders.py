@@ -0,0 +1,103 @@
+"""
+Test registering custom decoders
+"""
+
+# stdlib
+import json
+from fractions import Fraction
+from io import StringIO
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class Point:
+
+	def __init__(self, x: int, y: int):
+		self.x = x
+		self.y = y
+
+	def __eq__(self, other) -> bool:  # noqa: MAN001
+		return isinstance(other, Point) and (self.x, self.y) == (other.x, other.y)
+
+
+def test_register_decoder() -> None:
+	text = '{"origin": {"__type__": "point", "x": 0, "y": 0}, "other": {"__type__": "unknown"}}'
+
+	assert sdjson.loads(text)["origin"] == {"__type__": "point", "x": 0, "y": 0}
+
+	@sdjson.register_decoder("point")
+	def decode_point(obj):
+		return Point(obj["x"], obj["y"])
+
+	assert sdjson.loads(text) == {"origin": Point(0, 0), "other": {"__type__": "unknown"}}
+	assert sdjson.load(StringIO(text))["origin"] == Point(0, 0)
+
+	sdjson.unregister_decoder("point")
+	assert sdjson.loads(text)["origin"] == {"__type__": "point", "x": 0, "y": 0}
+
+	with pytest.raises(KeyError):
+		sdjson.unregister_decoder("point")
+
+
+def test_round_trip() -> None:
+
+	@sdjson.register_encoder(Fraction)
+	def encode_fraction(obj):
+		return {"__type__": "fraction", "numerator": obj.numerator, "denominator": obj.denominator}
+
+	sdjson.register_decoder("fraction", lambda obj: Fraction(obj["numerator"], obj["denominator"]))
+
+	data = [Fraction(1, 3), {"half": Fraction(1, 2)}]
+	assert sdjson.loads(sdjson.dumps(data)) == data
+
+	sdjson.unregister_encoder(Fraction)
+	sdjson.unregister_decoder("fraction")
+
+
+def test_explicit_hooks_take_precedence() -> None:
+	sdjson.register_decoder("point", lambda obj: Point(obj["x"], obj["y"]))
+	text = '{"__type__": "point", "x": 1, "y": 2}'
+
+	assert sdjson.loads(text) == Point(1, 2)
+	assert sdjson.loads(text, object_hook=dict) == {"__type__": "point", "x": 1, "y": 2}
+	assert sdjson.loads(text, object_pairs_hook=list) == [("__type__", "point"), ("x", 1), ("y", 2)]
+	assert sdjson.loads(text, cls=json.JSONDecoder) == {"__type__": "point", "x": 1, "y": 2}
+
+	sdjson.unregister_decoder("point")
+
+
+def test_discriminator() -> None:
+	sdjson.register_decoder("point", lambda obj: Point(obj["x"], obj["y"]))
+
+	try:
+		sdjson.set_decoder_discriminator("kind")
+		assert sdjson.loads('{"kind": "point", "x": 1, "y": 2}') == Point(1, 2)
+		assert sdjson.loads('{"__type__": "point", "x": 1, "y": 2}') == {"__type__": "point", "x": 1, "y": 2}
+
+		sdjson.set_decoder_discriminator(lambda obj: "point" if obj.keys() == {"x", "y"} else None)
+		assert sdjson.loads('[{"x": 1, "y": 2}, {"x": 3}]') == [Point(1, 2), {"x": 3}]
+
+		# Unhashable tags are ignored
+		sdjson.set_decoder_discriminator("kind")
+		assert sdjson.loads('{"kind": ["point"]}') == {"kind": ["point"]}
+
+	finally:
+		sdjson.set_decoder_discriminator("__type__")
+		sdjson.unregister_decoder("point")
+
+
+def test_class_tags() -> None:
+	# Classes can be used as type tags, and are not confused with constructors for ``into``.
+	sdjson.register_decoder(Point, lambda obj: Point(obj["x"], obj["y"]))
+
+	try:
+		sdjson.set_decoder_discriminator(lambda obj: Point if obj.keys() == {"x", "y"} else None)
+		assert sdjson.loads('[{"x": 1, "y": 2}, {"x": 3}]') == [Point(1, 2), {"x": 3}]
+		assert Point not in sdjson.decoders.constructors
+	finally:
+		sdjson.set_decoder_discriminator("__type__")
+		sdjson.unregister_decoder(Point)
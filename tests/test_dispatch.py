@@ -0,0 +1,129 @@
+"""
+Test the precomputed type to handler table used by ``sdjson.encoders.dispatch``
+"""
+
+# stdlib
+import gc
+import sys
+import timeit
+import weakref
+from abc import ABC
+from decimal import Decimal
+from functools import singledispatch
+from typing import Any, Callable, Dict, Optional
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+def test_object_not_registered() -> None:
+	assert object not in sdjson.encoders.registry
+	assert sdjson.encoders.dispatch(object()) is None
+
+
+def test_dispatch_table() -> None:
+	registry = sdjson.Registry()
+
+	@registry.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	assert registry.dispatch(Decimal(1)) is encode_decimal_str
+	assert registry._dispatch_table[Decimal] is encode_decimal_str
+
+	registry.unregister(Decimal)
+	assert Decimal not in registry._dispatch_table
+	assert registry.dispatch(Decimal(1)) is None
+
+
+def test_dispatch_abc_virtual_subclass() -> None:
+
+	class Base(ABC):
+		pass
+
+	class Virtual:
+		pass
+
+	@sdjson.encoders.register(Base)
+	def encode_base(obj):
+		return "base"
+
+	assert sdjson.encoders.dispatch(Virtual()) is None
+
+	# Registering a virtual subclass invalidates the table
+	Base.register(Virtual)
+	assert sdjson.encoders.dispatch(Virtual()) is encode_base
+	assert sdjson.dumps(Virtual()) == '"base"'
+
+	sdjson.encoders.unregister(Base)
+
+
+class _LegacyEncoders:
+	"""
+	The dispatch implementation prior to the precomputed table, for comparison.
+	"""
+
+	def __init__(self):
+		self._registry = sdjson.allow_unregister(singledispatch(lambda x: None))
+		self._protocol_registry: Dict[Any, Callable] = {}
+		self.registry = self._registry.registry
+
+	def dispatch(self, cls: object) -> Optional[Callable]:
+		if object in self.registry:
+			self._registry.unregister(object)
+
+		handler = self._registry.dispatch(type(cls))
+		if handler is not None:
+			return handler
+		else:
+			for protocol, handler in self._protocol_registry.items():
+				if isinstance(cls, protocol):
+					return handler
+
+		return None
+
+
+def test_dispatch_overhead() -> None:
+	if sys.gettrace() is not None:
+		# e.g. coverage, which slows down the Python code being compared by different amounts.
+		pytest.skip("Timings are unreliable while tracing.")
+
+	legacy = _LegacyEncoders()
+	legacy._registry.register(Decimal, str)
+
+	sdjson.encoders.register(Decimal, str)
+	value = Decimal("1.5")
+
+	try:
+		legacy_time = min(timeit.repeat(lambda: legacy.dispatch(value), number=20000, repeat=5))
+		new_time = min(timeit.repeat(lambda: sdjson.encoders.dispatch(value), number=20000, repeat=5))
+	finally:
+		sdjson.encoders.unregister(Decimal)
+
+	assert new_time < 0.6 * legacy_time
+
+
+def test_dispatch_table_bounded() -> None:
+	# Classes created at runtime are not kept alive indefinitely by the table.
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+
+	class Temporary:
+		pass
+
+	assert registry.dispatch(Temporary()) is None
+	assert Temporary in registry._dispatch_table
+
+	ref = weakref.ref(Temporary)
+	del Temporary
+
+	for _ in range(sdjson._MAX_DISPATCH_TABLE_SIZE):
+		registry.dispatch(type("Filler", (), {})())
+
+	gc.collect()
+	assert ref() is None
+	assert len(registry._dispatch_table) <= sdjson._MAX_DISPATCH_TABLE_SIZE
+	assert registry.dispatch(Decimal(1)) is str
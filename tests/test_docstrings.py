@@ -0,0 +1,65 @@
+"""
+Test the docstrings copied from the json module
+"""
+
+# stdlib
+import json
+import subprocess
+import sys
+
+# 3rd party
+from domdf_python_tools.doctools import append_docstring_from
+
+# this package
+import sdjson
+
+
+def test_append_docstring_from() -> None:
+
+	def target_a() -> None:
+		"""
+		Serialize custom Python classes to JSON.
+
+			Indented text.
+		"""
+
+	def target_b() -> None:
+		"""
+		Serialize custom Python classes to JSON.
+
+			Indented text.
+		"""
+
+	def undocumented_a() -> None:
+		pass
+
+	def undocumented_b() -> None:
+		pass
+
+	for original in (json.dumps, json.JSONEncoder, json.JSONDecoder.decode):
+		assert sdjson._append_docstring_from(original)(target_a).__doc__ == \
+			append_docstring_from(original)(target_b).__doc__
+		assert sdjson._append_docstring_from(original)(undocumented_a).__doc__ == \
+			append_docstring_from(original)(undocumented_b).__doc__
+
+
+def test_docstrings() -> None:
+	assert sdjson.dumps.__doc__.startswith("Serialize custom Python classes to JSON.\n")
+	assert "Serialize ``obj`` to a JSON formatted ``str``." in sdjson.dumps.__doc__
+	assert "``JSONEncoder``" in sdjson.dumps.__doc__
+	assert sdjson.JSONEncoder.default.__doc__ == json.JSONEncoder.default.__doc__
+
+
+def test_docstrings_sphinx() -> None:
+	# Links are only added when building the documentation.
+	script = "\n".join([
+			"import sys, types",
+			"sys.modules['sphinx'] = types.ModuleType('sphinx')",
+			"import sdjson",
+			"print(sdjson.dumps.__doc__)",
+			])
+	doc = subprocess.check_output([sys.executable, "-c", script], universal_newlines=True)
+
+	assert "Serialize ``obj`` to a JSON formatted :class:`str`." in doc
+	assert ":class:`~json.JSONEncoder`" in doc
+	assert "``JSONEncoder``" not in doc
@@ -0,0 +1,76 @@
+"""
+Test the buffered, streaming behaviour of :func:`sdjson.dump`
+"""
+
+# stdlib
+from decimal import Decimal
+from io import StringIO
+from typing import List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class CountingStringIO(StringIO):
+
+	def __init__(self):
+		super().__init__()
+		self.writes: List[str] = []
+
+	def write(self, s: str) -> int:
+		self.writes.append(s)
+		return super().write(s)
+
+
+def test_dump_matches_dumps() -> None:
+	data = {"key": ["value", 1, 2.5, None, True], "nested": {"a": [{"b": "c"}] * 10}}
+
+	fp = CountingStringIO()
+	sdjson.dump(data, fp)
+	assert fp.getvalue() == sdjson.dumps(data)
+
+	fp = CountingStringIO()
+	sdjson.dump(data, fp, indent=2, sort_keys=True)
+	assert fp.getvalue() == sdjson.dumps(data, indent=2, sort_keys=True)
+
+
+def test_dump_single_write() -> None:
+	fp = CountingStringIO()
+	sdjson.dump({"key": "value", "list": list(range(100))}, fp)
+	assert len(fp.writes) == 1
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 1024])
+def test_dump_chunk_size(chunk_size: int) -> None:
+	data = [{"index": i, "name": f"item {i}"} for i in range(200)]
+
+	fp = CountingStringIO()
+	sdjson.dump(data, fp, chunk_size=chunk_size)
+	assert fp.getvalue() == sdjson.dumps(data)
+
+	# Every write except the last is at least chunk_size characters
+	assert all(len(chunk) >= chunk_size for chunk in fp.writes[:-1])
+	assert len(fp.writes) <= len(fp.getvalue()) // chunk_size + 1
+
+
+def test_dump_custom_encoder() -> None:
+
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	fp = CountingStringIO()
+	sdjson.dump({"price": Decimal("12.34")}, fp, chunk_size=4)
+	assert fp.getvalue() == '{"price": "12.34"}'
+
+	# Cleanup
+	sdjson.encoders.unregister(Decimal)
+
+
+def test_dump_empty_chunks() -> None:
+	fp = CountingStringIO()
+	sdjson.dump([], fp)
+	assert fp.writes == ["[]"]
@@ -0,0 +1,81 @@
+"""
+Test the reuse of encoders for non-default keyword arguments to :func:`sdjson.dumps`
+"""
+
+# stdlib
+from decimal import Decimal
+
+# this package
+import sdjson
+
+
+def test_encoder_cache_hits() -> None:
+	sdjson.clear_encoder_cache()
+
+	assert sdjson.dumps({"a": [1, 2]}, separators=(",", ":")) == '{"a":[1,2]}'
+	assert sdjson.encoder_cache_info().misses == 1
+	assert sdjson.encoder_cache_info().hits == 0
+
+	for _ in range(10):
+		assert sdjson.dumps({"a": [1, 2]}, separators=(",", ":")) == '{"a":[1,2]}'
+
+	assert sdjson.encoder_cache_info().misses == 1
+	assert sdjson.encoder_cache_info().hits == 10
+	assert sdjson.encoder_cache_info().currsize == 1
+
+	sdjson.clear_encoder_cache()
+	assert sdjson.encoder_cache_info().currsize == 0
+
+
+def test_encoder_cache_default_arguments() -> None:
+	sdjson.clear_encoder_cache()
+
+	# The all-defaults encoder is not part of the cache
+	sdjson.dumps([1, 2, 3])
+	assert sdjson.encoder_cache_info().misses == 0
+	assert sdjson.encoder_cache_info().hits == 0
+
+
+def test_encoder_cache_distinct_options() -> None:
+	sdjson.clear_encoder_cache()
+	data = {"b": 1, "a": [1, 2]}
+
+	assert sdjson.dumps(data, sort_keys=True) == '{"a": [1, 2], "b": 1}'
+	assert sdjson.dumps(data, indent=2) == '{\n  "b": 1,\n  "a": [\n    1,\n    2\n  ]\n}'
+	assert sdjson.dumps(data, cls=sdjson.JSONEncoder, sort_keys=True) == '{"a": [1, 2], "b": 1}'
+	assert sdjson.encoder_cache_info().misses == 3
+
+	# A list of separators is equivalent to the tuple
+	assert sdjson.dumps(data, separators=[",", ":"]) == '{"b":1,"a":[1,2]}'
+	assert sdjson.dumps(data, separators=(",", ":")) == '{"b":1,"a":[1,2]}'
+	assert sdjson.encoder_cache_info().hits == 1
+
+
+def test_encoder_cache_custom_encoders() -> None:
+	sdjson.clear_encoder_cache()
+
+	assert sdjson.dumps([1], sort_keys=True) == "[1]"
+
+	# Registering a handler after the encoder was cached still takes effect
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	assert sdjson.dumps([Decimal("1.5")], sort_keys=True) == '["1.5"]'
+	assert sdjson.encoder_cache_info().hits == 1
+
+	# Cleanup
+	sdjson.encoders.unregister(Decimal)
+
+
+def test_encoder_cache_unhashable_arguments() -> None:
+	sdjson.clear_encoder_cache()
+
+	class Encoder(sdjson.JSONEncoder):
+
+		def __init__(self, *args, extra, **kwargs):
+			super().__init__(*args, **kwargs)
+			self.extra = extra
+
+	assert sdjson.dumps([1], cls=Encoder, extra=[]) == "[1]"
+	assert sdjson.encoder_cache_info().misses == 0
@@ -0,0 +1,94 @@
+"""
+Test the built-in encoders for dataclasses and attrs classes
+"""
+
+# stdlib
+from decimal import Decimal
+from typing import Any, List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+dataclasses = pytest.importorskip("dataclasses")
+
+
+@dataclasses.dataclass
+class Price:
+	amount: Decimal
+	currency: str = "GBP"
+
+
+@dataclasses.dataclass
+class Basket:
+	items: List[Any]
+	total: Price
+
+
+def test_field_encoders() -> None:
+	basket = Basket([Price(Decimal("1.50")), Price(Decimal("2.00"), "EUR")], Price(Decimal("3.50")))
+
+	with pytest.raises(TypeError, match="Object of type '?Basket'? is not JSON serializable"):
+		sdjson.dumps(basket)
+
+	sdjson.register_field_encoders()
+
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	assert sdjson.dumps(basket) == (
+			'{"items": [{"amount": "1.50", "currency": "GBP"}, {"amount": "2.00", "currency": "EUR"}], '
+			'"total": {"amount": "3.50", "currency": "GBP"}}'
+			)
+
+	# Concrete handlers take precedence
+	@sdjson.encoders.register(Price)
+	def encode_price(obj):
+		return f"{obj.amount} {obj.currency}"
+
+	assert sdjson.dumps(basket) == '{"items": ["1.50 GBP", "2.00 EUR"], "total": "3.50 GBP"}'
+
+	sdjson.unregister_encoder(Price)
+	sdjson.unregister_encoder(Decimal)
+	sdjson.unregister_encoder(sdjson.DataclassInstance)
+	sdjson.unregister_encoder(sdjson.AttrsInstance)
+
+	with pytest.raises(TypeError, match="Object of type '?Basket'? is not JSON serializable"):
+		sdjson.dumps(basket)
+
+
+def test_encode_fields_shallow() -> None:
+	items = [1, 2, 3]
+	basket = Basket(items, Price(Decimal(6)))
+
+	fields = sdjson.encode_fields(basket)
+	assert fields == {"items": items, "total": basket.total}
+	assert fields["items"] is items
+	assert fields["total"] is basket.total
+
+
+def test_encode_fields_attrs() -> None:
+	attr = pytest.importorskip("attr")
+
+	@attr.s
+	class Coordinates:
+		lat = attr.ib()
+		lon = attr.ib()
+
+	sdjson.register_field_encoders()
+	assert sdjson.dumps([Coordinates(51.5, -0.1)]) == '[{"lat": 51.5, "lon": -0.1}]'
+
+	sdjson.unregister_encoder(sdjson.DataclassInstance)
+	sdjson.unregister_encoder(sdjson.AttrsInstance)
+
+
+def test_encode_fields_unknown() -> None:
+
+	class Plain:
+		pass
+
+	with pytest.raises(TypeError, match="Object of type '?Plain'? is not JSON serializable"):
+		sdjson.encode_fields(Plain())
@@ -0,0 +1,153 @@
+"""
+Test controlling the formatting of floats with float_precision and float_format
+"""
+
+# stdlib
+import math
+from decimal import Decimal
+from io import StringIO
+from typing import Any, Dict, Iterator, List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class Distance(float):
+	pass
+
+
+@pytest.fixture()
+def decimal_as_float() -> Iterator[None]:
+	sdjson.register_encoder(Decimal, float)
+	yield
+	sdjson.unregister_encoder(Decimal)
+
+
+data: Dict[Any, Any] = {
+		"values": [1.23456789, 2.0, 123456.789, 1e20, 0.1 + 0.2],
+		"pair": (math.pi, -math.e),
+		"nested": {"x": [{"y": 1 / 3}]},
+		"subclass": Distance(1.23456),
+		"others": ["text", 1, True, None],
+		}
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 2}, {"sort_keys": True, "separators": (",", ":")}])
+def test_float_precision(kwargs: Dict[str, Any]) -> None:
+	expected = {
+			"values": [1.235, 2.0, 123456.789, 1e20, 0.3],
+			"pair": [3.142, -2.718],
+			"nested": {"x": [{"y": 0.333}]},
+			"subclass": 1.235,
+			"others": ["text", 1, True, None],
+			}
+	assert sdjson.dumps(data, float_precision=3, **kwargs) == sdjson.dumps(expected, **kwargs)
+
+	# dump() uses the pure-Python encoder, and should give the same result
+	fp = StringIO()
+	sdjson.dump(data, fp, float_precision=3, **kwargs)
+	assert fp.getvalue() == sdjson.dumps(expected, **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 2}])
+def test_float_keys(kwargs: Dict[str, Any]) -> None:
+	expected = sdjson.dumps({"0.123": 1, "2.0": 2}, **kwargs)
+	assert sdjson.dumps({0.123456: 1, 2.0: 2}, float_precision=3, **kwargs) == expected
+	assert sdjson.dumps({0.123456: 1, 2.0: 2}, float_format=".3g", **kwargs) == expected.replace("2.0", "2")
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 2}, {"sort_keys": True}])
+def test_float_keys_equal_once_rounded(kwargs: Dict[str, Any]) -> None:
+	# Neither key is lost, and dumps() and dump() give the same result.
+	registry = sdjson.Registry()
+	registry.register(Decimal, lambda obj: {float(obj): "handler", 0.001: "other"})
+
+	for data in [{0.001: "a", 0.004: "b"}, [Decimal("0.004")]]:
+		text = sdjson.dumps(data, float_precision=2, registry=registry, **kwargs)
+		assert text.count('"0.0": ') == 2
+
+		fp = StringIO()
+		sdjson.dump(data, fp, float_precision=2, registry=registry, **kwargs)
+		assert fp.getvalue() == text
+
+
+def test_float_precision_zero_and_negative() -> None:
+	assert sdjson.dumps([1.5, 2.5, 1234.5678], float_precision=0) == "[2.0, 2.0, 1235.0]"
+	assert sdjson.dumps([1234.5678], float_precision=-2) == "[1200.0]"
+
+
+def test_float_precision_shrinks_output() -> None:
+	telemetry = [{"lat": 51.50722 + i / 7, "lon": -0.1275 - i / 11, "temp": 15 + i / 13} for i in range(100)]
+	assert len(sdjson.dumps(telemetry, float_precision=4)) < len(sdjson.dumps(telemetry)) * 0.75
+	assert sdjson.loads(sdjson.dumps(telemetry, float_precision=4))[1]["temp"] == 15.0769
+
+
+def test_float_precision_handler_results(decimal_as_float: None) -> None:
+	# The values returned by handlers are encoded by the C encoder too
+	assert sdjson.dumps(Decimal("1.23456"), float_precision=2) == "1.23"
+	assert sdjson.dumps({"price": [Decimal("9.87654")]}, float_precision=2) == '{"price": [9.88]}'
+	assert sdjson.dumps({"price": [Decimal("9.87654")]}, float_precision=2, indent=1) == \
+		'{\n "price": [\n  9.88\n ]\n}'
+
+
+@pytest.mark.parametrize(
+		"float_format, expected",
+		[
+				pytest.param(".3g", "[1.23, 2, 1.23e+05, 1e+20, 0.3]", id="spec"),
+				pytest.param(".2f", "[1.23, 2.00, 123456.79, 100000000000000000000.00, 0.30]", id="fixed"),
+				pytest.param(lambda f: f"{f:.1e}", "[1.2e+00, 2.0e+00, 1.2e+05, 1.0e+20, 3.0e-01]", id="callable"),
+				]
+		)
+def test_float_format(float_format: Any, expected: str) -> None:
+	values = data["values"]
+	assert sdjson.dumps(values, float_format=float_format) == expected
+
+	fp = StringIO()
+	sdjson.dump(values, fp, float_format=float_format)
+	assert fp.getvalue() == expected
+
+
+def test_float_format_handler_results(decimal_as_float: None) -> None:
+	assert sdjson.dumps([Decimal("1.23456")], float_format=".3f") == "[1.235]"
+
+
+@pytest.mark.parametrize("kwargs", [{"float_precision": 2}, {"float_format": ".2f"}])
+def test_non_finite(kwargs: Dict[str, Any]) -> None:
+	assert sdjson.dumps([math.nan, math.inf, -math.inf], **kwargs) == "[NaN, Infinity, -Infinity]"
+
+	with pytest.raises(ValueError, match="Out of range float values are not JSON compliant"):
+		sdjson.dumps([math.nan], allow_nan=False, **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{"float_precision": 2}, {"float_format": ".2f"}])
+def test_circular(kwargs: Dict[str, Any]) -> None:
+	obj: List[Any] = [1.5]
+	obj.append(obj)
+
+	with pytest.raises(ValueError, match="Circular reference detected"):
+		sdjson.dumps(obj, **kwargs)
+
+
+def test_float_precision_and_format() -> None:
+	with pytest.raises(ValueError, match="'float_precision' and 'float_format' cannot both be given."):
+		sdjson.dumps(1.5, float_precision=2, float_format=".2f")
+
+
+def test_float_precision_does_not_modify_input() -> None:
+	values = [1.23456, {"x": 2.34567}]
+	sdjson.dumps(values, float_precision=1)
+	assert values == [1.23456, {"x": 2.34567}]
+
+
+def test_intercept_subclasses() -> None:
+	sdjson.register_encoder(Distance, lambda obj: f"{obj:.1f}km")
+
+	try:
+		kwargs: Dict[str, Any] = {"intercept_subclasses": True}
+		assert sdjson.dumps([1.23456, Distance(2.25)], float_precision=2, **kwargs) == '[1.23, "2.2km"]'
+		assert sdjson.dumps([1.23456, Distance(2.25)], float_format=".1f", **kwargs) == '[1.2, "2.2km"]'
+	finally:
+		sdjson.unregister_encoder(Distance)
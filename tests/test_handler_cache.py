@@ -0,0 +1,191 @@
+"""
+Test caching the results of registered handlers
+"""
+
+# stdlib
+from abc import abstractmethod
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Dict, List
+
+# 3rd party
+import pytest
+from typing_extensions import Protocol, runtime_checkable
+
+# this package
+import sdjson
+
+
+class Colour:
+
+	def __init__(self, name: str, rgb: str):
+		self.name = name
+		self.rgb = rgb
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, Colour) and (other.name, other.rgb) == (self.name, self.rgb)
+
+	def __hash__(self) -> int:
+		return hash((self.name, self.rgb))
+
+
+class Palette:
+	"""
+	An unhashable value.
+	"""
+
+	__hash__ = None  # type: ignore[assignment]
+
+	def __init__(self, colours: List[Colour]):
+		self.colours = colours
+
+
+@runtime_checkable
+class SupportsToJson(Protocol):
+
+	@abstractmethod
+	def to_json(self) -> Any:
+		pass
+
+
+class Widget:
+
+	def to_json(self) -> Any:
+		return "widget"
+
+
+def test_cache() -> None:
+	registry = sdjson.Registry()
+	calls: List[Colour] = []
+
+	@registry.register(Colour, cache=True, maxsize=2)
+	def encode_colour(obj: Colour) -> Dict[str, str]:
+		calls.append(obj)
+		return {"name": obj.name, "rgb": obj.rgb}
+
+	assert encode_colour.__name__ == "encode_colour"
+
+	red, green, blue = Colour("red", "#f00"), Colour("green", "#0f0"), Colour("blue", "#00f")
+	data = [red, green, red, Colour("red", "#f00"), green]
+
+	assert sdjson.dumps(data, registry=registry) == sdjson.dumps([
+			{"name": "red", "rgb": "#f00"},
+			{"name": "green", "rgb": "#0f0"},
+			{"name": "red", "rgb": "#f00"},
+			{"name": "red", "rgb": "#f00"},
+			{"name": "green", "rgb": "#0f0"},
+			])
+	assert calls == [red, green]
+
+	info = registry.cache_info(Colour)
+	assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 2, 2, 2)
+
+	# The least recently used result is discarded
+	sdjson.dumps([blue, green], registry=registry)
+	sdjson.dumps(red, registry=registry)
+	assert calls == [red, green, blue, red]
+
+	registry.cache_clear(Colour)
+	assert registry.cache_info(Colour).currsize == 0
+	sdjson.dumps(green, registry=registry)
+	assert calls[-1] is green
+
+
+def test_unhashable() -> None:
+	registry = sdjson.Registry()
+	registry.register(Palette, lambda obj: [c.name for c in obj.colours], cache=True)
+
+	palette = Palette([Colour("red", "#f00")])
+	assert sdjson.dumps([palette, palette], registry=registry) == '[["red"], ["red"]]'
+	assert registry.cache_info(Palette).misses == 0
+
+	def broken(obj: Colour) -> Any:
+		raise TypeError("broken handler")
+
+	registry.register(Colour, broken, cache=True)
+
+	with pytest.raises(TypeError, match="broken handler"):
+		sdjson.dumps(Colour("red", "#f00"), registry=registry)
+
+
+def test_equal_values_kept_apart() -> None:
+	# Equal values which are serialized differently do not share a result
+	registry = sdjson.Registry()
+	registry.register(Decimal, str, cache=True)
+
+	data = [Decimal("1.5"), Decimal("1.50"), Decimal("1.5")]
+	assert sdjson.dumps(data, registry=registry) == '["1.5", "1.50", "1.5"]'
+	assert registry.cache_info(Decimal).hits == 1
+
+	# Unless the key says otherwise
+	registry.register(Decimal, lambda obj: str(obj.normalize()), cache=True, key=lambda obj: obj)
+	assert sdjson.dumps(data, registry=registry) == '["1.5", "1.5", "1.5"]'
+	assert registry.cache_info(Decimal).hits == 2
+
+
+def test_key() -> None:
+	registry = sdjson.Registry()
+	calls: List[Palette] = []
+
+	def encode_palette(obj: Palette) -> List[str]:
+		calls.append(obj)
+		return [c.name for c in obj.colours]
+
+	# The key makes an unhashable value cacheable
+	registry.register(Palette, encode_palette, cache=True, key=lambda obj: tuple(obj.colours))
+
+	palette = Palette([Colour("red", "#f00")])
+	assert sdjson.dumps([palette, Palette([Colour("red", "#f00")])], registry=registry) == '[["red"], ["red"]]'
+	assert calls == [palette]
+
+
+def test_protocol() -> None:
+	registry = sdjson.Registry()
+	registry.register(SupportsToJson, lambda obj: obj.to_json(), cache=True, maxsize=None)
+
+	widget = Widget()
+	assert sdjson.dumps([widget] * 3, registry=registry) == '["widget", "widget", "widget"]'
+	assert registry.cache_info(SupportsToJson).hits == 2
+	assert registry.cache_info(SupportsToJson).maxsize is None
+
+
+def test_cache_clear_all() -> None:
+	registry = sdjson.Registry()
+	registry.register(Colour, lambda obj: obj.name, cache=True)
+	registry.register(Fraction, str, cache=True)
+	registry.register(complex, str)
+
+	sdjson.dumps([Colour("red", "#f00"), Fraction(1, 2), 1j], registry=registry)
+	registry.cache_clear()
+
+	assert registry.cache_info(Colour).currsize == 0
+	assert registry.cache_info(Fraction).currsize == 0
+
+	with pytest.raises(KeyError):
+		registry.cache_info(complex)
+
+	with pytest.raises(KeyError):
+		registry.cache_clear(complex)
+
+
+def test_default_registry() -> None:
+	sdjson.register_encoder(Colour, lambda obj: obj.rgb, cache=True)
+
+	try:
+		assert sdjson.dumps([Colour("red", "#f00")] * 2) == '["#f00", "#f00"]'
+		assert sdjson.encoders.cache_info(Colour).hits == 1
+	finally:
+		sdjson.unregister_encoder(Colour)
+
+	with pytest.raises(KeyError):
+		sdjson.encoders.cache_info(Colour)
+
+
+def test_stats() -> None:
+	registry = sdjson.Registry()
+	registry.register(Colour, lambda obj: obj.name, cache=True)
+	registry.enable_stats()
+
+	sdjson.dumps([Colour("red", "#f00")] * 4, registry=registry)
+	assert registry.stats()[Colour].calls == 4
+	assert registry.cache_info(Colour).hits == 3
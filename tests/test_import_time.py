@@ -0,0 +1,80 @@
+"""
+Test the modules imported by ``import sdjson``, and the time it takes.
+"""
+
+# stdlib
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# 3rd party
+import pytest
+from coincidence.selectors import min_version, not_pypy
+
+pytestmark = min_version("3.7", reason="-X importtime was added in Python 3.7")
+
+# Modules which are only needed by particular functions, or only when building the documentation.
+DEFERRED_MODULES = [
+		"asyncio",
+		"concurrent.futures",
+		"dataclasses",
+		"decimal",
+		"domdf_python_tools",
+		"inspect",
+		"multiprocessing",
+		"numpy",
+		]
+
+
+def import_times(statement: str) -> Dict[str, Tuple[int, int]]:
+	"""
+	Returns the self and cumulative import times, in microseconds,
+	of each module imported by ``statement`` in a new interpreter.
+	"""
+
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", statement],
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	times = {}
+	for line in process.stderr.splitlines():
+		if not line.startswith("import time:") or "self [us]" in line:
+			continue
+		self_time, cumulative, name = line[len("import time:"):].split("|")
+		times[name.strip()] = (int(self_time), int(cumulative))
+
+	return times
+
+
+def test_import_graph() -> None:
+	times = import_times("import sdjson")
+	assert "sdjson" in times
+
+	for module in DEFERRED_MODULES:
+		assert module not in times, f"{module} should not be imported by 'import sdjson'"
+
+
+@pytest.mark.parametrize(
+		"statement, module",
+		[
+				pytest.param("import asyncio, sdjson; sdjson.dump_async", "asyncio", id="dump_async"),
+				pytest.param("import sdjson; sdjson.dumps_parallel([1, 2], workers=2)", "multiprocessing", id="parallel"),
+				]
+		)
+def test_deferred_imports(statement: str, module: str) -> None:
+	assert module in import_times(statement)
+
+
+@not_pypy("Import times on PyPy are dominated by the JIT")
+def test_import_time() -> None:
+	# Best of three, in microseconds
+	sdjson_time = min(import_times("import sdjson")["sdjson"][1] for _ in range(3))
+	json_time = min(import_times("import json")["json"][1] for _ in range(3))
+
+	print(f"import json: {json_time / 1000:.1f} ms, import sdjson: {sdjson_time / 1000:.1f} ms")
+
+	# Importing asyncio and domdf_python_tools alone added over 100ms.
+	assert sdjson_time - json_time < 100_000
@@ -0,0 +1,175 @@
+"""
+Test dispatching on subclasses of the types the json module serializes natively
+"""
+
+# stdlib
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from decimal import Decimal
+from enum import IntEnum
+from io import StringIO
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class Colour(IntEnum):
+	RED = 1
+	GREEN = 2
+
+
+class Secret(str):
+	pass
+
+
+class Record(OrderedDict):
+	pass
+
+
+Point = namedtuple("Point", "x, y")
+
+
+def test_not_intercepted_by_default() -> None:
+
+	@sdjson.encoders.register(Colour)
+	def encode_colour(obj):
+		return obj.name
+
+	assert sdjson.dumps([Colour.RED]) == "[1]"
+	assert sdjson.dumps([Colour.RED], intercept_subclasses=True) == '["RED"]'
+
+	sdjson.unregister_encoder(Colour)
+	assert sdjson.dumps([Colour.RED], intercept_subclasses=True) == "[1]"
+
+
+def test_intercept_subclasses() -> None:
+
+	@sdjson.encoders.register(Colour)
+	def encode_colour(obj):
+		return obj.name
+
+	@sdjson.encoders.register(Secret)
+	def encode_secret(obj):
+		return "*" * len(obj)
+
+	@sdjson.encoders.register(Record)
+	def encode_record(obj):
+		return {"record": dict(obj)}
+
+	sdjson.register_encoder(Point, sdjson.encode_fields)
+
+	data = {
+			"colour": Colour.GREEN,
+			"password": Secret("hunter2"),
+			"values": [Record(a=1), (Colour.RED, "plain"), Point(1, 2)],
+			"unchanged": [1, 2.5, "three", None, True],
+			}
+
+	assert sdjson.dumps(data, intercept_subclasses=True) == (
+			'{"colour": "GREEN", "password": "*******", '
+			'"values": [{"record": {"a": 1}}, ["RED", "plain"], {"x": 1, "y": 2}], '
+			'"unchanged": [1, 2.5, "three", null, true]}'
+			)
+
+	# Top-level values
+	assert sdjson.dumps(Secret("abc"), intercept_subclasses=True) == '"***"'
+	assert sdjson.dumps(Colour.RED, intercept_subclasses=True) == '"RED"'
+
+	# Streaming
+	fp = StringIO()
+	sdjson.dump(data, fp, intercept_subclasses=True, indent=2)
+	assert fp.getvalue() == sdjson.dumps(data, intercept_subclasses=True, indent=2)
+
+	# The original data is not modified
+	assert data["colour"] is Colour.GREEN
+	assert isinstance(data["values"][0], Record)
+
+	sdjson.unregister_encoder(Colour)
+	sdjson.unregister_encoder(Secret)
+	sdjson.unregister_encoder(Record)
+	sdjson.unregister_encoder(Point)
+
+
+def test_unchanged_containers_not_copied() -> None:
+
+	@sdjson.encoders.register(Colour)
+	def encode_colour(obj):
+		return obj.name
+
+	encoder = sdjson._CustomEncoder(intercept_subclasses=True)
+	unchanged = [1, 2, {"a": "b"}]
+	data = {"unchanged": unchanged, "changed": [Colour.RED]}
+
+	result = encoder._intercept(data)
+	assert result == {"unchanged": unchanged, "changed": ["RED"]}
+	assert result["unchanged"] is unchanged
+	assert encoder._intercept(unchanged) is unchanged
+
+	sdjson.unregister_encoder(Colour)
+
+
+def test_intercept_handler_results() -> None:
+
+	@sdjson.encoders.register(Colour)
+	def encode_colour(obj):
+		return obj.name
+
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal(obj):
+		return [str(obj), Colour.RED]
+
+	assert sdjson.dumps(Decimal("1.5"), intercept_subclasses=True) == '["1.5", "RED"]'
+
+	sdjson.unregister_encoder(Colour)
+	sdjson.unregister_encoder(Decimal)
+
+
+def test_intercept_circular() -> None:
+
+	@sdjson.encoders.register(Colour)
+	def encode_colour(obj):
+		return obj.name
+
+	data = [Colour.RED]
+	data.append(data)
+
+	with pytest.raises(ValueError, match="Circular reference detected"):
+		sdjson.dumps(data, intercept_subclasses=True)
+
+	sdjson.unregister_encoder(Colour)
+
+
+def test_intercepted_types() -> None:
+	assert sdjson.encoders._intercepted == frozenset()
+
+	sdjson.register_encoder(Decimal, str)
+	sdjson.register_encoder(Colour, str)
+	assert sdjson.encoders._intercepted == {Colour}
+
+	sdjson.unregister_encoder(Decimal)
+	sdjson.unregister_encoder(Colour)
+	assert sdjson.encoders._intercepted == frozenset()
+
+
+def test_abc_handlers_not_intercepted() -> None:
+	# A handler for an ABC does not intercept native subclasses,
+	# whether or not an unrelated subclass is registered.
+	sdjson.register_encoder(Mapping, lambda obj: "mapping!")
+
+	try:
+		assert sdjson.dumps([Colour.RED, OrderedDict(a=1)], intercept_subclasses=True) == '[1, {"a": 1}]'
+
+		sdjson.register_encoder(Colour, lambda obj: obj.name)
+		assert sdjson.dumps([Colour.RED, OrderedDict(a=1)], intercept_subclasses=True) == '["RED", {"a": 1}]'
+
+		# Subclasses of registered subclasses are intercepted
+		assert sdjson.dumps([Record(a=1)], intercept_subclasses=True) == '[{"a": 1}]'
+		sdjson.register_encoder(OrderedDict, lambda obj: "ordered!")
+		assert sdjson.dumps([Record(a=1)], intercept_subclasses=True) == '["ordered!"]'
+	finally:
+		sdjson.unregister_encoder(Mapping)
+		sdjson.unregister_encoder(Colour)
+		sdjson.unregister_encoder(OrderedDict)
@@ -0,0 +1,109 @@
+"""
+Test incrementally loading JSON documents with ``sdjson.iterload``
+"""
+
+# stdlib
+import json
+from io import BytesIO, StringIO
+from typing import Any, List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class CountingStringIO(StringIO):
+
+	def __init__(self, initial_value: str):
+		super().__init__(initial_value)
+		self.reads: List[int] = []
+
+	def read(self, size: int = -1) -> str:  # type: ignore[override]
+		self.reads.append(size)
+		return super().read(size)
+
+
+records = [{"id": i, "name": f"record {i}", "values": [i * 1.5, None, True], "nested": {"k": "v" * i}} for i in range(50)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 65536])
+def test_iterload_array(chunk_size: int) -> None:
+	fp = StringIO(json.dumps(records, indent=2))
+	assert list(sdjson.iterload(fp, chunk_size=chunk_size)) == records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 65536])
+def test_iterload_numbers(chunk_size: int) -> None:
+	# Numbers split across chunk boundaries
+	data = [123456789, -1.25e+100, 0, 98765.4321, True, None, "text"]
+	fp = StringIO(json.dumps(data, separators=(",", ":")))
+	assert list(sdjson.iterload(fp, chunk_size=chunk_size)) == data
+
+	assert list(sdjson.iterload(StringIO("12345"), "", chunk_size=chunk_size)) == [12345]
+
+
+@pytest.mark.parametrize(
+		"path, document, expected",
+		[
+				("item", "[]", []),
+				("item", " [ 1 , 2 ] ", [1, 2]),
+				("results.item", '{"count": 2, "results": [{"id": 1}, {"id": 2}], "next": null}', [{"id": 1}, {"id": 2}]),
+				("results.item", '{"count": 0, "results": {}}', []),
+				("results", '{"results": {"a": 1}, "other": [1, 2]}', [{"a": 1}]),
+				("item.id", '[{"id": 1}, {"name": "x"}, {"id": 3}]', [1, 3]),
+				("item.item", "[[1, 2], [], [3]]", [1, 2, 3]),
+				("item", '{"not": "an array"}', []),
+				("", '{"whole": "document"}', [{"whole": "document"}]),
+				]
+		)
+def test_iterload_path(path: str, document: str, expected: List[Any]) -> None:
+	assert list(sdjson.iterload(StringIO(document), path, chunk_size=3)) == expected
+	assert list(sdjson.iterload(StringIO(document), path)) == expected
+
+
+def test_iterload_bytes() -> None:
+	data = ["café", "☃", {"emoji": "\U0001f600"}]
+	document = json.dumps(data, ensure_ascii=False).encode("UTF-8")
+
+	assert list(sdjson.iterload(BytesIO(document), chunk_size=1)) == data
+	assert list(sdjson.iterload(BytesIO(b"\xef\xbb\xbf" + document), chunk_size=2)) == data
+
+
+def test_iterload_lazy() -> None:
+	fp = CountingStringIO(json.dumps(list(range(10000))))
+	iterator = sdjson.iterload(fp, chunk_size=100)
+
+	assert next(iterator) == 0
+	assert len(fp.reads) == 1
+	assert fp.reads[0] == 100
+
+	assert sum(iterator) == sum(range(1, 10000))
+
+
+def test_iterload_decoders() -> None:
+	sdjson.register_decoder("point", lambda obj: (obj["x"], obj["y"]))
+
+	document = '[{"__type__": "point", "x": 1, "y": 2}, {"p": {"__type__": "point", "x": 3, "y": 4}}]'
+	assert list(sdjson.iterload(StringIO(document), chunk_size=4)) == [(1, 2), {"p": (3, 4)}]
+	assert list(sdjson.iterload(StringIO(document), object_hook=dict)) == json.loads(document)
+
+	sdjson.unregister_decoder("point")
+
+
+@pytest.mark.parametrize(
+		"document",
+		[
+				"[1, 2",
+				"[1, 2,]",
+				"[1 2]",
+				'{"results" 1}',
+				"{1: 2}",
+				"[1] [2]",
+				'["unterminated]',
+				]
+		)
+def test_iterload_invalid(document: str) -> None:
+	with pytest.raises(sdjson.JSONDecodeError):
+		list(sdjson.iterload(StringIO(document), "results.item" if document.startswith('{') else "item"))
@@ -0,0 +1,187 @@
+"""
+Test serializing dictionaries whose keys are of registered types
+"""
+
+# stdlib
+import datetime
+import enum
+import io
+import itertools
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterator
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class Colour(enum.Enum):
+	RED = "red"
+	GREEN = "green"
+
+
+class Priority(enum.IntEnum):
+	LOW = 1
+
+
+@pytest.fixture()
+def key_registry() -> sdjson.Registry:
+	registry = sdjson.Registry()
+	registry.register(uuid.UUID, str)
+	registry.register(datetime.date, datetime.date.isoformat)
+	registry.register(enum.Enum, lambda obj: obj.value)
+	return registry
+
+
+class Tick:
+	pass
+
+
+@pytest.fixture()
+def tick_registry(key_registry: sdjson.Registry) -> Iterator[sdjson.Registry]:
+	# A handler which returns a different value each time it is called.
+	counter = itertools.count()
+	key_registry.register(Tick, lambda obj: next(counter))
+	yield key_registry
+
+
+def test_unregistered() -> None:
+	registry = sdjson.Registry()
+
+	with pytest.raises(TypeError, match="keys must be"):
+		sdjson.dumps({uuid.UUID(int=1): 1}, registry=registry)
+
+	assert sdjson.dumps({uuid.UUID(int=1): 1, "a": 2}, skipkeys=True, registry=registry) == '{"a": 2}'
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 1}])
+def test_skipkeys(key_registry: sdjson.Registry, kwargs: Dict[str, Any]) -> None:
+	# Keys are converted before skipkeys is applied
+	data = {"a": [{uuid.UUID(int=1): 1, object(): 2}], "b": 2}
+	expected = sdjson.dumps({"a": [{"00000000-0000-0000-0000-000000000001": 1}], "b": 2}, **kwargs)
+
+	assert sdjson.dumps(data, registry=key_registry, skipkeys=True, **kwargs) == expected
+
+	fp = io.StringIO()
+	sdjson.dump(data, fp, registry=key_registry, skipkeys=True, **kwargs)
+	assert fp.getvalue() == expected
+
+
+def test_keys(key_registry: sdjson.Registry) -> None:
+	data = {
+			"id": 1,
+			uuid.UUID(int=1): {datetime.date(2021, 1, 1): [Colour.RED]},
+			Colour.GREEN: None,
+			Priority.LOW: "low",
+			}
+
+	assert sdjson.dumps(data, registry=key_registry) == (
+			'{"id": 1, "00000000-0000-0000-0000-000000000001": {"2021-01-01": ["red"]}, '
+			'"green": null, "1": "low"}'
+			)
+
+	del data[Priority.LOW]
+	assert sdjson.dumps(data, registry=key_registry, sort_keys=True, indent=1) == (
+			'{\n "00000000-0000-0000-0000-000000000001": {\n  "2021-01-01": [\n   "red"\n  ]\n },\n'
+			' "green": null,\n "id": 1\n}'
+			)
+
+	# The original object is not modified
+	assert uuid.UUID(int=1) in data
+	assert Colour.GREEN in data
+
+
+def test_handler_results(key_registry: sdjson.Registry) -> None:
+
+	class Schedule:
+
+		def __init__(self, days: Dict[datetime.date, str]):
+			self.days = days
+
+	key_registry.register(Schedule, lambda obj: {"days": obj.days})
+	schedule = Schedule({datetime.date(2021, 1, 2): "open"})
+
+	assert sdjson.dumps([schedule], registry=key_registry) == '[{"days": {"2021-01-02": "open"}}]'
+	assert sdjson.dumps([1.234567, schedule], registry=key_registry, float_precision=2) == (
+			'[1.23, {"days": {"2021-01-02": "open"}}]'
+			)
+
+
+def test_unsupported_key(key_registry: sdjson.Registry) -> None:
+	with pytest.raises(TypeError, match="keys must be"):
+		sdjson.dumps({uuid.UUID(int=1): 1, object(): 2}, registry=key_registry)
+
+	key_registry.register(complex, lambda obj: [obj.real, obj.imag])
+
+	with pytest.raises(TypeError, match="keys must be"):
+		sdjson.dumps({1j: 1}, registry=key_registry)
+
+	with pytest.raises(TypeError, match="Object of type '?object'? is not JSON serializable"):
+		sdjson.dumps({"a": object()}, registry=key_registry)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, sdjson.DEFAULT_CHUNK_SIZE])
+def test_dump(key_registry: sdjson.Registry, chunk_size: int) -> None:
+	data: Any = [{"n": i, "colour": "red"} for i in range(50)]
+	data.append({Colour.RED: [{datetime.date(2021, 1, 1): i} for i in range(5)], "raw": sdjson.RawJSON("[1]")})
+	data.append({uuid.UUID(int=2): 2})
+
+	expected = sdjson.dumps(data, registry=key_registry, indent=2)
+
+	fp = io.StringIO()
+	sdjson.dump(data, fp, registry=key_registry, indent=2, chunk_size=chunk_size)
+	assert fp.getvalue() == expected
+	assert '"2021-01-01": 4' in expected
+	assert '"raw": [1]' in expected
+
+
+def test_default_registry() -> None:
+	sdjson.register_encoder(uuid.UUID, str)
+
+	try:
+		assert sdjson.dumps({uuid.UUID(int=1): 1}) == '{"00000000-0000-0000-0000-000000000001": 1}'
+		assert sdjson.dumps_bytes({uuid.UUID(int=1): 1}) == b'{"00000000-0000-0000-0000-000000000001": 1}'
+	finally:
+		sdjson.unregister_encoder(uuid.UUID)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 8, sdjson.DEFAULT_CHUNK_SIZE])
+def test_dump_stateful_handler(tick_registry: sdjson.Registry, chunk_size: int) -> None:
+	data: Any = [Tick()] * 20 + [{uuid.UUID(int=1): 1}]
+
+	fp = io.StringIO()
+	sdjson.dump(data, fp, registry=tick_registry, chunk_size=chunk_size)
+	assert fp.getvalue() == sdjson.dumps([*range(20), {"00000000-0000-0000-0000-000000000001": 1}])
+
+
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({}, id="default"),
+				pytest.param({"sort_keys": True}, id="sort_keys"),
+				pytest.param({"skipkeys": True}, id="skipkeys"),
+				pytest.param({"float_precision": 1}, id="float_precision"),
+				]
+		)
+def test_dumps_retry(key_registry: sdjson.Registry, kwargs: Dict[str, Any]) -> None:
+	# The object is encoded a second time once the UUID key is found, by the pure-Python encoder.
+	key_registry.register(Decimal, float)
+	data = [Decimal("0.5"), {uuid.UUID(int=1): [Decimal("1.5")], "raw": sdjson.RawJSON("[true]")}, Colour.RED]
+
+	assert sdjson.dumps(data, registry=key_registry, **kwargs) == (
+			'[0.5, {"00000000-0000-0000-0000-000000000001": [1.5], "raw": [true]}, "red"]'
+			)
+	assert sdjson.dumps([Decimal("2.5")], registry=key_registry, **kwargs) == "[2.5]"
+
+
+def test_sort_keys_mixed_types(key_registry: sdjson.Registry) -> None:
+	data = {"b": 1, uuid.UUID(int=1): 2, datetime.date(2021, 1, 1): 3}
+	expected = '{"00000000-0000-0000-0000-000000000001": 2, "2021-01-01": 3, "b": 1}'
+	assert sdjson.dumps(data, registry=key_registry, sort_keys=True) == expected
+
+	fp = io.StringIO()
+	sdjson.dump(data, fp, registry=key_registry, sort_keys=True)
+	assert fp.getvalue() == expected
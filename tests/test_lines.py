@@ -0,0 +1,97 @@
+"""
+Test dumping and loading JSON Lines
+"""
+
+# stdlib
+from decimal import Decimal
+from io import BytesIO, StringIO
+from typing import List
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+
+class CountingStringIO(StringIO):
+
+	def __init__(self):
+		super().__init__()
+		self.writes: List[str] = []
+
+	def write(self, s: str) -> int:
+		self.writes.append(s)
+		return super().write(s)
+
+
+records = [{"id": i, "message": f"line {i}\nwith a newline", "level": "INFO"} for i in range(100)]
+
+
+def test_dump_lines() -> None:
+	fp = CountingStringIO()
+	sdjson.dump_lines(records, fp)
+
+	lines = fp.getvalue().splitlines()
+	assert len(lines) == 100
+	assert lines[0] == '{"id": 0, "message": "line 0\\nwith a newline", "level": "INFO"}'
+	assert fp.getvalue().endswith("\n")
+
+	# Buffered into a single write
+	assert len(fp.writes) == 1
+
+
+def test_dump_lines_options() -> None:
+	fp = CountingStringIO()
+	sdjson.dump_lines(iter(records), fp, separators=(",", ":"), sort_keys=True, chunk_size=100)
+
+	lines = fp.getvalue().splitlines()
+	assert lines[1] == '{"id":1,"level":"INFO","message":"line 1\\nwith a newline"}'
+	assert all(len(chunk) >= 100 for chunk in fp.writes[:-1])
+
+
+def test_dump_lines_custom_encoder() -> None:
+
+	@sdjson.encoders.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	fp = StringIO()
+	sdjson.dump_lines([Decimal("1.1"), {"price": Decimal("2.2")}], fp)
+	assert fp.getvalue() == '"1.1"\n{"price": "2.2"}\n'
+
+	sdjson.encoders.unregister(Decimal)
+
+
+def test_round_trip() -> None:
+	fp = StringIO()
+	sdjson.dump_lines(records, fp)
+	fp.seek(0)
+	assert list(sdjson.load_lines(fp)) == records
+
+
+def test_load_lines() -> None:
+	fp = StringIO('{"a": 1}\n\n  \n[1, 2]\r\n"text"\nnull')
+	assert list(sdjson.load_lines(fp)) == [{"a": 1}, [1, 2], "text", None]
+
+	fp = BytesIO('{"snowman": "☃"}\n'.encode("UTF-8"))
+	assert list(sdjson.load_lines(fp)) == [{"snowman": "☃"}]
+
+	assert list(sdjson.load_lines(['{"a": 1}', '{"b": 2}'])) == [{"a": 1}, {"b": 2}]
+
+
+def test_load_lines_lazy() -> None:
+	iterator = sdjson.load_lines(StringIO('{"a": 1}\n{invalid\n'))
+	assert next(iterator) == {"a": 1}
+
+	with pytest.raises(sdjson.JSONDecodeError):
+		next(iterator)
+
+
+def test_load_lines_decoders() -> None:
+	sdjson.register_decoder("point", lambda obj: (obj["x"], obj["y"]))
+
+	fp = StringIO('{"__type__": "point", "x": 1, "y": 2}\n{"__type__": "point", "x": 3, "y": 4}\n')
+	assert list(sdjson.load_lines(fp)) == [(1, 2), (3, 4)]
+
+	sdjson.unregister_decoder("point")
@@ -0,0 +1,85 @@
+"""
+Test loading JSON files by path with load_path()
+"""
+
+# stdlib
+import json
+from fractions import Fraction
+from typing import Any, Dict, List
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+import sdjson
+
+data: Dict[str, Any] = {
+		"name": "Ünïcödé ☃ 𝄞",
+		"values": [1, 2.5, True, None],
+		"nested": {"surrogate": "\ud800"},
+		}
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+@pytest.mark.parametrize("encoding", ["UTF-8", "UTF-8-SIG", "UTF-16", "UTF-16-LE", "UTF-32-BE"])
+def test_load_path(tmp_pathplus: PathPlus, encoding: str, mmap: bool) -> None:
+	filename = tmp_pathplus / "data.json"
+	filename.write_bytes(json.dumps(data, ensure_ascii=False).encode(encoding, "surrogatepass"))
+
+	assert sdjson.load_path(filename, mmap=mmap) == data
+	assert sdjson.load_path(str(filename), mmap=mmap) == data
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_load_path_empty(tmp_pathplus: PathPlus, mmap: bool) -> None:
+	filename = tmp_pathplus / "empty.json"
+	filename.write_bytes(b'')
+
+	with pytest.raises(json.JSONDecodeError, match="Expecting value: line 1 column 1"):
+		sdjson.load_path(filename, mmap=mmap)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_load_path_small(tmp_pathplus: PathPlus, mmap: bool) -> None:
+	filename = tmp_pathplus / "small.json"
+	filename.write_bytes(b'1')
+	assert sdjson.load_path(filename, mmap=mmap) == 1
+
+
+def test_load_path_decoders(tmp_pathplus: PathPlus) -> None:
+	filename = tmp_pathplus / "fraction.json"
+	filename.write_text('[{"__type__": "fraction", "value": "1/3"}]')
+
+	sdjson.register_decoder("fraction", lambda obj: Fraction(obj["value"]))
+
+	try:
+		assert sdjson.load_path(filename) == [Fraction(1, 3)]
+	finally:
+		sdjson.unregister_decoder("fraction")
+
+	assert sdjson.load_path(filename, parse_int=str) == [{"__type__": "fraction", "value": "1/3"}]
+
+
+def test_load_path_into(tmp_pathplus: PathPlus) -> None:
+	dataclasses = pytest.importorskip("dataclasses")
+
+	@dataclasses.dataclass
+	class Reading:
+		sensor: str
+		value: float
+
+	filename = tmp_pathplus / "readings.json"
+	filename.write_text('[{"sensor": "a", "value": 1.5}, {"sensor": "b", "value": 2}]')
+	assert sdjson.load_path(filename, into=List[Reading]) == [Reading('a', 1.5), Reading('b', 2)]
+
+
+def test_load_path_invalid(tmp_pathplus: PathPlus) -> None:
+	filename = tmp_pathplus / "invalid.json"
+	filename.write_text('{"a": 1,}')
+
+	with pytest.raises(json.JSONDecodeError, match="line 1 column 9"):
+		sdjson.load_path(filename)
+
+	with pytest.raises(FileNotFoundError):
+		sdjson.load_path(tmp_pathplus / "missing.json")
@@ -0,0 +1,215 @@
+"""
+Test constructing typed objects with the ``into`` argument of loads(), load() and iterload()
+"""
+
+# stdlib
+import datetime
+import enum
+from io import StringIO
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+dataclasses = pytest.importorskip("dataclasses")
+
+
+class Status(enum.Enum):
+	OPEN = "open"
+	SHIPPED = "shipped"
+
+
+@dataclasses.dataclass
+class LineItem:
+	sku: str
+	quantity: int = 1
+
+
+@dataclasses.dataclass
+class Order:
+	id: int
+	status: Status
+	placed: datetime.date
+	items: List[LineItem]
+	notes: Optional[str] = None
+	tags: Set[str] = dataclasses.field(default_factory=set)
+
+
+@dataclasses.dataclass
+class Category:
+	name: str
+	children: List["Category"] = dataclasses.field(default_factory=list)
+
+
+class Point(NamedTuple):
+	x: float
+	y: float
+
+
+class Shape:
+	name: str
+	points: List[Point]
+
+	def __init__(self, name: str, points: List[Point]):
+		self.name = name
+		self.points = points
+
+
+@pytest.fixture()
+def date_decoder() -> Iterator[None]:
+	sdjson.register_constructor(datetime.date, datetime.date.fromisoformat)
+	yield
+	sdjson.unregister_constructor(datetime.date)
+
+
+orders_text = """[
+	{"id": 1, "status": "open", "placed": "2021-03-04", "items": [{"sku": "A1"}, {"sku": "B2", "quantity": 3}]},
+	{"id": 2, "status": "shipped", "placed": "2021-03-05", "items": [], "notes": "gift", "tags": ["x", "y"]}
+]"""
+
+expected_orders = [
+		Order(1, Status.OPEN, datetime.date(2021, 3, 4), [LineItem("A1"), LineItem("B2", 3)]),
+		Order(2, Status.SHIPPED, datetime.date(2021, 3, 5), [], notes="gift", tags={"x", "y"}),
+		]
+
+
+def test_loads_into(date_decoder: None) -> None:
+	assert sdjson.loads(orders_text, into=List[Order]) == expected_orders
+	assert sdjson.loads(orders_text.encode("UTF-8"), into=List[Order]) == expected_orders
+	assert sdjson.load(StringIO(orders_text), into=List[Order]) == expected_orders
+	assert list(sdjson.iterload(StringIO(orders_text), into=Order)) == expected_orders
+
+
+def test_loads_into_recursive() -> None:
+	text = '{"name": "root", "children": [{"name": "a", "children": [{"name": "b"}]}, {"name": "c"}]}'
+	assert sdjson.loads(text, into=Category) == Category(
+			"root",
+			[Category('a', [Category('b')]), Category('c')],
+			)
+
+
+def test_loads_into_annotated_class() -> None:
+	shape = sdjson.loads('{"name": "line", "points": [{"x": 0, "y": 0}, {"x": 1.5, "y": 2}]}', into=Shape)
+	assert isinstance(shape, Shape)
+	assert shape.name == "line"
+	assert shape.points == [Point(0, 0), Point(1.5, 2)]
+	assert isinstance(shape.points[0], Point)
+
+
+@dataclasses.dataclass
+class Route:
+	name: str
+	points: List[Point]
+	start: Optional[Point] = None
+
+
+def test_loads_into_namedtuple_round_trip() -> None:
+	# sdjson writes namedtuples as arrays
+	route = Route("line", [Point(0, 0), Point(1.5, 2)], Point(0, 0))
+	registry = sdjson.Registry()
+	registry.register(Route, sdjson.encode_fields)
+	text = sdjson.dumps(route, registry=registry)
+	assert text == '{"name": "line", "points": [[0, 0], [1.5, 2]], "start": [0, 0]}'
+
+	loaded = sdjson.loads(text, into=Route)
+	assert loaded == route
+	assert isinstance(loaded.points[0], Point)
+	assert isinstance(loaded.start, Point)
+
+	assert sdjson.loads(sdjson.dumps(Point(1, 2)), into=Point) == Point(1, 2)
+	assert sdjson.loads("[[1, 2]]", into=List[Point]) == [Point(1, 2)]
+
+	with pytest.raises(TypeError, match="positional argument"):
+		sdjson.loads("[1, 2, 3]", into=Point)
+
+
+@pytest.mark.parametrize(
+		"text, into, expected",
+		[
+				pytest.param("[1, 2]", Tuple[int, ...], (1, 2), id="tuple"),
+				pytest.param('[{"x": 1, "y": 2}, "open"]', Tuple[Point, Status], (Point(1, 2), Status.OPEN), id="pair"),
+				pytest.param('["open", "open"]', FrozenSet[Status], frozenset({Status.OPEN}), id="frozenset"),
+				pytest.param('{"a": "open"}', Dict[str, Status], {'a': Status.OPEN}, id="dict"),
+				pytest.param('{"1": "open"}', Dict[int, Status], {1: Status.OPEN}, id="int_keys"),
+				pytest.param("null", Optional[Point], None, id="none"),
+				pytest.param('{"a": [1]}', Dict[str, Any], {'a': [1]}, id="any"),
+				pytest.param('{"a": [1]}', dict, {'a': [1]}, id="plain"),
+				]
+		)
+def test_loads_into_containers(text: str, into: Any, expected: Any) -> None:
+	assert sdjson.loads(text, into=into) == expected
+
+
+def test_loads_into_unexpected_values() -> None:
+	# Values which do not match the annotations are passed through unchanged.
+	assert sdjson.loads('{"id": 1, "items": {"sku": "A1"}}', into=Dict[str, List[LineItem]]) == {
+			"id": 1,
+			"items": {"sku": "A1"},
+			}
+
+	with pytest.raises(TypeError, match="missing 1 required positional argument: 'sku'"):
+		sdjson.loads('{"quantity": 2}', into=LineItem)
+
+	with pytest.raises(ValueError, match="'closed' is not a valid Status"):
+		sdjson.loads('["closed"]', into=List[Status])
+
+
+def test_loads_into_ignores_unknown_keys() -> None:
+	assert sdjson.loads('{"sku": "A1", "colour": "red"}', into=LineItem) == LineItem("A1")
+
+
+def test_loads_into_type_tagged_decoders() -> None:
+	# Objects already converted by a "__type__" decoder are left alone.
+	sdjson.register_decoder("line_item", lambda obj: LineItem(obj["sku"], 99))
+
+	try:
+		text = '[{"__type__": "line_item", "sku": "A1"}, {"sku": "B2"}]'
+		assert sdjson.loads(text, into=List[LineItem]) == [LineItem("A1", 99), LineItem("B2")]
+	finally:
+		sdjson.unregister_decoder("line_item")
+
+
+def test_loads_into_plan_cache(date_decoder: None) -> None:
+	sdjson.loads(orders_text, into=List[Order])
+	assert Order in sdjson._construction_plans
+	plan = sdjson._construction_plans[Order]
+	sdjson.loads(orders_text, into=List[Order])
+	assert sdjson._construction_plans[Order] is plan
+
+	# Registering a constructor for a class changes how it is constructed.
+	sdjson.register_constructor(LineItem, lambda obj: obj["sku"])
+	assert not sdjson._construction_plans
+	assert LineItem not in sdjson.decoders.registry
+
+	try:
+		assert sdjson.loads(orders_text, into=List[Order])[0].items == ["A1", "B2"]
+	finally:
+		sdjson.unregister_constructor(LineItem)
+
+	assert sdjson.loads(orders_text, into=List[Order]) == expected_orders
+
+
+def test_loads_into_attrs() -> None:
+	attr = pytest.importorskip("attr")
+
+	@attr.s(auto_attribs=True)
+	class Account:
+		_id: int
+		owner: str
+		items: List[LineItem] = attr.ib(factory=list)
+
+	account = sdjson.loads('{"_id": 7, "owner": "me", "items": [{"sku": "A1"}]}', into=Account)
+	assert account == Account(7, "me", [LineItem("A1")])
+
+
+def test_constructors_do_not_install_hook(date_decoder: None) -> None:
+	# Constructors are only used with ``into``, so plain loads() calls do not pay for the object_hook.
+	assert not sdjson.decoders.registry
+	assert "object_hook" not in sdjson._decoder_kwargs({})
+	assert sdjson.loads('{"__type__": "date", "placed": "2021-03-04"}') == {
+			"__type__": "date",
+			"placed": "2021-03-04",
+			}
@@ -0,0 +1,100 @@
+"""
+Test the built-in encoders for NumPy arrays and scalars
+"""
+
+# stdlib
+import io
+import math
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.fixture()
+def numpy_encoders() -> Iterator[None]:
+	sdjson.register_numpy_encoders()
+	yield
+	sdjson.unregister_encoder(numpy.ndarray)
+	sdjson.unregister_encoder(numpy.generic)
+
+
+def test_not_registered() -> None:
+	with pytest.raises(TypeError, match="Object of type '?ndarray'? is not JSON serializable"):
+		sdjson.dumps(numpy.arange(3), registry=sdjson.Registry())
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_arrays() -> None:
+	assert sdjson.dumps(numpy.arange(4)) == "[0, 1, 2, 3]"
+	assert sdjson.dumps(numpy.arange(6).reshape(2, 3)) == "[[0, 1, 2], [3, 4, 5]]"
+	assert sdjson.dumps(numpy.array([0.5, 1.25, 1e-300])) == "[0.5, 1.25, 1e-300]"
+	assert sdjson.dumps(numpy.array([True, False])) == "[true, false]"
+	assert sdjson.dumps(numpy.array(["a", "b"])) == '["a", "b"]'
+	assert sdjson.dumps(numpy.zeros((2, 0))) == "[[], []]"
+	assert sdjson.dumps(numpy.array(7)) == "7"
+	assert sdjson.dumps({"data": numpy.arange(3, dtype=numpy.uint8)}, indent=1) == (
+			'{\n "data": [\n  0,\n  1,\n  2\n ]\n}'
+			)
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_reduced_precision() -> None:
+	values = [0.1, 1.5, 3.14159, 65504.0]
+
+	assert sdjson.dumps(numpy.array(values, dtype=numpy.float32)) == "[0.1, 1.5, 3.14159, 65504.0]"
+	assert sdjson.dumps(numpy.array(values, dtype=numpy.float16)) == "[0.1, 1.5, 3.14, 65500.0]"
+	assert sdjson.dumps(numpy.float32(0.1)) == "0.1"
+
+	# Each value round-trips at the array's own precision
+	array = numpy.random.default_rng(0).standard_normal(1000).astype(numpy.float32)
+	assert (numpy.array(sdjson.loads(sdjson.dumps(array)), dtype=numpy.float32) == array).all()
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_scalars() -> None:
+	assert sdjson.dumps(numpy.int64(5)) == "5"
+	assert sdjson.dumps(numpy.uint16(7)) == "7"
+	assert sdjson.dumps(numpy.float64(0.25)) == "0.25"
+	assert sdjson.dumps(numpy.bool_(True)) == "true"
+	assert sdjson.dumps({"n": numpy.int32(1), "x": numpy.float32(2.5)}) == '{"n": 1, "x": 2.5}'
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_non_finite() -> None:
+	array = numpy.array([numpy.nan, numpy.inf, -numpy.inf], dtype=numpy.float32)
+	assert sdjson.dumps(array) == "[NaN, Infinity, -Infinity]"
+
+	with pytest.raises(ValueError, match="Out of range float values are not JSON compliant"):
+		sdjson.dumps(array, allow_nan=False)
+
+	assert math.isnan(sdjson.loads(sdjson.dumps(numpy.float16("nan"))))
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_unsupported() -> None:
+	with pytest.raises(TypeError, match="Object of type '?complex'? is not JSON serializable"):
+		sdjson.dumps(numpy.array([1 + 2j]))
+
+
+@pytest.mark.usefixtures("numpy_encoders")
+def test_options() -> None:
+	array = numpy.array([[1.23456, 2.0], [3.5, 4.75]])
+
+	assert sdjson.dumps(array, float_precision=2) == "[[1.23, 2.0], [3.5, 4.75]]"
+
+	fp = io.StringIO()
+	sdjson.dump({"array": array}, fp, sort_keys=True)
+	assert fp.getvalue() == '{"array": [[1.23456, 2.0], [3.5, 4.75]]}'
+
+	# Concrete handlers registered for a subclass take precedence
+	sdjson.register_encoder(numpy.int64, str)
+	try:
+		assert sdjson.dumps([numpy.int64(1), numpy.int32(2)]) == '["1", 2]'
+	finally:
+		sdjson.unregister_encoder(numpy.int64)
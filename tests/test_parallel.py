@@ -0,0 +1,200 @@
+"""
+Test encoding large collections in worker processes with dumps_parallel
+"""
+
+# stdlib
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, Iterator
+
+# 3rd party
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from coincidence.selectors import min_version
+
+# this package
+import sdjson
+
+
+class Point:
+
+	def __init__(self, x: int, y: int):
+		self.x = x
+		self.y = y
+
+
+#: Used by worker processes via ``registry_spec="tests.test_parallel:registry"``.
+registry = sdjson.Registry()
+registry.register(Point, lambda obj: {"x": obj.x, "y": obj.y})
+
+
+def make_registry() -> sdjson.Registry:
+	"""
+	Used via ``registry_spec="tests.test_parallel:make_registry"``.
+	"""
+
+	decimal_registry = sdjson.Registry()
+	decimal_registry.register(Decimal, str)
+	return decimal_registry
+
+
+def setup_encoders() -> None:
+	"""
+	Used by worker processes via ``registry_spec="tests.test_parallel:setup_encoders"``.
+	"""
+
+	sdjson.register_encoder(Decimal, str)
+
+
+@pytest.fixture()
+def decimal_encoder() -> Iterator[None]:
+	sdjson.register_encoder(Decimal, str)
+	yield
+	sdjson.unregister_encoder(Decimal)
+
+
+records = [{"id": i, "price": Decimal(f"{i}.99"), "tags": ["a", "b"], "nested": {"n": i}} for i in range(101)]
+
+
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({}, id="default"),
+				pytest.param({"indent": 2}, id="indent_int"),
+				pytest.param({"indent": "\t"}, id="indent_str"),
+				pytest.param({"indent": 0}, id="indent_zero"),
+				pytest.param({"separators": (",", ":")}, id="compact"),
+				pytest.param({"indent": 2, "separators": (" ,", " = ")}, id="indent_separators"),
+				pytest.param({"sort_keys": True, "indent": 4}, id="sort_keys"),
+				]
+		)
+def test_dumps_parallel(decimal_encoder: None, kwargs: Dict[str, Any]) -> None:
+	mapping = {f"key{i:03d}": record for i, record in reversed(list(enumerate(records)))}
+
+	for obj in (records, tuple(records), mapping):
+		assert sdjson.dumps_parallel(obj, workers=2, shards=7, **kwargs) == sdjson.dumps(obj, **kwargs)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_dumps_parallel_skipkeys(indent: Any) -> None:
+	# Some shards have every key skipped
+	obj: Dict[Any, int] = {(i, ): i for i in range(20)}
+	obj["x"] = 1
+	obj.update({(i, 1): i for i in range(20)})
+
+	expected = sdjson.dumps(obj, skipkeys=True, indent=indent)
+	assert sdjson.dumps_parallel(obj, workers=2, shards=8, skipkeys=True, indent=indent) == expected
+
+	obj = {(i, ): i for i in range(20)}
+	expected = sdjson.dumps(obj, skipkeys=True, indent=indent)
+	assert sdjson.dumps_parallel(obj, workers=2, skipkeys=True, indent=indent) == expected
+
+
+def test_dumps_parallel_small_or_scalar() -> None:
+	assert sdjson.dumps_parallel([1, 2, 3], workers=2) == "[1, 2, 3]"
+	assert sdjson.dumps_parallel([], workers=2) == "[]"
+	assert sdjson.dumps_parallel({}, workers=2, indent=2) == "{}"
+	assert sdjson.dumps_parallel("spam", workers=2) == '"spam"'
+	assert sdjson.dumps_parallel(list(range(100)), workers=1) == sdjson.dumps(list(range(100)))
+
+
+def test_dumps_parallel_executor(decimal_encoder: None) -> None:
+	with ThreadPoolExecutor(max_workers=3) as executor:
+		assert sdjson.dumps_parallel(records, executor=executor) == sdjson.dumps(records)
+
+
+def test_dumps_parallel_unregistered_type() -> None:
+	# The registry named by registry_spec has no encoder for Decimal.
+	with pytest.raises(TypeError, match="Object of type Decimal is not JSON serializable"):
+		sdjson.dumps_parallel(records, workers=2, registry_spec="tests.test_parallel:registry")
+
+
+@pytest.fixture()
+def spawn_executor() -> Iterator[ProcessPoolExecutor]:
+	# Spawned workers only see encoders registered when the modules they import are imported.
+	context = multiprocessing.get_context("spawn")
+	with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+		yield executor
+
+
+@min_version("3.7", reason="ProcessPoolExecutor has no mp_context argument before Python 3.7")
+def test_dumps_parallel_registry_spec_registry(spawn_executor: ProcessPoolExecutor) -> None:
+	points = [Point(i, -i) for i in range(50)]
+
+	with pytest.raises(TypeError, match="Object of type Point is not JSON serializable"):
+		sdjson.dumps_parallel(points, executor=spawn_executor)
+
+	output = sdjson.dumps_parallel(points, executor=spawn_executor, registry_spec="tests.test_parallel:registry")
+	assert output == sdjson.dumps(points, registry=registry)
+
+
+@min_version("3.7", reason="ProcessPoolExecutor has no mp_context argument before Python 3.7")
+def test_dumps_parallel_registry_spec_callable(spawn_executor: ProcessPoolExecutor, decimal_encoder: None) -> None:
+	output = sdjson.dumps_parallel(
+			records,
+			executor=spawn_executor,
+			registry_spec="tests.test_parallel:setup_encoders",
+			)
+	assert output == sdjson.dumps(records)
+
+
+def test_dumps_parallel_registry_spec_in_process() -> None:
+	# Threads resolve the registry_spec in the current process.
+	points = [Point(i, -i) for i in range(50)]
+
+	with ThreadPoolExecutor(max_workers=2) as executor:
+		output = sdjson.dumps_parallel(points, executor=executor, registry_spec="tests.test_parallel:registry")
+		assert output == sdjson.dumps(points, registry=registry)
+		assert sdjson._spec_registries["tests.test_parallel:registry"] is registry
+
+		output = sdjson.dumps_parallel(records, executor=executor, registry_spec="tests.test_parallel:make_registry")
+		assert output == sdjson.dumps(records, registry=make_registry())
+
+		output = sdjson.dumps_parallel([1, 2, 3, 4], executor=executor, shards=2, registry_spec="tests.test_parallel")
+		assert output == "[1, 2, 3, 4]"
+		assert sdjson._spec_registries["tests.test_parallel"] is None
+
+
+def test_dumps_parallel_default_context() -> None:
+	# Without inherit=True the shards are pickled and sent to a pool using the platform's default start method.
+	points = [Point(i, -i) for i in range(50)]
+	output = sdjson.dumps_parallel(points, workers=2, registry_spec="tests.test_parallel:registry")
+	assert output == sdjson.dumps(points, registry=registry)
+
+
+def test_dumps_parallel_registry_without_spec() -> None:
+	with ThreadPoolExecutor(max_workers=2) as executor:
+		with pytest.raises(ValueError, match="'registry' cannot be sent to worker processes"):
+			sdjson.dumps_parallel([Point(1, 2)], registry=registry, executor=executor)
+
+	with pytest.raises(ValueError, match="'registry' cannot be sent to worker processes"):
+		sdjson.dumps_parallel([Point(1, 2)], registry=registry, workers=2)
+
+
+def test_dumps_parallel_inherit_errors(monkeypatch: MonkeyPatch) -> None:
+	with ThreadPoolExecutor(max_workers=2) as executor:
+		with pytest.raises(ValueError, match="'inherit' and 'executor' cannot both be given."):
+			sdjson.dumps_parallel([1, 2], executor=executor, inherit=True)
+
+	monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+	with pytest.raises(ValueError, match="'inherit' requires the 'fork' start method"):
+		sdjson.dumps_parallel([1, 2], inherit=True)
+
+
+@pytest.mark.skipif(
+		"fork" not in multiprocessing.get_all_start_methods() or sys.version_info < (3, 7),
+		reason="Requires the 'fork' start method",
+		)
+def test_dumps_parallel_inherited_registry() -> None:
+	# Forked workers inherit the registry, whether passed explicitly or active for the context.
+	points = [Point(i, -i) for i in range(50)]
+	expected = sdjson.dumps(points, registry=registry)
+
+	assert sdjson.dumps_parallel(points, workers=2, registry=registry, inherit=True) == expected
+
+	with registry.activate():
+		assert sdjson.dumps_parallel(points, workers=2, inherit=True) == expected
+
+	assert not sdjson._inherited_payloads
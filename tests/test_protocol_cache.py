@@ -0,0 +1,71 @@
+"""
+Test the caching of handlers resolved through protocols
+"""
+
+# stdlib
+from abc import abstractmethod
+
+# 3rd party
+import pytest
+from typing_extensions import Protocol, runtime_checkable
+
+# this package
+import sdjson
+
+
+@runtime_checkable
+class SupportsSpam(Protocol):
+
+	@abstractmethod
+	def spam(self) -> str:
+		pass
+
+
+class Spam:
+
+	def spam(self) -> str:
+		return "spam"
+
+
+class Eggs:
+	pass
+
+
+def test_dispatch_table() -> None:
+
+	with pytest.raises(TypeError, match="Object of type '?Spam'? is not JSON serializable"):
+		sdjson.dumps(Spam())
+
+	# The absence of a handler is cached
+	assert sdjson.encoders._dispatch_table[Spam] is None
+
+	# ...and invalidated when a handler is registered
+	@sdjson.encoders.register(SupportsSpam)
+	def supports_spam_encoder(obj):
+		return obj.spam()
+
+	assert Spam not in sdjson.encoders._dispatch_table
+
+	assert sdjson.dumps([Spam(), Spam(), Spam()]) == '["spam", "spam", "spam"]'
+	assert sdjson.encoders._dispatch_table[Spam] is supports_spam_encoder
+
+	with pytest.raises(TypeError, match="Object of type '?Eggs'? is not JSON serializable"):
+		sdjson.dumps(Eggs())
+
+	assert sdjson.encoders._dispatch_table[Eggs] is None
+
+	# Concrete handlers take precedence over protocols
+	@sdjson.encoders.register(Spam)
+	def spam_encoder(obj):
+		return "eggs"
+
+	assert sdjson.dumps(Spam()) == '"eggs"'
+
+	sdjson.unregister_encoder(Spam)
+	assert sdjson.dumps(Spam()) == '"spam"'
+
+	sdjson.unregister_encoder(SupportsSpam)
+	assert len(sdjson.encoders._dispatch_table) == 0
+
+	with pytest.raises(TypeError, match="Object of type '?Spam'? is not JSON serializable"):
+		sdjson.dumps(Spam())
@@ -0,0 +1,131 @@
+"""
+Test embedding pre-encoded JSON with RawJSON
+"""
+
+# stdlib
+import asyncio
+import io
+import pickle
+from decimal import Decimal
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+profile = sdjson.RawJSON('{"name": "Alice", "roles": ["admin"]}')
+
+
+def test_repr() -> None:
+	assert repr(profile) == "RawJSON('{\"name\": \"Alice\", \"roles\": [\"admin\"]}')"
+	assert pickle.loads(pickle.dumps(profile)).text == profile.text
+
+
+def test_dumps() -> None:
+	assert sdjson.dumps(profile) == profile.text
+	assert sdjson.dumps({"user": profile, "id": 1}) == '{"user": {"name": "Alice", "roles": ["admin"]}, "id": 1}'
+	assert sdjson.dumps([profile, profile]) == f"[{profile.text}, {profile.text}]"
+	assert sdjson.dumps([sdjson.RawJSON("1e400"), sdjson.RawJSON("  null ")]) == "[1e400,   null ]"
+	assert sdjson.dumps_bytes({"user": profile}) == b'{"user": {"name": "Alice", "roles": ["admin"]}}'
+
+
+def test_options() -> None:
+	data = {"b": [profile], "a": 1.2345}
+
+	assert sdjson.dumps(data, indent=1, sort_keys=True) == (
+			'{\n "a": 1.2345,\n "b": [\n  {"name": "Alice", "roles": ["admin"]}\n ]\n}'
+			)
+	assert sdjson.dumps(data, float_precision=2) == '{"b": [{"name": "Alice", "roles": ["admin"]}], "a": 1.23}'
+	assert sdjson.dumps(data, float_format=".1f") == '{"b": [{"name": "Alice", "roles": ["admin"]}], "a": 1.2}'
+	assert sdjson.dumps(["é", sdjson.RawJSON('"é"')], ensure_ascii=False) == '["é", "é"]'
+	assert sdjson.dumps(["é", sdjson.RawJSON('"é"')]) == '["\\u00e9", "é"]'
+
+
+def test_not_escaped() -> None:
+	# Neither strings resembling the placeholders nor the text of other RawJSON values are replaced.
+	text = "\x00 \\u0000 \x000:0\x00"
+	assert sdjson.loads(sdjson.dumps([text, profile])) == [text, sdjson.loads(profile.text)]
+	assert sdjson.dumps([sdjson.RawJSON('"\\u0000"'), "\x00"]) == '["\\u0000", "\\u0000"]'
+
+
+def test_handlers() -> None:
+	cache = {1: '{"id": 1}'}
+
+	class User:
+
+		def __init__(self, id: int):  # noqa: A002
+			self.id = id
+
+	@sdjson.register_encoder(User)
+	def encode_user(obj):
+		return sdjson.RawJSON(cache[obj.id])
+
+	try:
+		assert sdjson.dumps({"users": [User(1)]}) == '{"users": [{"id": 1}]}'
+
+		fp = io.StringIO()
+		sdjson.dump({"users": [User(1)]}, fp)
+		assert fp.getvalue() == '{"users": [{"id": 1}]}'
+	finally:
+		sdjson.unregister_encoder(User)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, sdjson.DEFAULT_CHUNK_SIZE])
+def test_dump(chunk_size: int) -> None:
+	data = {"users": [profile] * 10, "count": 10}
+	expected = sdjson.dumps(data, indent=2)
+
+	fp = io.StringIO()
+	sdjson.dump(data, fp, indent=2, chunk_size=chunk_size)
+	assert fp.getvalue() == expected
+	assert sdjson.loads(fp.getvalue())["users"][9] == {"name": "Alice", "roles": ["admin"]}
+
+	binary_fp = io.BytesIO()
+	sdjson.dump(data, binary_fp, indent=2, chunk_size=chunk_size)
+	assert binary_fp.getvalue() == expected.encode("UTF-8")
+
+	fp = io.StringIO()
+	sdjson.dump(profile, fp, chunk_size=chunk_size)
+	assert fp.getvalue() == profile.text
+
+
+def test_dump_lines() -> None:
+	fp = io.StringIO()
+	sdjson.dump_lines([profile, {"user": profile}], fp)
+	assert fp.getvalue() == f'{profile.text}\n{{"user": {profile.text}}}\n'
+
+
+def test_dump_async() -> None:
+
+	class Writer:
+
+		def __init__(self):
+			self.data = b""
+
+		def write(self, data: bytes) -> None:
+			self.data += data
+
+	writer = Writer()
+	loop = asyncio.new_event_loop()
+	try:
+		loop.run_until_complete(sdjson.dump_async({"user": profile}, writer, chunk_size=4))
+	finally:
+		loop.close()
+
+	assert writer.data == f'{{"user": {profile.text}}}'.encode("UTF-8")
+
+
+def test_custom_registry() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+
+	assert sdjson.dumps([Decimal("1.5"), profile], registry=registry) == f'["1.5", {profile.text}]'
+
+
+def test_unsupported() -> None:
+	with pytest.raises(TypeError, match="keys must be"):
+		sdjson.dumps({profile: 1})
+
+	with pytest.raises(TypeError, match="Object of type '?RawJSON'? is not JSON serializable"):
+		sdjson.dumps(profile, cls=sdjson.JSONEncoder)
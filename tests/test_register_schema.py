@@ -0,0 +1,179 @@
+"""
+Test the generation of encoders from type annotations with ``sdjson.register_schema``
+"""
+
+# stdlib
+import datetime
+from decimal import Decimal
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+# 3rd party
+import pytest
+
+# this package
+import sdjson
+
+dataclasses = pytest.importorskip("dataclasses")
+
+
+@dataclasses.dataclass
+class LineItem:
+	sku: str
+	price: Decimal
+	discount: Optional[Decimal] = None
+
+
+@dataclasses.dataclass
+class Order:
+	placed: datetime.date
+	items: List[LineItem]
+	totals: Dict[str, Decimal]
+	history: Tuple[datetime.date, ...] = ()
+	tags: Sequence[str] = ()
+	pair: Tuple[Decimal, str] = (Decimal(0), "")
+	notes: Any = None
+
+
+class Annotated:
+	kind: ClassVar[str] = "annotated"
+	name: str
+	when: datetime.date
+
+	def __init__(self, name: str, when: datetime.date):
+		self.name = name
+		self.when = when
+
+
+class Plain:
+
+	def __init__(self):
+		self.value = 1
+
+
+@pytest.fixture()
+def registry() -> sdjson.Registry:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	registry.register(datetime.date, datetime.date.isoformat)
+	return registry
+
+
+def make_order() -> Order:
+	return Order(
+			placed=datetime.date(2021, 1, 1),
+			items=[LineItem("a", Decimal("1.50")), LineItem("b", Decimal(2), Decimal("0.25"))],
+			totals={"net": Decimal("3.25")},
+			history=(datetime.date(2020, 12, 31), ),
+			tags=["urgent"],
+			pair=(Decimal(1), "one"),
+			notes=Decimal(5),
+			)
+
+
+def test_register_schema(registry: sdjson.Registry) -> None:
+	assert registry.register_schema(LineItem) is not None
+	plan = registry.register_schema(Order)
+	assert plan is not None
+	assert plan.__name__ == "encode_Order"
+
+	order = make_order()
+	assert plan(order) == {
+			"placed": "2021-01-01",
+			"items": [
+					{"sku": "a", "price": "1.50", "discount": None},
+					{"sku": "b", "price": "2", "discount": "0.25"},
+					],
+			"totals": {"net": "3.25"},
+			"history": ["2020-12-31"],
+			"tags": ["urgent"],
+			"pair": (Decimal(1), "one"),
+			"notes": Decimal(5),
+			}
+
+	# Values which are not converted by the schema are serialized as normal.
+	expected = (
+			'{"placed": "2021-01-01", "items": [{"sku": "a", "price": "1.50", "discount": null}, '
+			'{"sku": "b", "price": "2", "discount": "0.25"}], "totals": {"net": "3.25"}, '
+			'"history": ["2020-12-31"], "tags": ["urgent"], "pair": ["1", "one"], "notes": "5"}'
+			)
+	assert sdjson.dumps(order, registry=registry) == expected
+
+	registry.unregister(Order)
+	registry.unregister(LineItem)
+
+	with pytest.raises(TypeError, match="Object of type '?Order'? is not JSON serializable"):
+		sdjson.dumps(order, registry=registry)
+
+
+def test_unexpected_types(registry: sdjson.Registry) -> None:
+	registry.register_schema(LineItem)
+	registry.register_schema(Order)
+
+	class Price(Decimal):
+		pass
+
+	registry.register(Price, lambda obj: f"${obj}")
+	registry.register(datetime.datetime, datetime.datetime.isoformat)
+
+	order = Order(datetime.datetime(2021, 1, 1, 12), [LineItem("a", Price(1))], {}, notes=None)  # type: ignore[arg-type]
+	order.items.append({"sku": "raw"})  # type: ignore[arg-type]
+
+	assert sdjson.dumps(order, registry=registry) == (
+			'{"placed": "2021-01-01T12:00:00", "items": [{"sku": "a", "price": "$1", "discount": null}, {"sku": "raw"}], '
+			'"totals": {}, "history": [], "tags": [], "pair": ["0", ""], "notes": null}'
+			)
+
+
+def test_nested_order(registry: sdjson.Registry) -> None:
+	# The schema for Order is regenerated once the schema for LineItem is registered.
+	plan = registry.register_schema(Order)
+	order = make_order()
+	assert plan(order)["items"] is order.items
+
+	registry.register_schema(LineItem)
+	assert registry._plans[Order](order)["items"][0] == {"sku": "a", "price": "1.50", "discount": None}
+	assert '"price": "1.50"' in sdjson.dumps(order, registry=registry)
+
+
+def test_registry_changes(registry: sdjson.Registry) -> None:
+	registry.register_schema(LineItem)
+	item = LineItem("a", Decimal("1.50"))
+
+	registry.unregister(Decimal)
+	with pytest.raises(TypeError, match="Object of type '?Decimal'? is not JSON serializable"):
+		sdjson.dumps(item, registry=registry)
+
+	registry.register(Decimal, float)
+	assert sdjson.dumps(item, registry=registry) == '{"sku": "a", "price": 1.5, "discount": null}'
+
+	# Replaced by a compiled encoder
+	registry.compile(LineItem)
+	registry.register(Decimal, str)
+	assert sdjson.dumps(item, registry=registry) == '{"sku": "a", "price": "1.50", "discount": null}'
+	assert registry._plans[LineItem](item)["price"] is item.price
+
+	# Copies regenerate their schemas independently
+	registry.register_schema(LineItem)
+	copy = registry.copy()
+	copy.register(Decimal, float)
+	assert sdjson.dumps(item, registry=copy) == '{"sku": "a", "price": 1.5, "discount": null}'
+	assert sdjson.dumps(item, registry=registry) == '{"sku": "a", "price": "1.50", "discount": null}'
+
+
+def test_annotated_class(registry: sdjson.Registry) -> None:
+	plan = registry.register_schema(Annotated)
+	assert plan is not None
+	assert plan(Annotated("x", datetime.date(2021, 1, 2))) == {"name": "x", "when": "2021-01-02"}
+
+	assert registry.register_schema(Plain) is None
+
+
+def test_default_registry() -> None:
+	sdjson.register_encoder(Decimal, str)
+	sdjson.register_schema(LineItem)
+
+	try:
+		assert sdjson.dumps(LineItem("a", Decimal("1.0"))) == '{"sku": "a", "price": "1.0", "discount": null}'
+	finally:
+		sdjson.unregister_encoder(LineItem)
+		sdjson.unregister_encoder(Decimal)
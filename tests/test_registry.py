@@ -0,0 +1,142 @@
+"""
+Test separate and context-local encoder registries
+"""
+
+# stdlib
+import asyncio
+import threading
+from decimal import Decimal
+from fractions import Fraction
+from typing import List
+
+# 3rd party
+import pytest
+from coincidence.selectors import min_version
+
+# this package
+import sdjson
+
+
+def test_registry() -> None:
+	registry = sdjson.Registry()
+
+	@registry.register(Decimal)
+	def encode_decimal_str(obj):
+		return str(obj)
+
+	other = sdjson.Registry()
+	assert Decimal in registry.registry
+	assert Decimal not in other.registry
+
+	with pytest.raises(TypeError, match="Object of type '?Decimal'? is not JSON serializable"):
+		sdjson.dumps(Decimal("1.5"), registry=other)
+
+	assert sdjson.dumps(Decimal("1.5"), registry=registry) == '"1.5"'
+	assert sdjson.dumps([Decimal("1.5")], registry=registry, indent=1) == '[\n "1.5"\n]'
+
+	registry.unregister(Decimal)
+
+	with pytest.raises(TypeError, match="Object of type '?Decimal'? is not JSON serializable"):
+		sdjson.dumps(Decimal("1.5"), registry=registry)
+
+
+def test_activate() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	outer = sdjson.Registry()
+
+	assert sdjson.get_registry() is sdjson.encoders
+
+	with outer.activate():
+		with registry.activate() as active:
+			assert active is registry
+			assert sdjson.get_registry() is registry
+			assert sdjson.dumps({"price": Decimal("1.5")}) == '{"price": "1.5"}'
+			assert sdjson.dumps(Decimal("1.5"), sort_keys=True) == '"1.5"'
+
+			# An explicit registry takes precedence
+			with pytest.raises(TypeError, match="Object of type '?Decimal'? is not JSON serializable"):
+				sdjson.dumps(Decimal("1.5"), registry=outer)
+
+		assert sdjson.get_registry() is outer
+
+		with pytest.raises(TypeError, match="Object of type '?Decimal'? is not JSON serializable"):
+			sdjson.dumps(Decimal("1.5"))
+
+	assert sdjson.get_registry() is sdjson.encoders
+
+
+@min_version("3.7", reason="contextvars are not integrated with asyncio before Python 3.7")
+def test_activate_tasks() -> None:
+	registry_a = sdjson.Registry()
+	registry_a.register(Fraction, str)
+	registry_b = sdjson.Registry()
+	registry_b.register(Fraction, float)
+
+	async def encode(registry: sdjson.Registry) -> str:
+		with registry.activate():
+			await asyncio.sleep(0)
+			return sdjson.dumps(Fraction(1, 2))
+
+	async def main() -> List[str]:
+		return list(await asyncio.gather(encode(registry_a), encode(registry_b)))
+
+	assert asyncio.run(main()) == ['"1/2"', "0.5"]
+
+
+def test_copy() -> None:
+	sdjson.register_encoder(Decimal, str)
+
+	registry = sdjson.encoders.copy()
+	registry.register(Fraction, str)
+	sdjson.unregister_encoder(Decimal)
+
+	assert Decimal in registry.registry
+	assert Fraction not in sdjson.encoders.registry
+	assert sdjson.dumps([Decimal(1), Fraction(1, 2)], registry=registry) == '["1", "1/2"]'
+
+
+def test_snapshots() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	state = registry._state
+
+	registry.register(Fraction, str)
+
+	# Writers replace the snapshot rather than modifying it
+	assert registry._state is not state
+	assert Fraction not in state.registry
+	assert Fraction in registry.registry
+
+	with pytest.raises(TypeError):
+		registry.registry[int] = str  # type: ignore[index]
+
+
+def test_concurrent_modification() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	data = [Decimal(i) for i in range(100)]
+	expected = sdjson.dumps([str(i) for i in range(100)])
+	errors: List[BaseException] = []
+	stop = threading.Event()
+
+	def reader() -> None:
+		try:
+			while not stop.is_set():
+				assert sdjson.dumps(data, registry=registry) == expected
+		except BaseException as e:  # pragma: no cover
+			errors.append(e)
+
+	threads = [threading.Thread(target=reader) for _ in range(4)]
+	for thread in threads:
+		thread.start()
+
+	for _ in range(200):
+		registry.register(Fraction, str)
+		registry.unregister(Fraction)
+
+	stop.set()
+	for thread in threads:
+		thread.join()
+
+	assert not errors
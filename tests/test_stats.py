@@ -0,0 +1,193 @@
+"""
+Test per-handler statistics
+"""
+
+# stdlib
+import time
+from abc import abstractmethod
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any
+
+# 3rd party
+import pytest
+from typing_extensions import Protocol, runtime_checkable
+
+# this package
+import sdjson
+
+
+class SlowDecimal(Decimal):
+	pass
+
+
+@runtime_checkable
+class SupportsToJson(Protocol):
+
+	@abstractmethod
+	def to_json(self) -> Any:
+		pass
+
+
+class Widget:
+
+	def to_json(self) -> Any:
+		return "widget"
+
+
+def sleepy_str(obj: Any) -> str:
+	time.sleep(0.001)
+	return str(obj)
+
+
+def test_stats_disabled() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+
+	assert sdjson.dumps([Decimal("1.5")], registry=registry) == '["1.5"]'
+	assert registry.stats() == {}
+
+	# Handlers aren't wrapped while statistics are disabled
+	assert registry.dispatch(Decimal("1.5")) is str
+
+
+def test_stats() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, sleepy_str)
+	registry.register(Fraction, str)
+	registry.register(SupportsToJson, lambda obj: obj.to_json())
+	registry.enable_stats()
+
+	data = [Decimal("1.5"), SlowDecimal("2.5"), Decimal("3.5"), Fraction(1, 3), Widget(), Widget()]
+	assert sdjson.dumps(data, registry=registry) == '["1.5", "2.5", "3.5", "1/3", "widget", "widget"]'
+
+	stats = registry.stats()
+	assert set(stats) == {Decimal, Fraction, SupportsToJson}
+
+	# SlowDecimal is counted against the handler registered for Decimal
+	assert stats[Decimal].path == "concrete"
+	assert stats[Decimal].calls == 3
+	assert stats[Decimal].resolutions == 2
+	assert stats[Decimal].total_time >= 0.003
+	assert stats[Decimal].resolution_time > 0
+
+	assert stats[Fraction].calls == 1
+	assert stats[Fraction].total_time < stats[Decimal].total_time
+
+	assert stats[SupportsToJson].path == "protocol"
+	assert stats[SupportsToJson].calls == 2
+	assert stats[SupportsToJson].resolutions == 1
+
+	assert isinstance(stats[Decimal], sdjson.HandlerStats)
+	assert stats[Decimal]._fields == ("path", "calls", "total_time", "resolutions", "resolution_time")
+
+	# Previously resolved types are not resolved again
+	sdjson.dumps(data, registry=registry)
+	stats = registry.stats()
+	assert stats[Decimal].calls == 6
+	assert stats[Decimal].resolutions == 2
+
+
+def test_stats_compiled() -> None:
+	dataclasses = pytest.importorskip("dataclasses")
+
+	@dataclasses.dataclass
+	class Point:
+		x: int
+		y: int
+
+	registry = sdjson.Registry()
+	registry.compile(Point)
+	registry.enable_stats()
+
+	assert sdjson.dumps(Point(1, 2), registry=registry) == '{"x": 1, "y": 2}'
+	assert registry.stats()[Point].path == "compiled"
+	assert registry.stats()[Point].calls == 1
+
+
+def test_stats_schema() -> None:
+	dataclasses = pytest.importorskip("dataclasses")
+
+	@dataclasses.dataclass
+	class Price:
+		amount: Decimal
+
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	registry.register_schema(Price)
+	registry.enable_stats()
+
+	# The handlers called by the schema are recorded too
+	data = [Price(Decimal(1)), Price(Decimal(2))]
+	assert sdjson.dumps(data, registry=registry) == '[{"amount": "1"}, {"amount": "2"}]'
+	assert registry.stats()[Price].calls == 2
+	assert registry.stats()[Decimal].calls == 2
+
+	registry.reset_stats()
+	sdjson.dumps(Price(Decimal(1)), registry=registry)
+	assert registry.stats()[Decimal].calls == 1
+
+	registry.disable_stats()
+	sdjson.dumps(Price(Decimal(1)), registry=registry)
+	assert registry.stats()[Decimal].calls == 1
+
+
+def test_stats_reset_and_disable() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	registry.enable_stats()
+
+	sdjson.dumps(Decimal("1.5"), registry=registry)
+	assert registry.stats()[Decimal].calls == 1
+
+	registry.reset_stats()
+	assert registry.stats() == {}
+
+	sdjson.dumps(Decimal("1.5"), registry=registry)
+	assert registry.stats()[Decimal].calls == 1
+	assert registry.stats()[Decimal].resolutions == 1
+
+	# Statistics are retained, but no longer updated
+	registry.disable_stats()
+	sdjson.dumps(Decimal("1.5"), registry=registry)
+	assert registry.stats()[Decimal].calls == 1
+	assert registry.dispatch(Decimal("1.5")) is str
+
+
+def test_stats_survive_registration() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, str)
+	registry.enable_stats()
+
+	sdjson.dumps(Decimal("1.5"), registry=registry)
+	registry.register(Fraction, str)
+	sdjson.dumps([Decimal("1.5"), Fraction(1, 2)], registry=registry)
+
+	stats = registry.stats()
+	assert stats[Decimal].calls == 2
+	assert stats[Decimal].resolutions == 2
+	assert stats[Fraction].calls == 1
+
+
+def test_stats_handler_raises() -> None:
+	registry = sdjson.Registry()
+	registry.register(Decimal, lambda obj: 1 / 0)
+	registry.enable_stats()
+
+	with pytest.raises(ZeroDivisionError):
+		sdjson.dumps(Decimal("1.5"), registry=registry)
+
+	assert registry.stats()[Decimal].calls == 1
+
+
+def test_stats_default_registry() -> None:
+	sdjson.register_encoder(Decimal, str)
+	sdjson.encoders.enable_stats()
+
+	try:
+		sdjson.dumps(Decimal("1.5"))
+		assert sdjson.encoders.stats()[Decimal].calls == 1
+	finally:
+		sdjson.encoders.disable_stats()
+		sdjson.encoders.reset_stats()
+		sdjson.unregister_encoder(Decimal)
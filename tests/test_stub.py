@@ -0,0 +1,32 @@
+"""
+Test the type stub for the package
+"""
+
+# stdlib
+import ast
+from typing import Set
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+import sdjson
+
+
+def stub_names() -> Set[str]:
+	tree = ast.parse((PathPlus(sdjson.__file__).parent / "__init__.pyi").read_text())
+	names = set()
+
+	for node in tree.body:
+		if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+			names.add(node.name)
+		elif isinstance(node, ast.Assign):
+			names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+		elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+			names.add(node.target.id)
+
+	return names
+
+
+def test_public_names_in_stub() -> None:
+	assert set(sdjson.__all__) - stub_names() == set()